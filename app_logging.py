@@ -0,0 +1,186 @@
+"""구조화 로깅: 큐를 거쳐 백그라운드 스레드에서 출력합니다.
+
+print()는 이벤트 루프에서 바로 stdout에 쓰므로 출력이 막히면 요청 처리도 함께
+멈춥니다. 여기서는 로그 레코드를 메모리 큐에 넣기만 하고(QueueHandler), 포맷과
+출력은 QueueListener 스레드가 합니다. 큐가 가득 차면 기다리지 않고 버린 뒤 개수를
+셉니다 (/metrics의 slidescribe_log_dropped_total).
+
+- LOG_LEVEL: 기본 INFO. DEBUG가 아니면 logger.debug()는 인자 포맷 없이 바로 버려집니다.
+- LOG_DEBUG_SAMPLE_RATE: DEBUG일 때 디버그 로그를 남길 요청의 비율 (0~1, 기본 1).
+  요청 단위로 정하므로 남긴 요청은 처음부터 끝까지 이어서 볼 수 있습니다.
+- LOG_FORMAT: text(기본) 또는 json (한 줄에 JSON 객체 하나)
+
+모든 로그에는 요청 ID가 붙습니다. RequestContextMiddleware가 X-Request-ID 헤더를
+이어받거나 새로 만들고 응답 헤더로 돌려줍니다. extra={...}로 넘긴 값은 text에서는
+key=value로, json에서는 필드로 출력됩니다.
+"""
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+
+import metrics
+
+_request_id: ContextVar[str] = ContextVar("request_id", default="-")
+_debug_sampled: ContextVar[bool] = ContextVar("debug_sampled", default=True)
+
+# LogRecord 기본 속성 (이 밖의 속성은 extra로 넘긴 구조화 필드)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+def current_request_id() -> str:
+    return _request_id.get()
+
+def _fields(record: logging.LogRecord) -> Dict:
+    return {key: value for key, value in vars(record).items() if key not in _RESERVED}
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            extra = " ".join(f"{key}={value}" for key, value in fields.items())
+            # 예외 추적은 여러 줄이므로 첫 줄 끝에 붙입니다
+            head, sep, tail = line.partition("\n")
+            line = f"{head} {extra}{sep}{tail}"
+        return line
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class _ContextFilter(logging.Filter):
+    """호출한 쪽(요청 컨텍스트)에서 요청 ID를 붙이고, 표본에 들지 않은 요청의 디버그 로그를 버립니다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.INFO and not _debug_sampled.get():
+            return False
+        record.request_id = _request_id.get()
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐에 넣기만 하는 핸들러. 큐가 가득 차면 기다리지 않고 버립니다."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자와 예외만 문자열로 확정하고 포맷은 리스너 스레드에 맡깁니다
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_debug_sample_rate = 1.0
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      debug_sample_rate: Optional[float] = None, queue_size: int = 10000) -> None:
+    """루트 로거에 큐 핸들러를 설치하고 출력 스레드를 시작합니다 (여러 번 불러도 한 번만)."""
+    global _handler, _listener, _debug_sample_rate
+    if _handler is not None:
+        return
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "text")).lower()
+    if debug_sample_rate is None:
+        debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1"))
+    _debug_sample_rate = max(0.0, min(1.0, debug_sample_rate))
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _handler.addFilter(_ContextFilter())
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+    # httpx는 요청마다 INFO를 남기므로 (GitHub 호출은 /metrics로 봅니다) 경고만 출력
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력하고 출력 스레드를 멈춥니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def collect_logging():
+    if _handler is None:
+        return
+    yield ("slidescribe_log_dropped_total", "counter", "큐가 가득 차 버린 로그 수", {}, _handler.dropped)
+    yield ("slidescribe_log_queue_depth", "gauge", "출력을 기다리는 로그 수", {}, _handler.queue.qsize())
+
+metrics.register_collector(collect_logging)
+
+class RequestContextMiddleware:
+    """요청마다 요청 ID와 디버그 로그 표본 여부를 정하는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", request_id.encode())]}
+            await send(message)
+
+        id_token = _request_id.set(request_id)
+        sampled_token = _debug_sampled.set(_debug_sample_rate >= 1.0 or random.random() < _debug_sample_rate)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _debug_sampled.reset(sampled_token)
+            _request_id.reset(id_token)
@@ -1,71 +1,163 @@
-from fastapi import FastAPI, Request, HTTPException, UploadFile, File, Form
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, Request, Response, HTTPException, UploadFile, File, Form, Query, Header, Body, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uvicorn
 import os
 import json
+import logging
 import shutil
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from functools import lru_cache
 import hashlib
 import uuid
 from tempfile import NamedTemporaryFile
-import base64
 import requests
 from dotenv import load_dotenv
-import httpx
+import asyncio
+import weakref
+import time
+import numpy as np
+
+import github_api
+from github_api import get_github_file_content, get_github_client
+from github_scheduler import GitHubUnavailable, Priority, github_priority
+from storage import create_storage, make_record_info, make_empty_index, LectureCatalog
+import bulk_data
+import file_lock
+import result_export
+import cue_index
+from cue_index import CueIndex
+import json_patch
+import fast_json
+from fast_json import FastJSONResponse
+import metrics
+import app_logging
+from profiling import RequestProfiler, ProfilingMiddleware
+from compression import CompressionMiddleware
+from static_assets import StaticAssets
+from janitor import UploadJanitor
+from live_session import LiveSession, LiveSessionBusy, LiveSessionError, list_sessions as list_live_sessions
+from live_alignment import StreamingAligner, SrtChunkReader
+from search_index import SearchIndex
+from timecode import parse_times, parse_time_ranges, find_invalid_record_time
+from timing_analytics import compute_lecture_analytics
 
 # .env 파일 로드
 load_dotenv()
 
+# 로그는 큐에 넣고 백그라운드 스레드에서 출력합니다 (LOG_LEVEL, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE)
+app_logging.configure_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Slide Scribe",
     description="Modern slide timing and transcription tool",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse
 )
 
-# Static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# 요청 단위 프로파일링 (PROFILE_TOKEN 또는 PROFILE_SAMPLE_RATE를 설정했을 때만 미들웨어를 붙임)
+request_profiler = RequestProfiler.from_env(Path("data") / "profiles")
+if request_profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+# 응답 압축 (Accept-Encoding: br, gzip). COMPRESS_MIN_SIZE바이트 미만은 그대로 보냄
+if os.getenv("RESPONSE_COMPRESSION", "on").lower() not in ("off", "0", "false"):
+    app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESS_MIN_SIZE", "1024")))
+
+# 요청 지연/상태 지표 (/metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# 요청 ID (X-Request-ID)를 모든 로그에 붙입니다. 가장 바깥에서 실행되도록 마지막에 추가
+app.add_middleware(app_logging.RequestContextMiddleware)
+
+# 이벤트 루프 지연 측정
+loop_monitor = metrics.EventLoopMonitor(interval=float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5")))
+
+@app.on_event("startup")
+async def start_background_tasks():
+    upload_janitor.start()
+    loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await upload_janitor.stop()
+    await loop_monitor.stop()
 
-# Templates
-templates = Jinja2Templates(directory="static")
+# Static files (지문 URL + 미리 압축, 첫 화면 HTML도 한 번만 만들어 둡니다)
+static_assets = StaticAssets.from_env(Path("static"))
+app.mount("/static", static_assets, name="static")
 
 # Data directory
 DATA_DIR = Path("data")
 LECTURES_DIR = DATA_DIR / "lectures"
 UPLOADS_DIR = DATA_DIR / "uploads"
+CUE_INDEX_DIR = UPLOADS_DIR / ".cues"
 LECTURES_DIR.mkdir(parents=True, exist_ok=True)
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
+# 실시간 타이머 세션 로그 (LIVE_SESSION_DIR, LIVE_FSYNC_INTERVAL초마다 모아서 fsync)
+LIVE_DIR = Path(os.getenv("LIVE_SESSION_DIR", str(DATA_DIR / "live")))
+LIVE_FSYNC_INTERVAL = float(os.getenv("LIVE_FSYNC_INTERVAL", "0.5"))
+
 # Users file
 USERS_FILE = DATA_DIR / "users.json"
 
 # SRT parsing utilities
 _TIME_RE = re.compile(r"(?P<h>\d{2}):(?P<m>\d{2}):(?P<s>\d{2})[.,](?P<ms>\d{3})")
 
-# 임시 SRT 파일 저장을 위한 딕셔너리
-temp_srt_files = {}
-
-# GitHub 설정
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-GITHUB_REPO = os.getenv("GITHUB_REPO", "yujinc726/Slide-Scribe_data")
-GITHUB_API_BASE = "https://api.github.com"
+# 업로드/내보내기 파일 정리 (UPLOAD_TTL, UPLOAD_MAX_MB, UPLOAD_SWEEP_INTERVAL)
+upload_janitor = UploadJanitor.from_env(UPLOADS_DIR, sidecar_dir=CUE_INDEX_DIR)
 
-if GITHUB_TOKEN:
-    print(f"GitHub 레포지토리: {GITHUB_REPO}")
-    print("GitHub 토큰이 설정되었습니다.")
+if github_api.GITHUB_TOKEN:
+    logger.info("GitHub 레포지토리: %s", github_api.GITHUB_REPO)
+    logger.info("GitHub 토큰이 설정되었습니다.")
 else:
-    print("⚠️  GitHub 토큰이 설정되지 않았습니다. 환경변수 GITHUB_TOKEN을 설정해주세요.")
-    print("   사용자 데이터는 로컬 백업으로만 저장됩니다.")
+    logger.warning("GitHub 토큰이 설정되지 않았습니다. 환경변수 GITHUB_TOKEN을 설정해주세요. "
+                   "사용자 데이터는 로컬 백업으로만 저장됩니다.")
+
+# 저장소 백엔드 (STORAGE_BACKEND: github | local | sqlite)
+storage = create_storage(DATA_DIR)
+logger.info("저장소 백엔드: %s", storage.name)
+
+# 전문 검색 인덱스 (SEARCH_INDEX_PATH=off 이면 워커별 메모리 DB)
+_search_index_path = os.getenv("SEARCH_INDEX_PATH", str(DATA_DIR / "search" / "search_index.db"))
+search_index = SearchIndex(
+    None if _search_index_path.lower() in ("", "off", "none") else Path(_search_index_path)
+)
+
+async def update_search_index(update, *args, **kwargs) -> None:
+    """검색 인덱스를 갱신합니다. 실패해도 기록 저장/삭제는 그대로 진행합니다.
+
+    SQLite 쓰기는 다른 워커가 잠금을 쥐고 있으면 몇 초까지 기다리므로 스레드 풀에서 실행합니다.
+    """
+    try:
+        await asyncio.to_thread(update, *args, **kwargs)
+    except Exception as e:
+        logger.error("검색 인덱스 갱신 오류: %s", e)
+
+# SRT 파싱/정렬 지표
+SRT_STAGE_SECONDS = metrics.histogram(
+    "slidescribe_srt_stage_duration_seconds", "SRT 파싱(parse)과 슬라이드 정렬(align) 시간", ("stage",)
+)
+SRT_INPUT_BYTES = metrics.histogram(
+    "slidescribe_srt_input_bytes", "파싱한 SRT 텍스트 크기",
+    buckets=(1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7)
+)
+SRT_CUES = metrics.histogram(
+    "slidescribe_srt_cues", "파싱/정렬한 자막 수", ("stage",),
+    buckets=(10, 100, 1e3, 5e3, 1e4, 5e4, 1e5, 5e5)
+)
 
-@lru_cache(maxsize=4096)
 def parse_srt_time(time_str: str) -> float:
-    """Convert `HH:MM:SS,mmm` or `HH:MM:SS.mmm` to seconds (float)."""
+    """Convert `HH:MM:SS,mmm` or `HH:MM:SS.mmm` to seconds (float).
+
+    For more than a handful of values use `timecode.parse_times`, which decodes a
+    whole column in one vectorized pass.
+    """
     m = _TIME_RE.match(time_str)
     if not m:
         raise ValueError(f"Invalid time format: {time_str}. Expected HH:MM:SS,mmm")
@@ -76,76 +168,216 @@ def parse_srt_time(time_str: str) -> float:
     return h * 3600 + mnt * 60 + s + ms / 1000.0
 
 def parse_srt_content(srt_content: str) -> List[Dict]:
-    """Parse SRT file content and return subtitle data."""
-    subtitles = []
-    blocks = srt_content.strip().split('\n\n')
+    """Parse SRT file content and return subtitle data.
+
+    Blocks are split first; the time lines of all blocks are then decoded in one
+    vectorized pass. Blocks whose time line is malformed are skipped.
+    """
+    started = time.perf_counter()
+    indexes, time_lines, texts = [], [], []
     
-    for block in blocks:
+    for block in srt_content.strip().split('\n\n'):
         lines = block.strip().split('\n')
         if len(lines) < 3:
             continue
         
-        index = lines[0]
-        time_range = lines[1]
-        text = ' '.join(lines[2:]).replace('\n', ' ')
-        
-        try:
-            match = re.match(r"(\d{2}:\d{2}:\d{2}[.,]\d{3}) --> (\d{2}:\d{2}:\d{2}[.,]\d{3})", time_range)
-            if match:
-                start_time, end_time = match.groups()
-                subtitles.append({
-                    'index': index,
-                    'start_time': parse_srt_time(start_time),
-                    'end_time': parse_srt_time(end_time),
-                    'text': text
-                })
-        except (re.error, ValueError):
-            continue
+        indexes.append(lines[0])
+        time_lines.append(lines[1])
+        texts.append(' '.join(lines[2:]).replace('\n', ' '))
+    
+    starts, ends = parse_time_ranges(time_lines)
     
+    subtitles = [
+        {
+            'index': indexes[i],
+            'start_time': start_time,
+            'end_time': end_time,
+            'text': texts[i]
+        }
+        for i, start_time, end_time in zip(range(len(texts)), starts.tolist(), ends.tolist())
+        if start_time == start_time  # NaN for malformed time lines
+    ]
+    
+    SRT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="parse")
+    SRT_INPUT_BYTES.observe(len(srt_content))
+    SRT_CUES.observe(len(subtitles), stage="parse")
     return subtitles
 
-def process_srt_with_timer(srt_content: str, timer_records: List[Dict]) -> List[Dict]:
-    """Process SRT content with timer records to create slide-text mapping."""
-    subtitles = parse_srt_content(srt_content)
-    output_data = []
-    
-    # Sort subtitles by start time
-    subtitles.sort(key=lambda x: x['start_time'])
+def parse_record_times(timer_records: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode the start/end times of all timer records at once."""
+    starts = parse_times([record.get('start_time', '00:00:00.000') for record in timer_records])
+    ends = parse_times([record.get('end_time', '00:00:00.000') for record in timer_records])
     
+    invalid = np.flatnonzero(np.isnan(starts) | np.isnan(ends))
+    if len(invalid):
+        record = timer_records[invalid[0]]
+        value = record.get('start_time') if np.isnan(starts[invalid[0]]) else record.get('end_time')
+        raise ValueError(f"Invalid time format: {value}. Expected HH:MM:SS,mmm")
+    return starts, ends
+
+def match_slide_subtitles(cues: CueIndex, timer_records: List[Dict]):
+    """Yield (record, slide_start, slide_end, cue_indices) for each timer record.
+
+    A subtitle belongs to a slide when it ends inside the slide's time range.
+    Works directly on the index arrays, so a memory-mapped sidecar is never copied.
+    """
     sub_idx = 0
-    n_subs = len(subtitles)
+    slide_starts, slide_ends = parse_record_times(timer_records)
     
-    for record in timer_records:
-        slide_title = record.get('slide_title', '')
-        slide_num = record.get('slide_number', '')
-        start_time = parse_srt_time(record.get('start_time', '00:00:00.000'))
-        end_time = parse_srt_time(record.get('end_time', '00:00:00.000'))
-        notes = record.get('notes', '')
-        
+    for record, start_time, end_time in zip(timer_records, slide_starts.tolist(), slide_ends.tolist()):
         # Skip subtitles before current slide
-        while sub_idx < n_subs and subtitles[sub_idx]['end_time'] < start_time:
-            sub_idx += 1
-        
-        # Collect subtitles within current slide time range
-        j = sub_idx
-        texts = []
-        while j < n_subs and subtitles[j]['start_time'] <= end_time:
-            if subtitles[j]['end_time'] <= end_time:
-                texts.append(subtitles[j]['text'])
-            j += 1
-        
-        if texts:
+        sub_idx = cues.skip_ended(sub_idx, start_time)
+        
+        # Subtitles starting within the slide (starts are sorted) that also end within it
+        hi = max(sub_idx, int(np.searchsorted(cues.starts, end_time, side='right')))
+        selected = sub_idx + np.flatnonzero(cues.ends[sub_idx:hi] <= end_time)
+        
+        yield record, start_time, end_time, selected
+
+def align_slide_texts(cues: CueIndex, timer_records: List[Dict]) -> List[Dict]:
+    """Create the slide-text mapping from a cue index and timer records."""
+    started = time.perf_counter()
+    output_data = []
+    
+    for record, _, _, selected in match_slide_subtitles(cues, timer_records):
+        if len(selected):
             output_data.append({
-                'slide_title': slide_title,
-                'slide_number': slide_num,
-                'notes': notes,
-                'text': ' '.join(texts),
+                'slide_title': record.get('slide_title', ''),
+                'slide_number': record.get('slide_number', ''),
+                'notes': record.get('notes', ''),
+                'text': cues.joined_text(selected),
                 'start_time': record.get('start_time'),
                 'end_time': record.get('end_time')
             })
     
+    SRT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="align")
+    SRT_CUES.observe(len(cues), stage="align")
     return output_data
 
+def process_srt_with_timer(srt_content: str, timer_records: List[Dict]) -> List[Dict]:
+    """Process SRT content with timer records to create slide-text mapping."""
+    return align_slide_texts(CueIndex.from_subtitles(parse_srt_content(srt_content)), timer_records)
+
+# Word-level cue coalescing (stable-ts *_word_ts.srt): merge cues separated by less
+# than CUE_COALESCE_GAP seconds until a sentence/phrase punctuation mark
+CUE_COALESCE_GAP = float(os.getenv("CUE_COALESCE_GAP", "0.6"))
+CUE_COALESCE_MAX_DURATION = float(os.getenv("CUE_COALESCE_MAX_DURATION", "15"))
+
+def check_coalesce_mode(coalesce: Optional[str]) -> None:
+    if coalesce and coalesce not in cue_index.COALESCE_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown coalesce mode: {coalesce} ({', '.join(cue_index.COALESCE_MODES)})"
+        )
+
+def check_file_id(file_id: str) -> None:
+    """Reject upload ids that would reach outside UPLOADS_DIR (they come straight from the client)."""
+    if not file_id or file_id.startswith(".") or "/" in file_id or "\\" in file_id or "\0" in file_id:
+        raise HTTPException(status_code=400, detail="Invalid file_id")
+
+def cue_index_path(file_id: str, coalesce: Optional[str] = None) -> Path:
+    check_file_id(file_id)
+    if not coalesce:
+        return CUE_INDEX_DIR / f"{file_id}.cues"
+    # The settings are part of the name so a config change never reuses a stale sidecar
+    return CUE_INDEX_DIR / f"{file_id}.{coalesce}-{CUE_COALESCE_GAP:g}-{CUE_COALESCE_MAX_DURATION:g}.cues"
+
+def load_cue_index(file_id: str, coalesce: Optional[str] = None) -> Optional[CueIndex]:
+    """Open the compiled cue index of an uploaded SRT file (memory-mapped).
+
+    Returns None if the SRT file does not exist (or was cleaned up). Files uploaded
+    before the index existed are parsed once and get their sidecar written here.
+    With `coalesce` ("sentence" or "phrase") the merged cues are returned; they are
+    built from the word-level index on first use and cached as another sidecar.
+    """
+    check_file_id(file_id)
+    with upload_janitor.hold(file_id) as srt_path:
+        if not srt_path.exists():
+            return None
+        
+        cues = cue_index.load(cue_index_path(file_id))
+        if cues is None:
+            with open(srt_path, 'r', encoding='utf-8') as f:
+                cues = cue_index.write(cue_index_path(file_id), parse_srt_content(f.read()))
+        
+        if coalesce:
+            merged = cue_index.load(cue_index_path(file_id, coalesce))
+            if merged is None:
+                merged = cue_index.save(cue_index_path(file_id, coalesce), cue_index.coalesce(
+                    cues,
+                    gap=CUE_COALESCE_GAP,
+                    max_duration=CUE_COALESCE_MAX_DURATION,
+                    punctuation=cue_index.COALESCE_MODES[coalesce]
+                ))
+            cues = merged
+    
+    upload_janitor.touch(file_id)
+    return cues
+
+def load_slide_cues(file_id: str, timer_records: List[Dict],
+                    coalesce: Optional[str] = None) -> List[Tuple[Dict, float, List[Dict]]]:
+    """Return (slide, slide_start, subtitles) for every slide that has subtitles."""
+    cues = load_cue_index(file_id, coalesce)
+    if cues is None:
+        raise HTTPException(status_code=410, detail="SRT file is no longer available. Please parse again.")
+    
+    return [
+        (record, start_time, [cues.cue(int(i)) for i in selected])
+        for record, start_time, _, selected in match_slide_subtitles(cues, timer_records)
+        if len(selected)
+    ]
+
+# Parse jobs (kept in the shared cache so any worker can serve the export)
+PARSE_JOB_NAMESPACE = "parse_jobs"
+PARSE_JOB_TTL = float(os.getenv("PARSE_JOB_TTL", "3600"))
+# 작업 하나가 결과 전체를 담으므로 개수도 제한 (넘으면 오래된 작업부터 삭제)
+PARSE_JOB_MAX = int(os.getenv("PARSE_JOB_MAX", "200"))
+
+def save_parse_job(file_id: str, timer_records: List[Dict], results: List[Dict], metadata: Dict,
+                   coalesce: Optional[str] = None) -> str:
+    """Remember a parse result so it can be exported without sending it back."""
+    job_id = uuid.uuid4().hex
+    # 작업이 살아 있는 동안 SRT/VTT 내보내기가 원본 SRT를 다시 읽으므로, 작업 TTL 동안
+    # 어느 워커의 정리 작업도 지우지 않도록 고정합니다
+    upload_janitor.touch(file_id)
+    upload_janitor.pin(file_id, PARSE_JOB_TTL)
+    storage.cache.set(PARSE_JOB_NAMESPACE, job_id, {
+        "file_id": file_id,
+        "timer_records": timer_records,
+        "results": results,
+        "metadata": metadata,
+        "coalesce": coalesce
+    }, ttl=PARSE_JOB_TTL)
+    storage.cache.trim(PARSE_JOB_NAMESPACE, PARSE_JOB_MAX)
+    return job_id
+
+def load_parse_job(job_id: str) -> Dict:
+    job = storage.cache.get(PARSE_JOB_NAMESPACE, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Parse job not found or expired. Please parse again.")
+    return job
+
+def export_response(results: List[Dict], format: str, compress: Optional[str],
+                    metadata: Optional[Dict] = None, slide_cues=None,
+                    slide: Optional[int] = None) -> StreamingResponse:
+    """Stream parsed results in the requested format."""
+    try:
+        body, media_type, filename = result_export.build_export(
+            results, format, compress,
+            metadata=metadata,
+            slide_cues=slide_cues,
+            slide=slide,
+            basename=f"parsed_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
+    except result_export.ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # Pydantic models
 class SlideRecord(BaseModel):
     slide_title: str
@@ -182,89 +414,36 @@ class UserLectureCreate(BaseModel):
     name: str
 
 # Timer Record File Management
-def get_user_records_dir(username: str, lecture_id: str) -> Path:
-    """사용자의 특정 강의 타이머 기록 디렉토리 경로를 반환합니다."""
-    user_dir = get_user_data_dir(username)
-    return user_dir / "records" / lecture_id
-
-def ensure_user_records_dir(username: str, lecture_id: str) -> Path:
-    """사용자의 특정 강의 타이머 기록 디렉토리를 생성하고 경로를 반환합니다."""
-    records_dir = get_user_records_dir(username, lecture_id)
-    records_dir.mkdir(parents=True, exist_ok=True)
-    return records_dir
-
-def get_records_index_path(username: str, lecture_id: str) -> str:
-    """타이머 기록 인덱스 파일의 GitHub 경로를 반환합니다."""
-    return f"users/{username}/records/{lecture_id}/index.json"
-
-def get_local_records_index_path(username: str, lecture_id: str) -> Path:
-    """타이머 기록 인덱스 파일의 로컬 경로를 반환합니다."""
-    records_dir = get_user_records_dir(username, lecture_id)
-    return records_dir / "index.json"
-
 async def load_records_index(username: str, lecture_id: str) -> Dict:
     """타이머 기록 인덱스를 로드합니다."""
     try:
-        # GitHub에서 인덱스 로드 시도
-        index_path = get_records_index_path(username, lecture_id)
-        github_data = await get_github_file_content(index_path)
-        
-        if github_data:
-            # 로컬 백업 저장
-            local_index_path = get_local_records_index_path(username, lecture_id)
-            local_index_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(local_index_path, 'w', encoding='utf-8') as f:
-                json.dump(github_data, f, ensure_ascii=False, indent=2)
-            return github_data
-        
-        # 로컬 백업에서 시도
-        local_index_path = get_local_records_index_path(username, lecture_id)
-        if local_index_path.exists():
-            with open(local_index_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        index_data = await storage.load_index(username, lecture_id)
+        if index_data:
+            return index_data
         
         # 인덱스가 없으면 빈 인덱스 반환
-        return {
-            "version": "1.0",
-            "lecture_id": lecture_id,
-            "records": [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        return make_empty_index(lecture_id)
     except Exception as e:
-        print(f"기록 인덱스 로드 오류: {e}")
+        logger.error("기록 인덱스 로드 오류: %s", e)
         # 오류 시 빈 인덱스 반환
-        return {
-            "version": "1.0",
-            "lecture_id": lecture_id,
-            "records": [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        return make_empty_index(lecture_id)
 
 async def save_records_index(username: str, lecture_id: str, index_data: Dict) -> bool:
     """타이머 기록 인덱스를 저장합니다."""
     try:
         # 업데이트 시간 갱신
         index_data["updated_at"] = datetime.now().isoformat()
+        # 기록이 바뀌었으므로 이 강의의 시간 통계를 다시 계산하도록 무효화
+        storage.cache.invalidate(analytics_namespace(username, lecture_id))
         
-        # GitHub에 저장
-        index_path = get_records_index_path(username, lecture_id)
-        github_success = await save_github_file_content(
-            index_path, 
+        return await storage.save_index(
+            username,
+            lecture_id,
             index_data, 
             f"Update records index for lecture {lecture_id}"
         )
-        
-        # 로컬 백업 저장
-        local_index_path = get_local_records_index_path(username, lecture_id)
-        local_index_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(local_index_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=2)
-        
-        return github_success
     except Exception as e:
-        print(f"기록 인덱스 저장 오류: {e}")
+        logger.error("기록 인덱스 저장 오류: %s", e)
         return False
 
 async def add_record_to_index(username: str, lecture_id: str, record_data: Dict) -> bool:
@@ -273,13 +452,7 @@ async def add_record_to_index(username: str, lecture_id: str, record_data: Dict)
         index_data = await load_records_index(username, lecture_id)
         
         # 새 기록 정보 추가
-        record_info = {
-            "id": record_data.get("id"),
-            "session_name": record_data.get("session_name", ""),
-            "created_at": record_data.get("created_at"),
-            "updated_at": record_data.get("updated_at"),
-            "records_count": len(record_data.get("records", []))
-        }
+        record_info = make_record_info(record_data)
         
         # 중복 체크 및 추가
         existing_ids = [r.get("id") for r in index_data.get("records", [])]
@@ -290,7 +463,7 @@ async def add_record_to_index(username: str, lecture_id: str, record_data: Dict)
         
         return await save_records_index(username, lecture_id, index_data)
     except Exception as e:
-        print(f"인덱스에 기록 추가 오류: {e}")
+        logger.error("인덱스에 기록 추가 오류: %s", e)
         return False
 
 async def remove_record_from_index(username: str, lecture_id: str, record_id: str) -> bool:
@@ -311,7 +484,7 @@ async def remove_record_from_index(username: str, lecture_id: str, record_id: st
         
         return True  # 제거할 기록이 없어도 성공으로 처리
     except Exception as e:
-        print(f"인덱스에서 기록 제거 오류: {e}")
+        logger.error("인덱스에서 기록 제거 오류: %s", e)
         return False
 
 async def update_record_in_index(username: str, lecture_id: str, record_data: Dict) -> bool:
@@ -320,13 +493,7 @@ async def update_record_in_index(username: str, lecture_id: str, record_data: Di
         index_data = await load_records_index(username, lecture_id)
         
         record_id = record_data.get("id")
-        updated_info = {
-            "id": record_id,
-            "session_name": record_data.get("session_name", ""),
-            "created_at": record_data.get("created_at"),
-            "updated_at": record_data.get("updated_at"),
-            "records_count": len(record_data.get("records", []))
-        }
+        updated_info = make_record_info(record_data)
         
         # 기존 기록 찾아서 업데이트
         records = index_data.get("records", [])
@@ -343,126 +510,220 @@ async def update_record_in_index(username: str, lecture_id: str, record_data: Di
         
         return await save_records_index(username, lecture_id, index_data)
     except Exception as e:
-        print(f"인덱스 기록 업데이트 오류: {e}")
+        logger.error("인덱스 기록 업데이트 오류: %s", e)
         return False
 
 async def delete_records_index(username: str, lecture_id: str) -> bool:
     """타이머 기록 인덱스를 삭제합니다."""
     try:
-        # 로컬 인덱스 파일 삭제
-        local_index_path = get_local_records_index_path(username, lecture_id)
-        if local_index_path.exists():
-            local_index_path.unlink()
-        
-        # GitHub에서는 인덱스 파일을 빈 내용으로 덮어쓰기 (삭제 대신)
-        empty_index = {
-            "version": "1.0",
-            "lecture_id": lecture_id,
-            "records": [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "deleted": True
-        }
-        
-        index_path = get_records_index_path(username, lecture_id)
-        await save_github_file_content(
-            index_path, 
-            empty_index, 
-            f"Delete records index for lecture {lecture_id}"
-        )
-        
-        return True
+        storage.cache.invalidate(analytics_namespace(username, lecture_id))
+        return await storage.delete_index(username, lecture_id)
     except Exception as e:
-        print(f"기록 인덱스 삭제 오류: {e}")
+        logger.error("기록 인덱스 삭제 오류: %s", e)
         return False
 
+# 강의별 슬라이드 시간 통계 캐시 (인덱스 버전별로 보관)
+ANALYTICS_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "3600"))
+
+def analytics_namespace(username: str, lecture_id: str) -> str:
+    return f"analytics:{username}:{lecture_id}"
+
+async def load_lecture_analytics(username: str, lecture_id: str) -> Dict:
+    """강의의 모든 타이머 기록을 한 번에 읽어 슬라이드별 시간 통계를 계산합니다 (캐시됨)."""
+    index_data = await load_records_index(username, lecture_id)
+    # 인덱스는 기록이 바뀔 때마다 updated_at이 갱신되므로 이를 버전으로 사용합니다
+    index_version = index_data.get("updated_at") or ""
+    namespace = analytics_namespace(username, lecture_id)
+    
+    cached = storage.cache.get(namespace, index_version)
+    if cached is not None:
+        return {**cached, "cached": True}
+    
+    cache_version = storage.cache.namespace_version(namespace)
+    record_ids = [r.get("id") for r in index_data.get("records", []) if r.get("id")]
+    sessions = await asyncio.gather(*(
+        load_timer_record_file(username, lecture_id, record_id) for record_id in record_ids
+    ))
+    
+    analytics = compute_lecture_analytics([s for s in sessions if s])
+    analytics["lecture_id"] = lecture_id
+    analytics["index_version"] = index_version
+    storage.cache.set(namespace, index_version, analytics, ttl=ANALYTICS_TTL, expected_version=cache_version)
+    return {**analytics, "cached": False}
+
+async def scan_record_infos(username: str, lecture_id: str, skip_ids=()) -> List[Dict]:
+    """저장소의 실제 기록들을 읽어 인덱스 항목 목록을 만듭니다."""
+    record_infos = []
+    # 전체 스캔은 백그라운드 우선순위로 GitHub 한도를 사용자 요청에 양보합니다
+    with github_priority(Priority.BACKGROUND):
+        for record_id in await storage.list_record_ids(username, lecture_id):
+            if record_id in skip_ids:
+                continue
+            
+            try:
+                record_data = await storage.load_record(username, lecture_id, record_id)
+                if not record_data:
+                    continue
+                
+                record_info = make_record_info(record_data, record_id)
+                record_info["created_at"] = record_info["created_at"] or datetime.now().isoformat()
+                record_info["updated_at"] = record_info["updated_at"] or datetime.now().isoformat()
+                record_infos.append(record_info)
+            except Exception as e:
+                logger.warning("기록 파일 처리 실패 %s: %s", record_id, e)
+                continue
+    
+    return record_infos
+
 async def migrate_existing_records_to_index(username: str, lecture_id: str) -> bool:
     """기존 기록들을 인덱스로 마이그레이션합니다."""
     try:
         # 현재 인덱스 확인
         index_data = await load_records_index(username, lecture_id)
-        existing_ids = [r.get("id") for r in index_data.get("records", [])]
+        existing_ids = set(r.get("id") for r in index_data.get("records", []))
         
-        # 로컬 기록 파일들 스캔
-        records_dir = get_user_records_dir(username, lecture_id)
-        if records_dir.exists():
-            added_count = 0
-            for record_file in records_dir.glob("*.json"):
-                if record_file.name == "index.json":
-                    continue
-                
-                record_id = record_file.stem
-                if record_id in existing_ids:
-                    continue
-                
-                try:
-                    with open(record_file, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                    
-                    # 인덱스에 추가
-                    record_info = {
-                        "id": record_id,
-                        "session_name": record_data.get("session_name", ""),
-                        "created_at": record_data.get("created_at", datetime.now().isoformat()),
-                        "updated_at": record_data.get("updated_at", datetime.now().isoformat()),
-                        "records_count": len(record_data.get("records", []))
-                    }
-                    index_data["records"].append(record_info)
-                    added_count += 1
-                except Exception as e:
-                    print(f"기록 파일 마이그레이션 실패 {record_file}: {e}")
-                    continue
-            
-            if added_count > 0:
-                # 생성 시간 기준 역순 정렬
-                index_data["records"].sort(key=lambda x: x.get("created_at", ""), reverse=True)
-                await save_records_index(username, lecture_id, index_data)
-                print(f"마이그레이션 완료: {added_count}개 기록")
+        # 저장소의 기록 스캔
+        record_infos = await scan_record_infos(username, lecture_id, existing_ids)
+        
+        if record_infos:
+            index_data["records"].extend(record_infos)
+            # 생성 시간 기준 역순 정렬
+            index_data["records"].sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            await save_records_index(username, lecture_id, index_data)
+            logger.info("마이그레이션 완료: %s개 기록", len(record_infos))
             
         return True
     except Exception as e:
-        print(f"기록 마이그레이션 오류: {e}")
+        logger.error("기록 마이그레이션 오류: %s", e)
         return False
 
-async def save_timer_record_file(username: str, lecture_id: str, record_id: str, record_data: Dict) -> bool:
-    """타이머 기록을 독립된 JSON 파일로 GitHub에 저장합니다."""
+async def save_timer_record_file(username: str, lecture_id: str, record_id: str, record_data: Dict,
+                                 update_index: bool = True) -> bool:
+    """타이머 기록을 독립된 JSON 파일로 저장소에 저장합니다.
+
+    update_index=False면 인덱스는 다시 쓰지 않습니다 (인덱스에 보이는 필드가 그대로일 때).
+    """
     try:
-        file_path = f"users/{username}/records/{lecture_id}/{record_id}.json"
-        github_success = await save_github_file_content(file_path, record_data, f"Save timer record {record_id}")
-        
-        # 로컬 백업
-        records_dir = ensure_user_records_dir(username, lecture_id)
-        record_file = records_dir / f"{record_id}.json"
-        with open(record_file, 'w', encoding='utf-8') as f:
-            json.dump(record_data, f, ensure_ascii=False, indent=2)
+        github_success = await storage.save_record(
+            username, lecture_id, record_id, record_data, f"Save timer record {record_id}"
+        )
         
         # 인덱스에 기록 추가/업데이트
-        await update_record_in_index(username, lecture_id, record_data)
+        if update_index:
+            await update_record_in_index(username, lecture_id, record_data)
+        else:
+            # 인덱스를 쓰지 않아도 슬라이드 시간은 바뀌었을 수 있으므로 통계는 무효화
+            storage.cache.invalidate(analytics_namespace(username, lecture_id))
+        await update_search_index(search_index.index_record, username, lecture_id, record_id, record_data)
         
         return github_success
     except Exception as e:
-        print(f"타이머 기록 파일 저장 오류: {e}")
+        logger.error("타이머 기록 파일 저장 오류: %s", e)
         return False
 
+# 타이머 기록 버전 (낙관적 동시성 제어)
+# 기록 문서의 "version"은 저장할 때마다 1씩 늘어나며, ETag는 이 버전에서 만듭니다.
+# 버전 필드가 생기기 전에 저장된 기록은 버전 0으로 봅니다.
+RECORD_PATCHABLE_FIELDS = ("session_name", "records")
+RECORD_REQUIRED_FIELDS = ('slide_title', 'slide_number', 'start_time', 'end_time')
+
+# 같은 기록에 대한 읽기-확인-쓰기를 직렬화합니다. 프로세스 안에서는 asyncio.Lock,
+# 워커 사이에서는 잠금 파일의 flock (uvicorn --workers N). 잠금 파일은 기록 키의
+# 해시로 고른 RECORD_LOCK_STRIPES개를 돌려 쓰므로 기록 수만큼 늘어나지 않습니다.
+RECORD_LOCK_DIR = DATA_DIR / "locks" / "records"
+RECORD_LOCK_STRIPES = 1024
+_record_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+@asynccontextmanager
+async def record_lock(username: str, lecture_id: str, record_id: str):
+    key = (username, lecture_id, record_id)
+    lock = _record_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _record_locks[key] = lock
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+    stripe = int.from_bytes(digest, "big") % RECORD_LOCK_STRIPES
+    async with lock:
+        async with file_lock.locked(RECORD_LOCK_DIR / f"{stripe:04d}.lock"):
+            yield
+
+def record_version(record_data: Dict) -> int:
+    version = record_data.get("version", 0)
+    return version if isinstance(version, int) else 0
+
+def record_etag(record_data: Dict) -> str:
+    return f'"{record_data.get("id")}-{record_version(record_data)}"'
+
+# HTTP 캐시 검증 (If-None-Match → 304)
+# 사용자 데이터는 브라우저에만 저장하고(private) 쓸 때마다 검증하게 합니다(no-cache).
+# fetch()는 브라우저 HTTP 캐시를 거치므로 app.js를 바꾸지 않아도 조건부 요청을 보냅니다.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match에 etag가 있는지 (약한 비교: 압축 응답의 W/ 접두어 무시)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+def not_modified(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+def conditional_json(content: Any, if_none_match: Optional[str],
+                     cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    """본문 해시를 강한 ETag로 붙인 JSON 응답. If-None-Match가 맞으면 본문 없이 304."""
+    body = fast_json.dumps(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": cache_control})
+
+def check_record_precondition(record_data: Dict, if_match: Optional[str]) -> None:
+    """If-Match 헤더가 현재 기록의 ETag와 다르면 412를 던집니다 (헤더가 없으면 통과)."""
+    if if_match is None:
+        return
+    candidates = [tag.strip() for tag in if_match.split(",")]
+    current = record_etag(record_data)
+    if "*" not in candidates and current not in candidates and f"W/{current}" not in candidates:
+        raise HTTPException(
+            status_code=412,
+            detail=f"타이머 기록이 다른 곳에서 수정되었습니다 (현재 버전 {record_version(record_data)})"
+        )
+
+def find_record_structure_error(record_data: Dict) -> Optional[str]:
+    """패치 결과 등 타이머 기록 문서의 구조 오류 메시지 (올바르면 None)."""
+    if not isinstance(record_data.get("session_name", ""), str):
+        return "session_name은 문자열이어야 합니다"
+    records = record_data.get("records")
+    if not isinstance(records, list):
+        return "records는 배열이어야 합니다"
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            return f"기록 {i+1}이 올바른 객체가 아닙니다"
+        for field in RECORD_REQUIRED_FIELDS:
+            if field not in record:
+                return f"기록 {i+1}에서 필수 필드가 누락되었습니다: {field}"
+    invalid_time = find_invalid_record_time(records)
+    if invalid_time:
+        i, field = invalid_time
+        return f"기록 {i+1}의 {field} 형식이 올바르지 않습니다 (HH:MM:SS.mmm)"
+    return None
+
+def index_fields_changed(old_record: Dict, new_record: Dict) -> bool:
+    """인덱스 항목에 보이는 필드가 바뀌었는지 (updated_at 제외)."""
+    old_info = make_record_info(old_record)
+    new_info = make_record_info(new_record)
+    old_info.pop("updated_at", None)
+    new_info.pop("updated_at", None)
+    return old_info != new_info
+
 async def load_timer_record_file(username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
-    """GitHub에서 특정 타이머 기록 파일을 로드합니다."""
+    """저장소에서 특정 타이머 기록 파일을 로드합니다."""
     try:
-        file_path = f"users/{username}/records/{lecture_id}/{record_id}.json"
-        github_data = await get_github_file_content(file_path)
-        
-        if github_data:
-            return github_data
-        
-        # 로컬 백업에서 시도
-        records_dir = get_user_records_dir(username, lecture_id)
-        record_file = records_dir / f"{record_id}.json"
-        if record_file.exists():
-            with open(record_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        return None
+        record_data = await storage.load_record(username, lecture_id, record_id)
+        return record_data if record_data else None
     except Exception as e:
-        print(f"타이머 기록 파일 로드 오류: {e}")
+        logger.error("타이머 기록 파일 로드 오류: %s", e)
         return None
 
 async def list_timer_records(username: str, lecture_id: str) -> List[Dict]:
@@ -481,7 +742,7 @@ async def list_timer_records(username: str, lecture_id: str) -> List[Dict]:
         
         return records
     except Exception as e:
-        print(f"타이머 기록 목록 로드 오류: {e}")
+        logger.error("타이머 기록 목록 로드 오류: %s", e)
         return []
 
 async def delete_timer_record_file(username: str, lecture_id: str, record_id: str) -> bool:
@@ -489,18 +750,11 @@ async def delete_timer_record_file(username: str, lecture_id: str, record_id: st
     try:
         # 인덱스에서 기록 제거
         await remove_record_from_index(username, lecture_id, record_id)
+        await update_search_index(search_index.remove_record, username, lecture_id, record_id)
         
-        # 로컬 파일 삭제
-        records_dir = get_user_records_dir(username, lecture_id)
-        record_file = records_dir / f"{record_id}.json"
-        
-        if record_file.exists():
-            record_file.unlink()
-            return True
-        
-        return False
+        return await storage.delete_record(username, lecture_id, record_id)
     except Exception as e:
-        print(f"타이머 기록 파일 삭제 오류: {e}")
+        logger.error("타이머 기록 파일 삭제 오류: %s", e)
         return False
 
 async def delete_all_lecture_records(username: str, lecture_id: str) -> bool:
@@ -508,14 +762,11 @@ async def delete_all_lecture_records(username: str, lecture_id: str) -> bool:
     try:
         # 인덱스 삭제
         await delete_records_index(username, lecture_id)
+        await update_search_index(search_index.remove_lecture, username, lecture_id)
         
-        # 로컬 기록 디렉토리 삭제
-        records_dir = get_user_records_dir(username, lecture_id)
-        if records_dir.exists():
-            shutil.rmtree(records_dir)
-        return True
+        return await storage.delete_lecture_records(username, lecture_id)
     except Exception as e:
-        print(f"강의 타이머 기록 삭제 오류: {e}")
+        logger.error("강의 타이머 기록 삭제 오류: %s", e)
         return False
 
 # Helper functions
@@ -553,222 +804,88 @@ def hash_password(password: str) -> str:
     """비밀번호를 해시화합니다."""
     return hashlib.sha256(password.encode()).hexdigest()
 
-def get_github_headers():
-    """GitHub API용 헤더 반환"""
-    if not GITHUB_TOKEN:
-        return None
-    return {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-        "Content-Type": "application/json"
-    }
+# users 문서는 읽고-고쳐-쓰기로 갱신하므로, 동시에 가입/삭제하면 먼저 저장한 변경이
+# 사라집니다. 갱신하는 동안 이 잠금을 잡습니다 (프로세스 단위)
+_users_lock = asyncio.Lock()
 
-async def get_github_file_content(file_path: str) -> Optional[Dict]:
-    """GitHub에서 파일 내용을 가져옵니다."""
-    headers = get_github_headers()
-    if not headers:
-        return None
-        
-    try:
-        url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/contents/{file_path}"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            
-            if response.status_code == 404:
-                return {}  # 파일이 없으면 빈 딕셔너리 반환
-            
-            if response.status_code != 200:
-                print(f"GitHub API 오류: {response.status_code}")
-                return None
-                
-            data = response.json()
-            content = base64.b64decode(data['content']).decode('utf-8')
-            return json.loads(content)
-            
-    except Exception as e:
-        print(f"GitHub에서 파일 읽기 실패 ({file_path}): {e}")
-        return None
-
-async def save_github_file_content(file_path: str, content: Dict, message: str = "Update file") -> bool:
-    """GitHub에 파일 내용을 저장합니다."""
-    headers = get_github_headers()
-    if not headers:
-        return False
-        
+async def load_users_from_github() -> Dict[str, User]:
+    """저장소에서 사용자 정보를 로드합니다. GitHub 실패시 로컬 백업 사용."""
     try:
-        # 먼저 기존 파일이 있는지 확인하여 SHA를 가져옵니다.
-        url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/contents/{file_path}"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            
-            sha = None
-            if response.status_code == 200:
-                sha = response.json()['sha']
-            
-            # 파일 내용을 JSON 문자열로 변환하고 Base64 인코딩
-            content_str = json.dumps(content, ensure_ascii=False, indent=2)
-            content_b64 = base64.b64encode(content_str.encode('utf-8')).decode('utf-8')
-            
-            # 파일 업데이트/생성 요청
-            data = {
-                "message": message,
-                "content": content_b64
-            }
-            
-            if sha:
-                data["sha"] = sha
-            
-            put_response = await client.put(url, headers=headers, json=data)
-            
-            if put_response.status_code in [200, 201]:
-                print(f"GitHub에 파일 저장 성공: {file_path}")
-                return True
-            else:
-                print(f"GitHub 파일 저장 실패: {put_response.status_code}")
-                return False
-                
+        users_data = await storage.load_users()
+        if users_data is not None:
+            return {username: User(**user_data) for username, user_data in users_data.items()}
     except Exception as e:
-        print(f"GitHub 파일 저장 오류: {e}")
-        return False
-
-async def load_users_from_github() -> Dict[str, User]:
-    """GitHub에서 사용자 정보를 로드합니다. 실패시 로컬 백업 사용."""
-    # 먼저 GitHub에서 시도
-    github_data = await get_github_file_content("users.json")
-    
-    if github_data is not None:
-        try:
-            # get_github_file_content가 이제 직접 파싱된 JSON을 반환함
-            users_data = github_data if github_data else {}
-            users = {username: User(**user_data) for username, user_data in users_data.items()}
-            
-            # 로컬에 백업 저장
-            await save_local_backup("users.json", users_data)
-            print("GitHub에서 사용자 데이터 로드 성공")
-            return users
-            
-        except Exception as e:
-            print(f"GitHub 사용자 데이터 파싱 오류: {e}")
+        logger.error("사용자 데이터 로드 오류: %s", e)
     
-    # GitHub 실패시 로컬 백업 사용
-    print("GitHub에서 로드 실패, 로컬 백업 사용 시도")
-    return await load_users_from_local_backup()
+    logger.debug("저장소에 사용자 데이터 없음, 빈 사용자 데이터 반환")
+    return {}
 
 async def save_users_to_github(users: Dict[str, User]) -> bool:
-    """사용자 정보를 GitHub에 저장합니다. 실패시 로컬에만 저장."""
+    """사용자 정보를 저장소에 저장합니다. GitHub 실패시 로컬 백업에만 저장."""
     users_data = {username: user.dict() for username, user in users.items()}
     
-    # GitHub에 저장 시도
-    github_success = await save_github_file_content("users.json", users_data, "Update users data")
-    
-    # 로컬 백업은 항상 저장
-    local_success = await save_local_backup("users.json", users_data)
-    
-    if github_success:
-        print("GitHub에 사용자 데이터 저장 성공")
-        return True
-    elif local_success:
-        print("GitHub 저장 실패, 로컬 백업에만 저장됨")
-        return True
-    else:
-        print("GitHub과 로컬 모두 저장 실패")
-        return False
-
-async def save_local_backup(filename: str, data: Dict) -> bool:
-    """로컬에 백업 파일을 저장합니다."""
     try:
-        backup_file = DATA_DIR / filename
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
+        success = await storage.save_users(users_data)
     except Exception as e:
-        print(f"로컬 백업 저장 오류: {e}")
+        logger.error("사용자 데이터 저장 오류: %s", e)
         return False
-
-async def load_users_from_local_backup() -> Dict[str, User]:
-    """로컬 백업에서 사용자 정보를 로드합니다."""
-    try:
-        backup_file = DATA_DIR / "users.json"
-        if backup_file.exists():
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                users_data = json.load(f)
-            print("로컬 백업에서 사용자 데이터 로드 성공")
-            return {username: User(**user_data) for username, user_data in users_data.items()}
-    except Exception as e:
-        print(f"로컬 백업 로드 오류: {e}")
     
-    print("로컬 백업도 없음, 빈 사용자 데이터 반환")
-    return {}
+    if success:
+        logger.info("사용자 데이터 저장 성공")
+    else:
+        logger.warning("GitHub 저장 실패, 로컬 백업에만 저장됨")
+    return success
 
 def verify_password(password: str, password_hash: str) -> bool:
     """비밀번호를 검증합니다."""
     return hash_password(password) == password_hash
 
-def get_user_data_dir(username: str) -> Path:
-    """사용자별 데이터 디렉토리 경로를 반환합니다."""
-    return DATA_DIR / f"user_{username}"
-
-def ensure_user_data_dir(username: str) -> Path:
-    """사용자별 데이터 디렉토리를 생성하고 경로를 반환합니다."""
-    user_dir = get_user_data_dir(username)
-    user_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 강의 목록 JSON 파일 초기화
-    lectures_file = user_dir / "lectures.json"
-    if not lectures_file.exists():
-        with open(lectures_file, 'w', encoding='utf-8') as f:
-            json.dump({"lectures": []}, f, ensure_ascii=False, indent=2)
-    
-    return user_dir
-
-async def save_user_data_to_github(username: str, data_type: str, content: Dict, message: str = "Update user data") -> bool:
-    """사용자 데이터를 GitHub에 저장합니다."""
-    try:
-        file_path = f"users/{username}/{data_type}.json"
-        return await save_github_file_content(file_path, content, message)
-    except Exception as e:
-        print(f"GitHub 저장 실패: {e}")
-        return False
-
-async def load_user_data_from_github(username: str, data_type: str) -> Optional[Dict]:
-    """GitHub에서 사용자 데이터를 불러옵니다."""
+async def load_user_lecture_catalog(username: str) -> LectureCatalog:
+    """사용자의 강의 카탈로그를 불러옵니다 (저장소 캐시 사용)."""
     try:
-        file_path = f"users/{username}/{data_type}.json"
-        return await get_github_file_content(file_path)
+        return await storage.load_lecture_catalog(username)
     except Exception as e:
-        print(f"GitHub 로드 실패: {e}")
-        return None
+        logger.error("강의 목록 로드 실패: %s", e)
+        return LectureCatalog()
+
+async def get_user_lecture_or_404(username: str, lecture_id: str) -> Dict:
+    """사용자의 강의를 찾고, 없으면 404를 발생시킵니다."""
+    catalog = await load_user_lecture_catalog(username)
+    if not catalog.exists:
+        raise HTTPException(status_code=404, detail="강의 목록을 찾을 수 없습니다")
+    
+    lecture = catalog.get(lecture_id)
+    if not lecture:
+        raise HTTPException(status_code=404, detail="강의를 찾을 수 없습니다")
+    return lecture
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return static_assets.index_response(request)
 
 @app.get("/api/health")
 async def health_check():
     return {
         "status": "healthy", 
         "message": "Slide Scribe API is running",
-        "github_configured": bool(GITHUB_TOKEN and GITHUB_REPO)
+        "github_configured": bool(github_api.GITHUB_TOKEN and github_api.GITHUB_REPO)
     }
 
 @app.get("/api/github/status")
 async def github_status():
     """GitHub 연결 상태를 확인합니다."""
     try:
-        if not GITHUB_TOKEN:
+        if not github_api.GITHUB_TOKEN:
             return {
                 "status": "not_configured",
                 "message": "GitHub 토큰이 설정되지 않았습니다. .env 파일을 확인해주세요."
             }
             
         # GitHub API 기본 연결 테스트
-        url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}"
-        headers = get_github_headers()
+        url = github_api.get_repo_url()
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
+        async with get_github_client() as client:
+            response = await github_api.github_request(client, "GET", url)
             
             if response.status_code == 200:
                 repo_info = response.json()
@@ -776,7 +893,8 @@ async def github_status():
                     "status": "connected",
                     "repository": repo_info.get("full_name"),
                     "private": repo_info.get("private"),
-                    "message": "GitHub 연결 성공"
+                    "message": "GitHub 연결 성공",
+                    "scheduler": github_api.scheduler.snapshot()
                 }
             else:
                 return {
@@ -784,6 +902,12 @@ async def github_status():
                     "message": f"GitHub API 오류: {response.status_code}",
                     "details": response.text if hasattr(response, 'text') else str(response.content)
                 }
+    except GitHubUnavailable as e:
+        return {
+            "status": "degraded",
+            "message": f"GitHub 일시 차단 (로컬 전용 모드): {str(e)}",
+            "scheduler": github_api.scheduler.snapshot()
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -791,6 +915,77 @@ async def github_status():
         }
 
 # Lecture management endpoints
+@app.get("/api/uploads/status")
+async def uploads_status():
+    """업로드 디렉토리 사용량과 정리 통계를 반환합니다."""
+    return upload_janitor.snapshot()
+
+def collect_app_metrics():
+    """캐시, GitHub 스케줄러, 업로드 정리, 검색 인덱스, 실시간 세션의 현재 값을 지표로 내보냅니다."""
+    cache = storage.cache.snapshot()
+    for kind in ("l1_hits", "l2_hits", "misses", "sets", "invalidations"):
+        yield ("slidescribe_cache_operations_total", "counter", "저장소 캐시 조회/변경 횟수", {"kind": kind}, cache[kind])
+    yield ("slidescribe_cache_hit_ratio", "gauge", "저장소 캐시 적중률 (L1+L2)", {}, cache["hit_rate"])
+    yield ("slidescribe_cache_l1_entries", "gauge", "워커 메모리(L1) 캐시 항목 수", {}, cache["l1_entries"])
+
+    scheduler = github_api.scheduler.snapshot()
+    for state in ("closed", "open", "half_open"):
+        yield ("slidescribe_github_circuit_state", "gauge", "GitHub 회로 차단기 상태 (현재 상태만 1)",
+               {"state": state}, 1 if scheduler["circuit"] == state else 0)
+    yield ("slidescribe_github_rate_limit_remaining", "gauge", "GitHub이 알려준 남은 요청 수", {}, scheduler["rate_limit_remaining"])
+    yield ("slidescribe_github_in_flight", "gauge", "진행 중인 GitHub 호출 수", {}, scheduler["in_flight"])
+    for priority, waiting in scheduler["waiting"].items():
+        yield ("slidescribe_github_waiting", "gauge", "스케줄러에서 대기 중인 GitHub 호출 수", {"priority": priority}, waiting)
+    for kind in ("sent", "rejected", "failures", "rate_limited"):
+        yield ("slidescribe_github_scheduler_total", "counter", "GitHub 스케줄러 처리 결과", {"kind": kind}, scheduler[kind])
+
+    uploads = upload_janitor.snapshot()
+    yield ("slidescribe_uploads_bytes", "gauge", "업로드 디렉토리 사용량", {}, uploads["bytes"])
+    yield ("slidescribe_uploads_files", "gauge", "업로드 디렉토리 파일 수", {}, uploads["files"])
+
+    for kind in ("searches", "indexed_docs", "removed_docs"):
+        yield ("slidescribe_search_index_total", "counter", "검색 인덱스 처리 횟수", {"kind": kind}, search_index.stats[kind])
+
+    yield ("slidescribe_live_sessions", "gauge", "이 워커에 연결된 실시간 타이머 세션 수", {}, len(_live_sessions))
+
+metrics.register_collector(collect_app_metrics)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식의 운영 지표 (워커 프로세스별)."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+def require_profile_admin(token: Optional[str]) -> None:
+    if not request_profiler.is_admin(token):
+        raise HTTPException(status_code=403, detail="프로파일 조회 권한이 없습니다 (X-Profile 헤더에 PROFILE_TOKEN 필요)")
+
+@app.get("/api/profiles")
+async def list_profiles(x_profile: Optional[str] = Header(None), profile: Optional[str] = None):
+    """저장된 요청 프로파일 목록 (관리자 전용)."""
+    require_profile_admin(x_profile or profile)
+    return {
+        "profiles": request_profiler.list(),
+        "sample_rate": request_profiler.sample_rate,
+        "stats": request_profiler.stats
+    }
+
+@app.get("/api/profiles/{name}")
+async def download_profile(name: str, format: str = "prof", sort: str = "cumulative",
+                           x_profile: Optional[str] = Header(None), profile: Optional[str] = None):
+    """프로파일 다운로드 (관리자 전용). format=text이면 pstats 요약을 반환합니다."""
+    require_profile_admin(x_profile or profile)
+    path = request_profiler.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    if format == "text":
+        try:
+            return Response(request_profiler.summary(name, sort=sort), media_type="text/plain")
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 정렬 기준입니다: {sort}")
+    if format != "prof":
+        raise HTTPException(status_code=400, detail="format은 prof 또는 text여야 합니다")
+    return FileResponse(path=path, filename=name, media_type="application/octet-stream")
+
 @app.get("/api/lectures")
 async def get_lectures():
     """Get list of all lectures"""
@@ -871,8 +1066,7 @@ async def save_timer_session(lecture_name: str, session: TimerSession):
             "filename": filename
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        file_path.write_bytes(fast_json.dumps(save_data))
         
         return {
             "message": "Timer session saved successfully",
@@ -952,6 +1146,11 @@ async def upload_json_record(lecture_name: str, file: UploadFile = File(...)):
                 if field not in record:
                     raise HTTPException(status_code=400, detail=f"Record {i+1} missing required field: {field}")
         
+        invalid_time = find_invalid_record_time(records)
+        if invalid_time:
+            i, field = invalid_time
+            raise HTTPException(status_code=400, detail=f"Record {i+1} has invalid {field} (expected HH:MM:SS.mmm)")
+        
         # Ensure lecture directory exists
         lecture_dir = ensure_lecture_dir(lecture_name)
         
@@ -972,8 +1171,7 @@ async def upload_json_record(lecture_name: str, file: UploadFile = File(...)):
         }
         
         # Save file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        file_path.write_bytes(fast_json.dumps(save_data))
         
         return {
             "message": f"JSON file '{file.filename}' uploaded successfully",
@@ -1007,11 +1205,19 @@ async def upload_srt_file(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="Invalid SRT file or no subtitles found")
         
         # Save uploaded file
-        file_id = f"srt_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
+        # Only the base name of the client's filename is kept
+        file_id = f"srt_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{Path(file.filename).name}"
+        check_file_id(file_id)
         file_path = UPLOADS_DIR / file_id
+        # A same-second upload of the same name replaces the file: drop what was built from the old one
+        upload_janitor.drop_sidecars(file_id)
         
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(srt_content)
+        # Compile the cue index once; parse/preview memory-map it instead of re-parsing
+        cue_index.write(cue_index_path(file_id), subtitles)
+        save_upload_digest(file_id, content)
+        upload_janitor.record_write(len(content))
         
         return {
             "message": "SRT file uploaded successfully",
@@ -1021,6 +1227,8 @@ async def upload_srt_file(file: UploadFile = File(...)):
             "duration": f"{subtitles[-1]['end_time']:.1f}s" if subtitles else "0s",
             "preview": subtitles[:3] if len(subtitles) > 3 else subtitles
         }
+    except HTTPException:
+        raise
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="Invalid file encoding. Please use UTF-8 encoded SRT file")
     except Exception as e:
@@ -1030,18 +1238,20 @@ async def upload_srt_file(file: UploadFile = File(...)):
 async def parse_srt_with_timer_record(
     file_id: str = Form(...),
     lecture_name: str = Form(...),
-    record_file: str = Form(...)
+    record_file: str = Form(...),
+    coalesce: Optional[str] = Form(None)
 ):
-    """Parse SRT file with timer record to extract slide texts"""
+    """Parse SRT file with timer record to extract slide texts.
+
+    `coalesce` ("sentence" or "phrase") merges word-level cues before alignment.
+    """
+    check_coalesce_mode(coalesce)
     try:
         # Load SRT file
-        srt_path = UPLOADS_DIR / file_id
-        if not srt_path.exists():
+        cues = load_cue_index(file_id, coalesce)
+        if cues is None:
             raise HTTPException(status_code=404, detail="SRT file not found. Please upload the file again.")
         
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            srt_content = f.read()
-        
         # Load timer record
         lecture_dir = get_lecture_dir(lecture_name)
         record_path = lecture_dir / record_file
@@ -1058,80 +1268,156 @@ async def parse_srt_with_timer_record(
             raise HTTPException(status_code=400, detail="No timer records found in the file")
         
         # Process SRT with timer records
-        result_data = process_srt_with_timer(srt_content, timer_records)
+        result_data = align_slide_texts(cues, timer_records)
         
         if not result_data:
             raise HTTPException(status_code=400, detail="No matching content found between SRT and timer records")
         
-        return {
+        metadata = {
+            "lecture_name": lecture_name,
+            "record_file": record_file,
+            "srt_file": file_id,
+            "coalesce": coalesce,
+            "processed_at": datetime.now().isoformat()
+        }
+        job_id = save_parse_job(file_id, timer_records, result_data, metadata, coalesce)
+        
+        return FastJSONResponse({
             "message": "SRT parsing completed successfully",
             "slide_count": len(result_data),
             "results": result_data,
-            "metadata": {
-                "lecture_name": lecture_name,
-                "record_file": record_file,
-                "srt_file": file_id,
-                "processed_at": datetime.now().isoformat()
-            }
-        }
+            "metadata": metadata,
+            "job_id": job_id,
+            "export_url": f"/api/srt/jobs/{job_id}/export"
+        })
+    except HTTPException:
+        raise
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid timer record file")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Largest page the preview endpoint returns
+PREVIEW_MAX_LIMIT = 1000
+
+# Bump when the preview response format changes so cached pages are refetched
+PREVIEW_ETAG_VERSION = 1
+
+def upload_digest_path(file_id: str) -> Path:
+    check_file_id(file_id)
+    return CUE_INDEX_DIR / f"{file_id}.digest"
+
+def save_upload_digest(file_id: str, content: bytes) -> str:
+    """Record the content hash of an uploaded SRT file next to its cue index."""
+    digest = hashlib.blake2b(content, digest_size=12).hexdigest()
+    path = upload_digest_path(file_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(digest)
+    os.replace(tmp_path, path)
+    return digest
+
+def upload_digest(file_id: str) -> Optional[str]:
+    """Content hash of an uploaded SRT file (None if the file is gone).
+
+    Files uploaded before digests were recorded are hashed once here.
+    """
+    try:
+        return upload_digest_path(file_id).read_text()
+    except OSError:
+        pass
+    try:
+        content = (UPLOADS_DIR / file_id).read_bytes()
+    except OSError:
+        return None
+    return save_upload_digest(file_id, content)
+
+def preview_etag(file_id: str, *params) -> Optional[str]:
+    """ETag for a preview page: the query plus the uploaded file's content hash.
+
+    Upload names only have second resolution, so a later upload can overwrite a file under
+    the same name; the hash recorded at upload time tells the two apart without reading
+    the file. mtime is not used because the janitor touches files it serves.
+    """
+    digest = upload_digest(file_id)
+    if digest is None:
+        return None
+    key = repr((file_id, digest, PREVIEW_ETAG_VERSION) + params).encode()
+    return f'"{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
 @app.get("/api/srt/preview/{file_id}")
-async def preview_srt_file(file_id: str, limit: int = 10):
-    """Preview SRT file content"""
+async def preview_srt_file(file_id: str,
+                           offset: int = Query(0, ge=0),
+                           limit: int = Query(10, ge=1, le=PREVIEW_MAX_LIMIT),
+                           from_: Optional[float] = Query(None, alias="from", ge=0),
+                           to: Optional[float] = Query(None, ge=0),
+                           coalesce: Optional[str] = None,
+                           if_none_match: Optional[str] = Header(None)):
+    """Preview SRT file content.
+
+    Pages through subtitles with `offset`/`limit`. `from`/`to` (seconds) restrict the
+    page to subtitles starting in that time range; the range is found by binary search
+    on the cue index, so any window of a long transcript is served without parsing.
+    Responses carry an ETag; a matching If-None-Match gets 304 without opening the index.
+    """
+    check_coalesce_mode(coalesce)
+    if from_ is not None and to is not None and to < from_:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
     try:
-        srt_path = UPLOADS_DIR / file_id
-        if not srt_path.exists():
-            raise HTTPException(status_code=404, detail="SRT file not found")
+        etag = preview_etag(file_id, offset, limit, from_, to, coalesce)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
         
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            srt_content = f.read()
+        cues = load_cue_index(file_id, coalesce)
+        if cues is None:
+            raise HTTPException(status_code=404, detail="SRT file not found")
         
-        subtitles = parse_srt_content(srt_content)
+        lo, hi = cues.time_range(from_, to)
+        start = min(lo + offset, hi)
+        end = min(start + limit, hi)
         
-        return {
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL} if etag else None
+        return FastJSONResponse({
             "filename": file_id,
-            "total_subtitles": len(subtitles),
-            "duration": f"{subtitles[-1]['end_time']:.1f}s" if subtitles else "0s",
-            "preview": subtitles[:limit],
-            "sample_text": subtitles[0]['text'] if subtitles else ""
-        }
+            "total_subtitles": len(cues),
+            "duration": f"{cues.duration:.1f}s",
+            "preview": cues.cues(start, end),
+            "sample_text": cues.text_at(0) if len(cues) else "",
+            "range_total": hi - lo,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": offset + (end - start) if end < hi else None
+        }, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/srt/export")
-async def export_parsed_results(results: List[Dict[str, Any]]):
-    """Export parsed results as JSON file"""
-    try:
-        if not results:
-            raise HTTPException(status_code=400, detail="No results to export")
-        
-        # Generate export filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"parsed_results_{timestamp}.json"
-        file_path = UPLOADS_DIR / filename
-        
-        # Prepare export data
-        export_data = {
-            "exported_at": datetime.now().isoformat(),
-            "slide_count": len(results),
-            "slides": results
-        }
-        
-        # Save to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
-        
-        return {
-            "message": "Results exported successfully",
-            "filename": filename,
-            "download_url": f"/api/srt/download/{filename}"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def export_parsed_results(results: List[Dict[str, Any]], format: str = "json",
+                                compress: Optional[str] = None):
+    """Stream parsed results as JSON, NDJSON, CSV or Markdown (optionally gzip/zstd)"""
+    if not results:
+        raise HTTPException(status_code=400, detail="No results to export")
+    
+    return export_response(results, format, compress)
+
+@app.get("/api/srt/jobs/{job_id}/export")
+async def export_parse_job(job_id: str, format: str = "json", compress: Optional[str] = None,
+                           slide: Optional[int] = None):
+    """Stream the results of a parse job without sending them back to the server.
+
+    `srt`/`vtt` re-time each slide's subtitles to start at 0; pass `slide` (1-based)
+    for a single file, otherwise a zip with one file per slide is returned.
+    """
+    job = load_parse_job(job_id)
+    
+    slide_cues = None
+    if format in result_export.SUBTITLE_FORMATS:
+        slide_cues = lambda: load_slide_cues(job["file_id"], job["timer_records"], job.get("coalesce"))
+    
+    return export_response(job["results"], format, compress,
+                           metadata=job.get("metadata"), slide_cues=slide_cues, slide=slide)
 
 @app.get("/api/srt/download/{filename}")
 async def download_exported_file(filename: str):
@@ -1140,6 +1426,7 @@ async def download_exported_file(filename: str):
         file_path = UPLOADS_DIR / filename
         if not file_path.exists():
             raise HTTPException(status_code=404, detail="File not found")
+        upload_janitor.touch(filename)
         
         return FileResponse(
             path=file_path,
@@ -1152,18 +1439,24 @@ async def download_exported_file(filename: str):
 @app.post("/api/srt/parse-with-data")
 async def parse_srt_with_timer_data(
     file_id: str = Form(...),
-    timer_records: str = Form(...)
+    timer_records: str = Form(...),
+    coalesce: Optional[str] = Form(None),
+    username: Optional[str] = Form(None),
+    lecture_id: Optional[str] = Form(None),
+    record_id: Optional[str] = Form(None)
 ):
-    """Parse SRT file with timer record data (from localStorage)"""
+    """Parse SRT file with timer record data (from localStorage).
+
+    When `username`, `lecture_id` and `record_id` identify the timer record, the slide
+    texts are added to that user's full-text search index.
+    """
+    check_coalesce_mode(coalesce)
     try:
         # Load SRT file
-        srt_path = UPLOADS_DIR / file_id
-        if not srt_path.exists():
+        cues = load_cue_index(file_id, coalesce)
+        if cues is None:
             raise HTTPException(status_code=404, detail="SRT file not found. Please upload the file again.")
         
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            srt_content = f.read()
-        
         # Parse timer records from JSON string
         try:
             timer_data = json.loads(timer_records)
@@ -1177,44 +1470,121 @@ async def parse_srt_with_timer_data(
             raise HTTPException(status_code=400, detail="No timer records found")
         
         # Process SRT with timer records
-        result_data = process_srt_with_timer(srt_content, timer_data)
+        result_data = align_slide_texts(cues, timer_data)
         
         if not result_data:
             raise HTTPException(status_code=400, detail="No matching content found between SRT and timer records")
         
-        return {
+        if username and lecture_id and record_id:
+            await update_search_index(search_index.index_transcript, username, lecture_id, record_id, result_data)
+        
+        metadata = {
+            "srt_file": file_id,
+            "coalesce": coalesce,
+            "processed_at": datetime.now().isoformat()
+        }
+        job_id = save_parse_job(file_id, timer_data, result_data, metadata, coalesce)
+        
+        return FastJSONResponse({
             "message": "SRT parsing completed successfully",
             "slide_count": len(result_data),
             "results": result_data,
-            "metadata": {
-                "srt_file": file_id,
-                "processed_at": datetime.now().isoformat()
-            }
-        }
+            "metadata": metadata,
+            "job_id": job_id,
+            "export_url": f"/api/srt/jobs/{job_id}/export"
+        })
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.websocket("/api/srt/live-align")
+async def live_align_srt(websocket: WebSocket, username: Optional[str] = None,
+                         lecture_id: Optional[str] = None, record_id: Optional[str] = None):
+    """Align a growing transcript against slide transitions while the lecture is running.
+
+    Client messages (JSON):
+      {"type": "srt", "data": "<SRT text chunk>"}       appended SRT (partial blocks are buffered)
+      {"type": "cues", "cues": [{"start_time", "end_time", "text"}]}   cues in seconds
+      {"type": "slides", "slides": [<timer record>, ...]}
+      {"type": "transition", "time": "HH:MM:SS.mmm", "slide": {...}}   next slide starts now
+      {"type": "watermark", "time": <seconds>}          no more cues will start before this
+      {"type": "end"}
+
+    Every message is answered with {"type": "slides", "slides": [...]} holding the slides
+    finalized by it (same shape as the parse results). Cues must arrive in start order.
+    On "end" the remaining slides are flushed, {"type": "done"} is sent and, when
+    `username`, `lecture_id` and `record_id` are given, the slide texts are indexed for search.
+    """
+    await websocket.accept()
+    aligner = StreamingAligner()
+    reader = SrtChunkReader()
+    results: List[Dict] = []
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                kind = message.get("type") if isinstance(message, dict) else None
+                finished = kind == "end"
+                
+                if kind == "srt" or finished:
+                    blocks = reader.feed(str(message.get("data", "")), final=finished)
+                    finalized = aligner.add_cues(parse_srt_content(blocks)) if blocks else []
+                    if finished:
+                        finalized += aligner.finish()
+                elif kind == "cues":
+                    finalized = aligner.add_cues(list(message.get("cues") or []))
+                elif kind == "slides":
+                    finalized = aligner.add_slides(list(message.get("slides") or []))
+                elif kind == "transition":
+                    finalized = aligner.transition(str(message.get("time", "")), message.get("slide"))
+                elif kind == "watermark":
+                    finalized = aligner.advance(float(message.get("time")))
+                else:
+                    raise ValueError(f"Unknown message type: {kind}")
+            except (ValueError, TypeError, KeyError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            
+            results.extend(finalized)
+            watermark = aligner.watermark if np.isfinite(aligner.watermark) else None
+            await websocket.send_json({
+                "type": "slides",
+                "slides": finalized,
+                "watermark": watermark,
+                "pending_slides": aligner.pending_slides
+            })
+            
+            if finished:
+                if username and lecture_id and record_id and results:
+                    await update_search_index(search_index.index_transcript, username, lecture_id, record_id, results)
+                await websocket.send_json({"type": "done", "slide_count": len(results), "stats": aligner.stats})
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+
 # User Management APIs
 @app.post("/api/auth/register")
 async def register_user(user_data: UserCreate):
     """새 사용자를 등록합니다."""
-    users = await load_users_from_github()
-    
-    # 사용자명 중복 체크
-    if user_data.username in users:
-        raise HTTPException(status_code=400, detail="이미 존재하는 사용자명입니다")
-    
-    # 새 사용자 생성
-    new_user = User(
-        username=user_data.username,
-        password_hash=hash_password(user_data.password),
-        created_at=datetime.now().isoformat()
-    )
-    
-    users[user_data.username] = new_user
-    await save_users_to_github(users)
+    async with _users_lock:
+        users = await load_users_from_github()
+        
+        # 사용자명 중복 체크
+        if user_data.username in users:
+            raise HTTPException(status_code=400, detail="이미 존재하는 사용자명입니다")
+        
+        # 새 사용자 생성
+        new_user = User(
+            username=user_data.username,
+            password_hash=hash_password(user_data.password),
+            created_at=datetime.now().isoformat()
+        )
+        
+        users[user_data.username] = new_user
+        await save_users_to_github(users)
     
     return {
         "success": True,
@@ -1266,39 +1636,27 @@ async def get_all_users():
 @app.delete("/api/auth/users/{username}")
 async def delete_user(username: str):
     """사용자를 삭제합니다."""
-    users = await load_users_from_github()
-    
-    if username not in users:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
-    
-    del users[username]
-    await save_users_to_github(users)
+    async with _users_lock:
+        users = await load_users_from_github()
+        
+        if username not in users:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+        
+        del users[username]
+        await save_users_to_github(users)
     
-    # 해당 사용자의 데이터 폴더도 삭제 (선택사항)
-    user_data_dir = DATA_DIR / f"user_{username}"
-    if user_data_dir.exists():
-        shutil.rmtree(user_data_dir)
+    # 해당 사용자의 데이터도 삭제 (선택사항)
+    await storage.delete_user(username)
+    await update_search_index(search_index.remove_user, username)
     
     return {"success": True, "message": f"사용자 {username}이 삭제되었습니다"}
 
 @app.get("/api/users/{username}/lectures")
-async def get_user_lectures(username: str):
-    """사용자의 강의 목록을 반환합니다."""
+async def get_user_lectures(username: str, if_none_match: Optional[str] = Header(None)):
+    """사용자의 강의 목록을 반환합니다 (ETag, 바뀌지 않았으면 304)."""
     try:
-        # GitHub에서 데이터 로드 시도
-        github_data = await load_user_data_from_github(username, "lectures")
-        if github_data:
-            return github_data
-        
-        # 로컬 백업에서 로드
-        user_dir = get_user_data_dir(username)
-        lectures_file = user_dir / "lectures.json"
-        
-        if lectures_file.exists():
-            with open(lectures_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return {"lectures": []}
+        catalog = await load_user_lecture_catalog(username)
+        return conditional_json(catalog.to_document(), if_none_match)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"강의 목록 로드 실패: {str(e)}")
 
@@ -1307,21 +1665,10 @@ async def create_user_lecture(username: str, lecture: UserLectureCreate):
     """사용자의 새 강의를 생성합니다."""
     try:
         # 현재 강의 목록 로드
-        current_data = await load_user_data_from_github(username, "lectures")
-        if not current_data:
-            # 로컬에서 로드
-            user_dir = ensure_user_data_dir(username)
-            lectures_file = user_dir / "lectures.json"
-            
-            if lectures_file.exists():
-                with open(lectures_file, 'r', encoding='utf-8') as f:
-                    current_data = json.load(f)
-            else:
-                current_data = {"lectures": []}
+        catalog = await load_user_lecture_catalog(username)
         
         # 중복 확인
-        existing_names = [l.get("name", "") for l in current_data.get("lectures", [])]
-        if lecture.name in existing_names:
+        if catalog.has_name(lecture.name):
             raise HTTPException(status_code=400, detail="이미 존재하는 강의명입니다")
         
         # 새 강의 추가
@@ -1331,20 +1678,14 @@ async def create_user_lecture(username: str, lecture: UserLectureCreate):
             "created_at": datetime.now().isoformat()
         }
         
-        current_data["lectures"].append(new_lecture)
+        catalog.add(new_lecture)
         
-        # GitHub에 저장
-        github_success = await save_user_data_to_github(
-            username, "lectures", current_data, 
+        # 저장소에 저장
+        github_success = await storage.save_lecture_catalog(
+            username, catalog, 
             f"Add lecture: {lecture.name}"
         )
         
-        # 로컬 백업
-        user_dir = ensure_user_data_dir(username)
-        lectures_file = user_dir / "lectures.json"
-        with open(lectures_file, 'w', encoding='utf-8') as f:
-            json.dump(current_data, f, ensure_ascii=False, indent=2)
-        
         return {
             "success": True,
             "message": "강의가 성공적으로 생성되었습니다",
@@ -1360,45 +1701,20 @@ async def create_user_lecture(username: str, lecture: UserLectureCreate):
 async def delete_user_lecture(username: str, lecture_id: str):
     """사용자의 강의를 삭제합니다."""
     try:
-        # 현재 강의 목록 로드
-        current_data = await load_user_data_from_github(username, "lectures")
-        if not current_data:
-            user_dir = get_user_data_dir(username)
-            lectures_file = user_dir / "lectures.json"
-            
-            if lectures_file.exists():
-                with open(lectures_file, 'r', encoding='utf-8') as f:
-                    current_data = json.load(f)
-            else:
-                raise HTTPException(status_code=404, detail="강의 목록을 찾을 수 없습니다")
-        
-        # 강의 찾기 및 삭제
-        lectures = current_data.get("lectures", [])
-        lecture_to_delete = None
-        
-        for i, lecture in enumerate(lectures):
-            if lecture.get("id") == lecture_id:
-                lecture_to_delete = lectures.pop(i)
-                break
-        
-        if not lecture_to_delete:
-            raise HTTPException(status_code=404, detail="강의를 찾을 수 없습니다")
+        # 강의 찾기
+        lecture_to_delete = await get_user_lecture_or_404(username, lecture_id)
         
         # 해당 강의의 모든 타이머 기록 파일 삭제
         await delete_all_lecture_records(username, lecture_id)
         
-        # GitHub에 저장
-        github_success = await save_user_data_to_github(
-            username, "lectures", current_data,
+        # 카탈로그에서 제거 후 저장소에 저장
+        catalog = await load_user_lecture_catalog(username)
+        catalog.remove(lecture_id)
+        github_success = await storage.save_lecture_catalog(
+            username, catalog,
             f"Delete lecture: {lecture_to_delete.get('name', 'Unknown')}"
         )
         
-        # 로컬 백업
-        user_dir = ensure_user_data_dir(username)
-        lectures_file = user_dir / "lectures.json"
-        with open(lectures_file, 'w', encoding='utf-8') as f:
-            json.dump(current_data, f, ensure_ascii=False, indent=2)
-        
         return {
             "success": True,
             "message": "강의가 성공적으로 삭제되었습니다",
@@ -1415,28 +1731,7 @@ async def save_user_timer_record(username: str, lecture_id: str, session: TimerS
     """사용자의 특정 강의에 타이머 기록을 독립된 JSON 파일로 저장합니다."""
     try:
         # 강의 존재 확인
-        current_data = await load_user_data_from_github(username, "lectures")
-        if not current_data:
-            user_dir = get_user_data_dir(username)
-            lectures_file = user_dir / "lectures.json"
-            
-            if lectures_file.exists():
-                with open(lectures_file, 'r', encoding='utf-8') as f:
-                    current_data = json.load(f)
-            else:
-                raise HTTPException(status_code=404, detail="강의 목록을 찾을 수 없습니다")
-        
-        # 강의 찾기
-        lectures = current_data.get("lectures", [])
-        target_lecture = None
-        
-        for lecture in lectures:
-            if lecture.get("id") == lecture_id:
-                target_lecture = lecture
-                break
-        
-        if not target_lecture:
-            raise HTTPException(status_code=404, detail="강의를 찾을 수 없습니다")
+        target_lecture = await get_user_lecture_or_404(username, lecture_id)
         
         # 타이머 기록 데이터 준비
         record_id = str(uuid.uuid4())
@@ -1447,7 +1742,8 @@ async def save_user_timer_record(username: str, lecture_id: str, session: TimerS
             "session_name": session.lecture_name,
             "records": [record.dict() for record in session.records],
             "created_at": session.created_at,
-            "updated_at": session.updated_at
+            "updated_at": session.updated_at,
+            "version": 1
         }
         
         # 독립된 JSON 파일로 저장
@@ -1470,18 +1766,68 @@ async def save_user_timer_record(username: str, lecture_id: str, session: TimerS
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"타이머 기록 저장 실패: {str(e)}")
 
+@app.get("/api/users/{username}/lectures/{lecture_id}/analytics")
+async def get_lecture_analytics(username: str, lecture_id: str):
+    """강의의 모든 세션에 걸친 슬라이드별 소요 시간 통계 (평균, p50, p90, 분산, 추세)."""
+    try:
+        await get_user_lecture_or_404(username, lecture_id)
+        
+        return await load_lecture_analytics(username, lecture_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"시간 통계 계산 실패: {str(e)}")
+
+@app.get("/api/users/{username}/search")
+async def search_user_records(username: str,
+                              q: str = Query(..., min_length=1, max_length=200),
+                              lecture_id: Optional[str] = None,
+                              kind: Optional[str] = None,
+                              limit: int = Query(20, ge=1, le=100),
+                              offset: int = Query(0, ge=0)):
+    """강의/세션/슬라이드의 노트와 스크립트에서 검색어가 나온 곳을 관련도 순으로 찾습니다."""
+    if kind and kind not in ("note", "transcript"):
+        raise HTTPException(status_code=400, detail="kind는 note 또는 transcript여야 합니다")
+    
+    try:
+        return await asyncio.to_thread(
+            search_index.search, username, q, lecture_id=lecture_id, kind=kind, limit=limit, offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/users/{username}/search/rebuild")
+async def rebuild_search_index(username: str):
+    """저장소의 모든 타이머 기록으로 사용자의 노트 검색 인덱스를 다시 만듭니다."""
+    try:
+        records = []
+        async for path, content in bulk_data.iter_backup_entries(storage, username):
+            parts = path.split("/")
+            if len(parts) == 3 and parts[0] == "records" and parts[2] != "index.json":
+                records.append((parts[1], parts[2][:-len(".json")], content))
+        
+        indexed_count = await asyncio.to_thread(search_index.index_records, username, records, reset=True)
+        
+        return {
+            "success": True,
+            "message": "검색 인덱스가 재구성되었습니다",
+            "indexed_records": indexed_count
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"검색 인덱스 재구성 실패: {str(e)}")
+
 @app.get("/api/users/{username}/sync-status")
 async def get_user_sync_status(username: str):
     """사용자의 GitHub 동기화 상태를 확인합니다."""
     try:
-        if not GITHUB_TOKEN:
+        if not github_api.GITHUB_TOKEN:
             return {
                 "github_configured": False,
                 "message": "GitHub 토큰이 설정되지 않았습니다"
             }
         
         # GitHub 연결 테스트
-        test_data = await load_user_data_from_github(username, "lectures")
+        test_data = await get_github_file_content(f"users/{username}/lectures.json")
         
         return {
             "github_configured": True,
@@ -1491,66 +1837,88 @@ async def get_user_sync_status(username: str):
         }
     except Exception as e:
         return {
-            "github_configured": bool(GITHUB_TOKEN),
+            "github_configured": bool(github_api.GITHUB_TOKEN),
             "github_connected": False,
             "error": str(e),
             "message": "GitHub 연결에 문제가 있습니다"
         }
 
 @app.get("/api/users/{username}/lectures/{lecture_id}/timer-records")
-async def get_user_timer_records(username: str, lecture_id: str):
-    """사용자의 특정 강의의 모든 타이머 기록 목록을 반환합니다."""
+async def get_user_timer_records(username: str, lecture_id: str, if_none_match: Optional[str] = Header(None)):
+    """사용자의 특정 강의의 모든 타이머 기록 목록을 반환합니다 (ETag, 바뀌지 않았으면 304)."""
     try:
         records = await list_timer_records(username, lecture_id)
-        return {
+        return conditional_json({
             "success": True,
             "records": records,
             "total_count": len(records)
-        }
+        }, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"타이머 기록 목록 로드 실패: {str(e)}")
 
 @app.get("/api/users/{username}/lectures/{lecture_id}/timer-records/{record_id}")
-async def get_user_timer_record(username: str, lecture_id: str, record_id: str):
-    """사용자의 특정 타이머 기록 내용을 반환합니다."""
+async def get_user_timer_record(username: str, lecture_id: str, record_id: str,
+                                if_none_match: Optional[str] = Header(None)):
+    """사용자의 특정 타이머 기록 내용을 반환합니다 (ETag 헤더 포함, 바뀌지 않았으면 304)."""
     try:
+        if if_none_match:
+            # 캐시에 기억해 둔 version으로 기록을 읽지 않고 판단합니다
+            version = storage.cached_record_version(username, lecture_id, record_id)
+            if version is not None:
+                etag = record_etag({"id": record_id, "version": version})
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+        
         record_data = await load_timer_record_file(username, lecture_id, record_id)
         
         if not record_data:
             raise HTTPException(status_code=404, detail="타이머 기록을 찾을 수 없습니다")
         
-        return {
+        etag = record_etag(record_data)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        # 저장소에서 읽은 JSON 그대로이므로 jsonable_encoder 없이 바로 직렬화합니다
+        return FastJSONResponse({
             "success": True,
             "record": record_data
-        }
+        }, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"타이머 기록 로드 실패: {str(e)}")
 
 @app.put("/api/users/{username}/lectures/{lecture_id}/timer-records/{record_id}")
-async def update_user_timer_record(username: str, lecture_id: str, record_id: str, session: TimerSession):
-    """사용자의 특정 타이머 기록을 업데이트합니다."""
+async def update_user_timer_record(username: str, lecture_id: str, record_id: str, session: TimerSession,
+                                   response: Response, if_match: Optional[str] = Header(None)):
+    """사용자의 특정 타이머 기록 전체를 교체합니다.
+
+    If-Match 헤더를 보내면 기록의 현재 ETag와 같을 때만 저장합니다 (다르면 412).
+    일부만 바꿀 때는 PATCH를 사용하세요.
+    """
     try:
-        # 기존 기록 확인
-        existing_record = await load_timer_record_file(username, lecture_id, record_id)
-        if not existing_record:
-            raise HTTPException(status_code=404, detail="타이머 기록을 찾을 수 없습니다")
-        
-        # 업데이트된 기록 데이터 준비
-        updated_record = {
-            "id": record_id,
-            "lecture_id": lecture_id,
-            "lecture_name": existing_record.get("lecture_name", ""),
-            "session_name": session.lecture_name,
-            "records": [record.dict() for record in session.records],
-            "created_at": existing_record.get("created_at", session.created_at),
-            "updated_at": datetime.now().isoformat()
-        }
-        
-        # 기록 파일 저장 (인덱스 자동 업데이트 포함)
-        github_success = await save_timer_record_file(username, lecture_id, record_id, updated_record)
+        async with record_lock(username, lecture_id, record_id):
+            # 기존 기록 확인
+            existing_record = await load_timer_record_file(username, lecture_id, record_id)
+            if not existing_record:
+                raise HTTPException(status_code=404, detail="타이머 기록을 찾을 수 없습니다")
+            check_record_precondition(existing_record, if_match)
+            
+            # 업데이트된 기록 데이터 준비
+            updated_record = {
+                "id": record_id,
+                "lecture_id": lecture_id,
+                "lecture_name": existing_record.get("lecture_name", ""),
+                "session_name": session.lecture_name,
+                "records": [record.dict() for record in session.records],
+                "created_at": existing_record.get("created_at", session.created_at),
+                "updated_at": datetime.now().isoformat(),
+                "version": record_version(existing_record) + 1
+            }
+            
+            # 기록 파일 저장 (인덱스 자동 업데이트 포함)
+            github_success = await save_timer_record_file(username, lecture_id, record_id, updated_record)
         
+        response.headers["ETag"] = record_etag(updated_record)
         return {
             "success": True,
             "message": "타이머 기록이 성공적으로 업데이트되었습니다",
@@ -1559,7 +1927,8 @@ async def update_user_timer_record(username: str, lecture_id: str, record_id: st
                 "session_name": session.lecture_name,
                 "created_at": updated_record["created_at"],
                 "updated_at": updated_record["updated_at"],
-                "records_count": len(session.records)
+                "records_count": len(session.records),
+                "version": updated_record["version"]
             },
             "github_sync": github_success
         }
@@ -1568,6 +1937,258 @@ async def update_user_timer_record(username: str, lecture_id: str, record_id: st
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"타이머 기록 업데이트 실패: {str(e)}")
 
+@app.patch("/api/users/{username}/lectures/{lecture_id}/timer-records/{record_id}")
+async def patch_user_timer_record(username: str, lecture_id: str, record_id: str, response: Response,
+                                  operations: List[Dict[str, Any]] = Body(...),
+                                  if_match: Optional[str] = Header(None)):
+    """타이머 기록의 일부를 JSON Patch (RFC 6902)로 수정합니다.
+
+    예: [{"op": "replace", "path": "/records/3/notes", "value": "..."}]
+    session_name과 records 아래만 수정할 수 있습니다. GET/PUT/PATCH 응답의 ETag를
+    If-Match 헤더로 보내야 하며, 그 사이 기록이 바뀌었으면 412를 반환합니다.
+    기록 문서만 다시 쓰고, 세션 이름이나 슬라이드 수처럼 인덱스에 보이는 필드가
+    바뀐 경우에만 인덱스를 갱신합니다.
+    """
+    if if_match is None:
+        raise HTTPException(status_code=428, detail="If-Match 헤더에 기록의 ETag를 보내야 합니다")
+    
+    try:
+        touched = json_patch.touched_roots(operations)
+        if not touched <= set(RECORD_PATCHABLE_FIELDS):
+            raise HTTPException(
+                status_code=400,
+                detail=f"수정할 수 없는 필드입니다: {', '.join(sorted(touched - set(RECORD_PATCHABLE_FIELDS))) or '/'}"
+            )
+        
+        async with record_lock(username, lecture_id, record_id):
+            existing_record = await load_timer_record_file(username, lecture_id, record_id)
+            if not existing_record:
+                raise HTTPException(status_code=404, detail="타이머 기록을 찾을 수 없습니다")
+            check_record_precondition(existing_record, if_match)
+            
+            patched_record = json_patch.apply_patch(existing_record, operations)
+            structure_error = find_record_structure_error(patched_record)
+            if structure_error:
+                raise HTTPException(status_code=422, detail=structure_error)
+            
+            patched_record["updated_at"] = datetime.now().isoformat()
+            patched_record["version"] = record_version(existing_record) + 1
+            
+            index_updated = index_fields_changed(existing_record, patched_record)
+            github_success = await save_timer_record_file(
+                username, lecture_id, record_id, patched_record, update_index=index_updated
+            )
+        
+        response.headers["ETag"] = record_etag(patched_record)
+        return {
+            "success": True,
+            "message": "타이머 기록이 수정되었습니다",
+            "timer_record": {
+                "id": record_id,
+                "session_name": patched_record.get("session_name", ""),
+                "created_at": patched_record.get("created_at"),
+                "updated_at": patched_record["updated_at"],
+                "records_count": len(patched_record.get("records", [])),
+                "version": patched_record["version"]
+            },
+            "index_updated": index_updated,
+            "github_sync": github_success
+        }
+    except HTTPException:
+        raise
+    except json_patch.PatchConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except json_patch.PatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"타이머 기록 수정 실패: {str(e)}")
+
+# 실시간 타이머 세션 (WebSocket)
+# 이 워커에서 연결 중인 세션 (같은 세션에 두 연결이 동시에 쓰지 않도록)
+_live_sessions: Dict[str, LiveSession] = {}
+_LIVE_SESSION_ID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+def live_session_dir(username: str, lecture_id: str) -> Path:
+    # 경로 조각이 LIVE_DIR 밖을 가리키지 않도록 한 단계 이름만 허용합니다
+    for part in (username, lecture_id):
+        if part in ("", ".", "..") or "/" in part or "\\" in part or "\0" in part:
+            raise HTTPException(status_code=400, detail="올바르지 않은 경로입니다")
+    return LIVE_DIR / username / lecture_id
+
+def live_session_path(username: str, lecture_id: str, session_id: str) -> Path:
+    if not _LIVE_SESSION_ID_RE.fullmatch(session_id):
+        raise HTTPException(status_code=400, detail="올바르지 않은 세션 ID입니다")
+    return live_session_dir(username, lecture_id) / f"{session_id}.ndjson"
+
+def open_idle_live_session(username: str, lecture_id: str, session_id: str) -> LiveSession:
+    """연결되어 있지 않은 세션의 로그를 잠가서 엽니다 (REST finish/삭제용).
+
+    이 워커나 다른 워커의 연결이 쓰고 있으면 409, 로그가 없으면 404.
+    """
+    path = live_session_path(username, lecture_id, session_id)
+    if session_id in _live_sessions:
+        raise HTTPException(status_code=409, detail="연결 중인 세션입니다")
+    try:
+        return LiveSession.open(path, fsync_interval=LIVE_FSYNC_INTERVAL, create=False)
+    except LiveSessionBusy:
+        raise HTTPException(status_code=409, detail="연결 중인 세션입니다")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="실시간 세션을 찾을 수 없습니다")
+
+async def finish_live_session(username: str, lecture_id: str, session: LiveSession,
+                              session_name: Optional[str] = None) -> Dict:
+    """실시간 세션을 타이머 기록 하나로 저장하고 로그를 지웁니다.
+
+    기록 ID는 세션 ID와 같으므로 저장 직후 중단되어 다시 마쳐도 같은 기록을 덮어씁니다.
+    덮어쓸 때는 버전을 올려 이전 ETag로 304가 나가지 않게 합니다.
+    """
+    target_lecture = await get_user_lecture_or_404(username, lecture_id)
+    existing = await load_timer_record_file(username, lecture_id, session.session_id)
+    now = datetime.now().isoformat()
+    timer_record = {
+        "id": session.session_id,
+        "lecture_id": lecture_id,
+        "lecture_name": target_lecture.get("name", ""),
+        "session_name": session_name or session.session_name,
+        "records": session.records,
+        "created_at": session.created_at or now,
+        "updated_at": now,
+        "version": record_version(existing) + 1 if existing else 1
+    }
+    
+    github_success = await save_timer_record_file(username, lecture_id, session.session_id, timer_record)
+    await session.discard()
+    
+    return {
+        "timer_record": {
+            "id": session.session_id,
+            "session_name": timer_record["session_name"],
+            "created_at": timer_record["created_at"],
+            "updated_at": timer_record["updated_at"],
+            "records_count": len(timer_record["records"])
+        },
+        "github_sync": github_success
+    }
+
+@app.websocket("/api/users/{username}/lectures/{lecture_id}/live")
+async def live_timer_session(websocket: WebSocket, username: str, lecture_id: str,
+                             session_id: Optional[str] = None, session_name: str = ""):
+    """슬라이드 기록 이벤트를 실시간으로 받아 서버 로그에 남기는 타이머 세션.
+
+    연결하면 {"type": "ready", "session_id", "records", "seq"}를 보내고, 이벤트마다
+    {"type": "ack", "seq"}로 답합니다. {"type": "finish"}를 보내면 타이머 기록으로 저장하고
+    {"type": "saved", "timer_record"}를 보낸 뒤 연결을 닫습니다. 끊긴 세션은 같은
+    session_id로 다시 연결하면 이어집니다. 이벤트 형식은 live_session.py 참고.
+    """
+    await websocket.accept()
+    session = None
+    try:
+        await get_user_lecture_or_404(username, lecture_id)
+        session_id = session_id or str(uuid.uuid4())
+        path = live_session_path(username, lecture_id, session_id)
+        if session_id in _live_sessions:
+            raise HTTPException(status_code=409, detail="이미 다른 연결에서 진행 중인 세션입니다")
+        
+        try:
+            session = LiveSession.open(path, session_name, LIVE_FSYNC_INTERVAL)
+        except LiveSessionBusy:
+            # 다른 워커의 연결이나 finish/삭제 요청이 로그를 잡고 있음
+            raise HTTPException(status_code=409, detail="이미 다른 연결에서 진행 중인 세션입니다")
+        _live_sessions[session_id] = session
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=4000 + e.status_code)
+        return
+    except Exception as e:
+        logger.error("실시간 타이머 세션 열기 실패 (%s): %s", session_id, e)
+        await websocket.send_json({"type": "error", "detail": f"실시간 세션 열기 실패: {str(e)}"})
+        await websocket.close(code=1011)
+        return
+    
+    try:
+        await websocket.send_json({"type": "ready", **session.snapshot()})
+        
+        while True:
+            try:
+                event = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                await websocket.send_json({"type": "error", "detail": "JSON 형식이 아닙니다", "seq": session.seq})
+                continue
+            
+            if isinstance(event, dict) and event.get("type") == "finish":
+                result = await finish_live_session(username, lecture_id, session, event.get("session_name"))
+                await websocket.send_json({"type": "saved", **result})
+                await websocket.close()
+                break
+            
+            try:
+                seq = session.apply(event)
+                await websocket.send_json({"type": "ack", "seq": seq, "records_count": len(session.records)})
+            except LiveSessionError as e:
+                await websocket.send_json({"type": "error", "detail": str(e), "seq": session.seq})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("실시간 타이머 세션 오류 (%s): %s", session.session_id, e)
+        try:
+            await websocket.send_json({"type": "error", "detail": f"실시간 세션 처리 실패: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        _live_sessions.pop(session.session_id, None)
+        # 마치지 않은 세션의 로그는 남겨 두어 다시 연결하거나 나중에 저장할 수 있게 합니다
+        await session.close()
+
+@app.get("/api/users/{username}/lectures/{lecture_id}/live")
+async def get_live_timer_sessions(username: str, lecture_id: str):
+    """아직 기록으로 저장하지 않은 실시간 세션 목록 (연결이 끊기거나 서버가 중단된 세션 포함)."""
+    await get_user_lecture_or_404(username, lecture_id)
+    try:
+        sessions = list_live_sessions(live_session_dir(username, lecture_id))
+        for info in sessions:
+            info["connected"] = info["session_id"] in _live_sessions
+        return {
+            "success": True,
+            "sessions": sessions,
+            "total_count": len(sessions)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"실시간 세션 목록 로드 실패: {str(e)}")
+
+@app.post("/api/users/{username}/lectures/{lecture_id}/live/{session_id}/finish")
+async def finish_live_timer_session(username: str, lecture_id: str, session_id: str):
+    """연결이 끊긴 실시간 세션을 로그에서 복원해 타이머 기록으로 저장합니다."""
+    await get_user_lecture_or_404(username, lecture_id)
+    session = open_idle_live_session(username, lecture_id, session_id)
+    # 저장하는 동안 같은 워커의 WebSocket이 세션에 붙지 않도록 등록해 둡니다
+    _live_sessions[session_id] = session
+    try:
+        try:
+            result = await finish_live_session(username, lecture_id, session)
+        finally:
+            _live_sessions.pop(session_id, None)
+            await session.close()
+        return {
+            "success": True,
+            "message": "실시간 세션이 타이머 기록으로 저장되었습니다",
+            **result
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"실시간 세션 저장 실패: {str(e)}")
+
+@app.delete("/api/users/{username}/lectures/{lecture_id}/live/{session_id}")
+async def delete_live_timer_session(username: str, lecture_id: str, session_id: str):
+    """저장하지 않을 실시간 세션의 로그를 지웁니다."""
+    await get_user_lecture_or_404(username, lecture_id)
+    session = open_idle_live_session(username, lecture_id, session_id)
+    await session.discard()
+    return {"success": True, "message": "실시간 세션이 삭제되었습니다"}
+
 @app.delete("/api/users/{username}/lectures/{lecture_id}/timer-records/{record_id}")
 async def delete_user_timer_record(username: str, lecture_id: str, record_id: str):
     """사용자의 특정 타이머 기록을 삭제합니다."""
@@ -1595,10 +2216,7 @@ async def get_records_index_status(username: str, lecture_id: str):
         index_records = index_data.get("records", [])
         
         # 실제 파일 개수 확인
-        records_dir = get_user_records_dir(username, lecture_id)
-        actual_files = []
-        if records_dir.exists():
-            actual_files = [f.stem for f in records_dir.glob("*.json") if f.name != "index.json"]
+        actual_files = await storage.list_record_ids(username, lecture_id)
         
         # 싱크 상태 확인
         index_ids = set(r.get("id") for r in index_records)
@@ -1630,40 +2248,11 @@ async def rebuild_records_index(username: str, lecture_id: str):
     """타이머 기록 인덱스를 재구성합니다."""
     try:
         # 새로운 빈 인덱스 생성
-        new_index = {
-            "version": "1.0",
-            "lecture_id": lecture_id,
-            "records": [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        new_index = make_empty_index(lecture_id)
         
         # 기존 기록 파일들을 스캔하여 인덱스 재구성
-        records_dir = get_user_records_dir(username, lecture_id)
-        added_count = 0
-        
-        if records_dir.exists():
-            for record_file in records_dir.glob("*.json"):
-                if record_file.name == "index.json":
-                    continue
-                
-                try:
-                    with open(record_file, 'r', encoding='utf-8') as f:
-                        record_data = json.load(f)
-                    
-                    # 인덱스에 추가
-                    record_info = {
-                        "id": record_file.stem,
-                        "session_name": record_data.get("session_name", ""),
-                        "created_at": record_data.get("created_at", datetime.now().isoformat()),
-                        "updated_at": record_data.get("updated_at", datetime.now().isoformat()),
-                        "records_count": len(record_data.get("records", []))
-                    }
-                    new_index["records"].append(record_info)
-                    added_count += 1
-                except Exception as e:
-                    print(f"기록 파일 처리 실패 {record_file}: {e}")
-                    continue
+        new_index["records"] = await scan_record_infos(username, lecture_id)
+        added_count = len(new_index["records"])
         
         # 생성 시간 기준 역순 정렬
         new_index["records"].sort(key=lambda x: x.get("created_at", ""), reverse=True)
@@ -1709,57 +2298,25 @@ async def sync_records_index(username: str, lecture_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"인덱스 동기화 실패: {str(e)}")
 
-async def get_github_directory_contents(dir_path: str) -> List[str]:
-    """GitHub에서 디렉토리 내 파일 목록을 가져옵니다."""
-    headers = get_github_headers()
-    if not headers:
-        return []
-        
-    try:
-        url = f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}/contents/{dir_path}"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            
-            if response.status_code == 404:
-                return []  # 디렉토리가 없으면 빈 리스트 반환
-            
-            if response.status_code != 200:
-                print(f"GitHub API 오류: {response.status_code}")
-                return []
-                
-            data = response.json()
-            
-            # 파일들만 필터링 (디렉토리 제외)
-            if isinstance(data, list):
-                files = [item['name'] for item in data if item['type'] == 'file' and item['name'].endswith('.json')]
-                return files
-            
-            return []
-            
-    except Exception as e:
-        print(f"GitHub 디렉토리 내용 가져오기 오류: {e}")
-        return []
-
 @app.post("/api/users/{username}/lectures/{lecture_id}/timer-records/upload")
 async def upload_user_timer_record(username: str, lecture_id: str, file: UploadFile = File(...)):
     """사용자의 특정 강의에 타이머 기록 JSON 파일을 업로드합니다."""
     try:
-        # 디버깅 로그
-        print(f"Upload request - Username: {username}, Lecture ID: {lecture_id}")
-        print(f"File info - Name: {file.filename}, Content-Type: {file.content_type}, Size: {file.size}")
+        logger.debug("타이머 기록 업로드 요청", extra={
+            "username": username, "lecture_id": lecture_id, "upload_filename": file.filename,
+            "content_type": file.content_type, "size": file.size
+        })
         
         # 파일 형식 검증 (파일명과 Content-Type 모두 확인)
         if not file.filename:
             raise HTTPException(status_code=400, detail="파일명이 비어있습니다")
             
         if not file.filename.lower().endswith('.json'):
-            print(f"Invalid file extension: {file.filename}")
             raise HTTPException(status_code=400, detail="JSON 파일만 업로드 가능합니다")
         
         # Content-Type 검증 (선택적, 브라우저마다 다를 수 있음)
         if file.content_type and not file.content_type.startswith('application/json'):
-            print(f"Warning: Content-Type is {file.content_type}, but accepting anyway")
+            logger.debug("JSON이 아닌 Content-Type이지만 허용합니다", extra={"content_type": file.content_type})
         
         # 파일 크기 검증
         if file.size and file.size > 10 * 1024 * 1024:  # 10MB
@@ -1767,17 +2324,13 @@ async def upload_user_timer_record(username: str, lecture_id: str, file: UploadF
         
         # 파일 내용 읽기 및 검증
         content = await file.read()
-        print(f"File content length: {len(content)} bytes")
         
         try:
             json_content = content.decode('utf-8')
             json_data = json.loads(json_content)
-            print(f"JSON parsing successful, data type: {type(json_data)}")
-        except UnicodeDecodeError as e:
-            print(f"Encoding error: {e}")
+        except UnicodeDecodeError:
             raise HTTPException(status_code=400, detail="올바르지 않은 파일 인코딩입니다. UTF-8로 인코딩된 JSON 파일을 사용하세요")
         except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
             raise HTTPException(status_code=400, detail=f"올바르지 않은 JSON 형식입니다: {str(e)}")
         
         # JSON 구조 검증 (타이머 기록용)
@@ -1785,57 +2338,34 @@ async def upload_user_timer_record(username: str, lecture_id: str, file: UploadF
             # 표준 타이머 세션 형식
             records = json_data['records']
             session_name = json_data.get('session_name', json_data.get('lecture_name', Path(file.filename).stem))
-            print(f"Standard timer session format detected, records count: {len(records)}")
         elif isinstance(json_data, list):
             # 기록 배열 형식
             records = json_data
             session_name = Path(file.filename).stem
-            print(f"Records array format detected, records count: {len(records)}")
         else:
-            print(f"Invalid JSON structure, data keys: {list(json_data.keys()) if isinstance(json_data, dict) else 'not a dict'}")
             raise HTTPException(status_code=400, detail="올바르지 않은 JSON 구조입니다. 'records' 필드가 있는 객체이거나 기록 배열이어야 합니다")
         
         # 기록 구조 검증
         required_fields = ['slide_title', 'slide_number', 'start_time', 'end_time']
         for i, record in enumerate(records):
             if not isinstance(record, dict):
-                print(f"Record {i+1} is not a dict: {type(record)}")
                 raise HTTPException(status_code=400, detail=f"기록 {i+1}이 올바른 객체가 아닙니다")
             for field in required_fields:
                 if field not in record:
-                    print(f"Record {i+1} missing field: {field}, available fields: {list(record.keys())}")
                     raise HTTPException(status_code=400, detail=f"기록 {i+1}에서 필수 필드가 누락되었습니다: {field}")
         
-        print("Record structure validation passed")
-        
-        # 강의 존재 확인
-        current_data = await load_user_data_from_github(username, "lectures")
-        if not current_data:
-            user_dir = get_user_data_dir(username)
-            lectures_file = user_dir / "lectures.json"
-            
-            if lectures_file.exists():
-                with open(lectures_file, 'r', encoding='utf-8') as f:
-                    current_data = json.load(f)
-            else:
-                print("No lectures file found")
-                raise HTTPException(status_code=404, detail="강의 목록을 찾을 수 없습니다")
-        
-        # 강의 찾기
-        lectures = current_data.get("lectures", [])
-        target_lecture = None
-        
-        for lecture in lectures:
-            if lecture.get("id") == lecture_id:
-                target_lecture = lecture
-                break
+        invalid_time = find_invalid_record_time(records)
+        if invalid_time:
+            i, field = invalid_time
+            raise HTTPException(status_code=400, detail=f"기록 {i+1}의 {field} 형식이 올바르지 않습니다 (HH:MM:SS.mmm)")
         
-        if not target_lecture:
-            print(f"Lecture not found: {lecture_id}")
-            print(f"Available lectures: {[l.get('id') for l in lectures]}")
-            raise HTTPException(status_code=404, detail="강의를 찾을 수 없습니다")
+        logger.debug("타이머 기록 파일 검증 통과", extra={
+            "bytes": len(content), "format": "array" if isinstance(json_data, list) else "session",
+            "records_count": len(records)
+        })
         
-        print(f"Target lecture found: {target_lecture.get('name')}")
+        # 강의 존재 확인
+        target_lecture = await get_user_lecture_or_404(username, lecture_id)
         
         # 타이머 기록 데이터 준비
         record_id = str(uuid.uuid4())
@@ -1847,15 +2377,17 @@ async def upload_user_timer_record(username: str, lecture_id: str, file: UploadF
             "records": records,
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
-            "uploaded_from": file.filename
+            "uploaded_from": file.filename,
+            "version": 1
         }
         
-        print(f"Saving timer record with ID: {record_id}")
-        
         # 독립된 JSON 파일로 저장
         github_success = await save_timer_record_file(username, lecture_id, record_id, timer_record)
         
-        print(f"Timer record saved successfully, GitHub sync: {github_success}")
+        logger.info("타이머 기록 업로드 저장", extra={
+            "username": username, "lecture_id": lecture_id, "record_id": record_id,
+            "records_count": len(records), "github_sync": github_success
+        })
         
         return {
             "success": True,
@@ -1874,10 +2406,60 @@ async def upload_user_timer_record(username: str, lecture_id: str, file: UploadF
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Unexpected error in upload_user_timer_record: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("타이머 기록 업로드 중 예기치 않은 오류")
         raise HTTPException(status_code=500, detail=f"타이머 기록 저장 실패: {str(e)}")
 
+# Bulk data (backup / restore / clear)
+@app.get("/api/export/all")
+async def export_all_data(username: str, format: str = "zip"):
+    """사용자의 강의 목록, 타이머 기록, 인덱스를 zip 또는 tar.gz로 스트리밍합니다."""
+    if format not in bulk_data.ARCHIVE_FORMATS:
+        raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다 (zip 또는 tar)")
+    
+    stream, media_type, extension = bulk_data.ARCHIVE_FORMATS[format]
+    filename = f"slide_scribe_backup_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return StreamingResponse(
+        stream(bulk_data.iter_backup_entries(storage, username)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/api/import/all")
+async def import_all_data(username: str, file: UploadFile = File(...)):
+    """백업 아카이브를 검증한 뒤 사용자 데이터에 한 번에 합칩니다."""
+    try:
+        archive = bulk_data.BackupArchive(file.file)
+        result = await bulk_data.import_backup(storage, username, archive)
+        await update_search_index(search_index.index_records, username, bulk_data.iter_import_records(archive))
+        
+        return {
+            "success": True,
+            "message": f"강의 {result['lectures']}개, 타이머 기록 {result['records']}개를 가져왔습니다",
+            "imported": {
+                "lectures": result["lectures"],
+                "records": result["records"]
+            },
+            "github_sync": result["success"]
+        }
+    except bulk_data.BackupError as e:
+        raise HTTPException(status_code=400, detail=f"백업 파일 오류: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 가져오기 실패: {str(e)}")
+
+@app.delete("/api/clear/all")
+async def clear_all_data(username: str):
+    """사용자의 강의, 타이머 기록, 인덱스를 한 번에 모두 삭제합니다 (계정은 유지)."""
+    try:
+        github_success = await storage.clear_user_data(username)
+        await update_search_index(search_index.remove_user, username)
+        
+        return {
+            "success": True,
+            "message": "모든 데이터가 삭제되었습니다",
+            "github_sync": github_success
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 삭제 실패: {str(e)}")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""벤치마크 공용 유틸리티.
+
+측정 결과는 {"이름": 통계} 형태로 모아 JSON 파일(기준선)로 저장하고 비교합니다.
+파일에는 측정한 환경(Python, CPU 수, 커밋)도 함께 기록합니다.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = REPO_ROOT / "benchmarks" / "baseline.json"
+
+def prepare_workdir() -> Path:
+    """임시 작업 디렉토리를 만들고 backend를 import할 수 있게 준비합니다.
+
+    backend.py는 현재 디렉토리 기준 data/, static/ 경로를 사용하므로
+    벤치마크가 저장소의 data/를 건드리지 않도록 임시 디렉토리로 이동합니다.
+    (상대 경로 인자는 이 함수를 부르기 전에 절대 경로로 바꿔 두세요.)
+    """
+    # 요청 로그가 결과 표에 섞이지 않도록 경고 이상만 출력합니다
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    workdir = Path(tempfile.mkdtemp(prefix="slide-scribe-bench-"))
+    (workdir / "static").symlink_to(REPO_ROOT / "static", target_is_directory=True)
+    os.chdir(workdir)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    return workdir
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """초 단위 측정값 목록을 밀리초 통계로 요약합니다."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    if not n:
+        return {"n": 0}
+
+    def pct(p: float) -> float:
+        return ordered[min(n - 1, int(round(p * (n - 1))))] * 1000
+
+    return {
+        "n": n,
+        "mean_ms": sum(ordered) / n * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int = 1) -> Dict[str, float]:
+    """fn을 warmup번 실행한 뒤 iterations번 측정합니다."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(iterations):
+        with Timer(samples):
+            fn()
+    return summarize(samples)
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        await fn()
+    samples: List[float] = []
+    for _ in range(iterations):
+        with Timer(samples):
+            await fn()
+    return summarize(samples)
+
+def environment() -> Dict[str, Any]:
+    """결과를 비교할 때 확인할 측정 환경."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write_results(path: Path, results: Dict[str, Dict], params: Optional[Dict] = None) -> None:
+    document = {"environment": environment(), "params": params or {}, "benchmarks": results}
+    Path(path).write_text(json.dumps(document, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def print_results(results: Dict[str, Dict]) -> None:
+    width = max((len(name) for name in results), default=0)
+    for name, stats in results.items():
+        extra = "".join(f"  {key} {value:.2f}" if isinstance(value, float) else f"  {key} {value}"
+                        for key, value in stats.items()
+                        if key not in ("n", "mean_ms", "min_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        print(f"{name:{width}s}  mean {stats['mean_ms']:9.3f}ms  p50 {stats['p50_ms']:9.3f}ms  "
+              f"p95 {stats['p95_ms']:9.3f}ms{extra}")
+
+class Timer:
+    """with 블록 실행 시간을 samples 목록에 추가합니다."""
+
+    def __init__(self, samples: List[float]):
+        self.samples = samples
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.start)
@@ -0,0 +1,76 @@
+"""벤치마크 결과 비교.
+
+    python -m benchmarks.compare benchmarks/baseline.json current.json
+    python -m benchmarks.compare old.json new.json --metric mean_ms --threshold 0.1
+
+두 결과 파일에 모두 있는 항목의 지표(기본 p50_ms)를 비교합니다. threshold 비율보다
+느려지고 차이가 min-delta-ms보다 크면 회귀(regression)로 표시하고 종료 코드 1을
+돌려주므로 CI에서 그대로 쓸 수 있습니다. 서로 다른 기계에서 잰 결과는 비교하지 마세요
+(파일의 environment를 확인하세요).
+"""
+from typing import Dict, List
+import argparse
+import sys
+
+from benchmarks.common import load_results
+
+def compare(baseline: Dict[str, Dict], current: Dict[str, Dict], threshold: float = 0.25,
+            metric: str = "p50_ms", min_delta_ms: float = 0.05) -> List[Dict]:
+    """항목별 비교 결과 목록 (status: regression | improved | ok | new | missing)."""
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        before = baseline.get(name, {}).get(metric)
+        after = current.get(name, {}).get(metric)
+        row = {"name": name, "baseline": before, "current": after, "change": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        else:
+            change = (after - before) / before if before else 0.0
+            row["change"] = change
+            if change > threshold and after - before > min_delta_ms:
+                row["status"] = "regression"
+            elif change < -threshold and before - after > min_delta_ms:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+def print_comparison(rows: List[Dict]) -> None:
+    width = max((len(row["name"]) for row in rows), default=0)
+
+    def fmt(value):
+        return f"{value:10.3f}" if value is not None else f"{'-':>10s}"
+
+    print(f"{'benchmark':{width}s}  {'baseline':>10s}  {'current':>10s}  {'change':>8s}  status")
+    for row in rows:
+        change = f"{row['change'] * 100:+7.1f}%" if row["change"] is not None else f"{'':>8s}"
+        print(f"{row['name']:{width}s}  {fmt(row['baseline'])}  {fmt(row['current'])}  {change}  {row['status']}")
+    counts = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    print(", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p50_ms", help="비교할 통계 (p50_ms, mean_ms, min_ms, p95_ms)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="회귀로 볼 증가 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="이보다 작은 차이는 무시 (잡음)")
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    for label, document in (("baseline", baseline), ("current", current)):
+        env = document.get("environment", {})
+        print(f"{label}: {env.get('created_at')} commit {env.get('commit')} "
+              f"python {env.get('python')} cpus {env.get('cpu_count')}")
+    rows = compare(baseline["benchmarks"], current["benchmarks"], args.threshold, args.metric, args.min_delta_ms)
+    print_comparison(rows)
+    if any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
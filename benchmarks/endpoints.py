@@ -0,0 +1,107 @@
+"""API 엔드포인트 종단 벤치마크 (TestClient + 로컬 GitHub 대역).
+
+미들웨어(압축, 지표, 요청 ID), 검증, 저장소, 캐시를 모두 거친 요청 한 번의 시간을
+엔드포인트별로 잽니다. 응답 코드가 예상과 다르면 바로 실패합니다.
+
+    python -m benchmarks.endpoints --iterations 30 --latency 0.01
+"""
+from pathlib import Path
+from typing import Dict
+import argparse
+import json
+import os
+
+from benchmarks.common import measure, prepare_workdir, print_results, write_results
+from benchmarks.transcripts import bundled_srts, srt_duration, synthetic_srt, timer_records
+
+def _check(response, status: int = 200):
+    if response.status_code != status:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path}: "
+                           f"{response.status_code} (예상 {status}) {response.text[:200]}")
+    return response
+
+def collect(iterations: int = 30, latency: float = 0.0) -> Dict[str, Dict]:
+    from fastapi.testclient import TestClient
+    import backend
+    from fake_github import FakeGitHub
+
+    fake = FakeGitHub(latency=latency, seed=1)
+    fake.install()
+    bundled = bundled_srts()
+    srt_name, srt_content = bundled[0] if bundled else ("synthetic-1h", synthetic_srt(1))
+    slides = timer_records(srt_duration(srt_content))
+    session = {"lecture_name": "bench", "created_at": "2025-01-01T00:00:00",
+               "updated_at": "2025-01-01T00:00:00", "records": slides}
+    gzip_headers = {"Accept-Encoding": "gzip"}
+
+    results = {}
+    with TestClient(backend.app) as client:
+        _check(client.post("/api/auth/register", json={"username": "bench", "password": "bench-pw"}))
+        user = "/api/users/bench"
+        lecture_id = _check(client.post(f"{user}/lectures", json={"name": "bench"})).json()["lecture"]["id"]
+        records = f"{user}/lectures/{lecture_id}/timer-records"
+        record_id = _check(client.post(records, json=session)).json()["timer_record"]["id"]
+        record = f"{records}/{record_id}"
+
+        def login():
+            _check(client.post("/api/auth/login", json={"username": "bench", "password": "bench-pw"}))
+
+        def get_record_revalidated():
+            etag = _check(client.get(record)).headers["etag"]
+            _check(client.get(record, headers={"If-None-Match": etag}), 304)
+
+        def put_record():
+            etag = _check(client.get(record)).headers["etag"]
+            _check(client.put(record, json=session, headers={"If-Match": etag}))
+
+        def upload():
+            return _check(client.post("/api/srt/upload", files={
+                "file": (f"{srt_name}.srt", srt_content.encode("utf-8"), "text/plain")
+            })).json()["file_id"]
+
+        file_id = upload()
+        parse_form = {"file_id": file_id, "timer_records": json.dumps(slides)}
+        job_id = _check(client.post("/api/srt/parse-with-data", data=parse_form)).json()["job_id"]
+
+        operations = {
+            "POST /api/auth/login": login,
+            "GET /api/users/{u}/lectures": lambda: _check(client.get(f"{user}/lectures", headers=gzip_headers)),
+            "POST .../timer-records": lambda: _check(client.post(records, json=session)),
+            "GET .../timer-records": lambda: _check(client.get(records, headers=gzip_headers)),
+            "GET .../timer-records/{r}": lambda: _check(client.get(record, headers=gzip_headers)),
+            "GET .../timer-records/{r} (+304)": get_record_revalidated,
+            "PUT .../timer-records/{r}": put_record,
+            "POST /api/srt/upload": upload,
+            "POST /api/srt/parse-with-data": lambda: _check(
+                client.post("/api/srt/parse-with-data", data=parse_form, headers=gzip_headers)),
+            "GET /api/srt/preview/{f}": lambda: _check(
+                client.get(f"/api/srt/preview/{file_id}", params={"limit": 100}, headers=gzip_headers)),
+            "GET /api/srt/jobs/{j}/export": lambda: _check(
+                client.get(f"/api/srt/jobs/{job_id}/export", params={"format": "json"}, headers=gzip_headers)),
+        }
+        for name, operation in operations.items():
+            before = fake.request_count
+            stats = measure(operation, iterations)
+            # warmup 1회 포함
+            stats["github_requests_per_call"] = (fake.request_count - before) / (iterations + 1)
+            results[f"endpoint.{name}"] = stats
+    fake.uninstall()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 서버 요청당 지연 (초)")
+    parser.add_argument("--output", help="결과 JSON 파일 (benchmarks.compare로 비교)")
+    args = parser.parse_args()
+    output = Path(args.output).resolve() if args.output else None
+
+    os.environ.setdefault("STORAGE_BACKEND", "github")
+    prepare_workdir()
+    results = collect(args.iterations, args.latency)
+    print_results(results)
+    if output:
+        write_results(output, results, {"iterations": args.iterations, "latency": args.latency})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""GitHub 동기화 경로 벤치마크 (로컬 GitHub 대역 사용, 네트워크 불필요).
+
+    python -m benchmarks.github_sync --iterations 50 --latency 0.03
+"""
+from pathlib import Path
+from typing import Dict
+import argparse
+import asyncio
+import os
+import uuid
+
+from benchmarks.common import prepare_workdir, print_results, summarize, Timer, write_results
+
+async def collect(iterations: int = 30, latency: float = 0.0, jitter: float = 0.0,
+                  conflict_rate: float = 0.0, users: int = 100, slides: int = 50) -> Dict[str, Dict]:
+    import backend
+    from fake_github import FakeGitHub
+
+    fake = FakeGitHub(latency=latency, jitter=jitter, conflict_rate=conflict_rate, seed=1)
+    fake.install()
+    fake.seed_file("users.json", {
+        f"user{i}": {"username": f"user{i}", "password_hash": "x", "created_at": "2025-01-01T00:00:00"}
+        for i in range(users)
+    })
+
+    username, lecture_id = "user0", str(uuid.uuid4())
+    slides = [
+        {"slide_title": f"Slide {i}", "slide_number": str(i), "start_time": "00:00:00.000",
+         "end_time": "00:00:10.000", "notes": ""}
+        for i in range(slides)
+    ]
+
+    operations = {
+        "load_users_from_github": lambda: backend.load_users_from_github(),
+        "save_timer_record_file": None,
+        "load_records_index": lambda: backend.load_records_index(username, lecture_id),
+        "list_timer_records": lambda: backend.list_timer_records(username, lecture_id),
+    }
+    results = {}
+    for name, factory in operations.items():
+        samples = []
+        before = fake.request_count
+        for i in range(iterations):
+            if name == "save_timer_record_file":
+                record_id = str(uuid.uuid4())
+                record = {"id": record_id, "lecture_id": lecture_id, "session_name": f"s{i}",
+                          "records": slides, "created_at": f"2025-01-01T00:00:{i % 60:02d}",
+                          "updated_at": "2025-01-01T00:00:00"}
+                with Timer(samples):
+                    await backend.save_timer_record_file(username, lecture_id, record_id, record)
+            else:
+                with Timer(samples):
+                    await factory()
+        stats = summarize(samples)
+        stats["github_requests_per_call"] = (fake.request_count - before) / iterations
+        results[f"github_sync.{name}"] = stats
+
+    fake.uninstall()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 서버 요청당 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--conflict-rate", type=float, default=0.0)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--slides", type=int, default=50)
+    parser.add_argument("--output", help="결과 JSON 파일 (benchmarks.compare로 비교)")
+    args = parser.parse_args()
+    output = Path(args.output).resolve() if args.output else None
+
+    os.environ.setdefault("STORAGE_BACKEND", "github")
+    prepare_workdir()
+    params = {key: value for key, value in vars(args).items() if key != "output"}
+    results = asyncio.run(collect(**params))
+    print_results(results)
+    if output:
+        write_results(output, results, params)
+
+if __name__ == "__main__":
+    main()
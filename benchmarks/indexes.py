@@ -0,0 +1,154 @@
+"""인덱스 경로 벤치마크 (자막 인덱스, 타이머 기록 인덱스, 전문 검색).
+
+- cue_index: 인코딩, 사이드카 열기, 시간 구간 탐색, 단어 → 문장 합치기
+- 기록 인덱스: add/update/remove_record_from_index, load_records_index (캐시 적중/미적중)
+  로컬 GitHub 대역을 사용하므로 네트워크가 필요 없습니다.
+- 전문 검색: 기록 일괄 색인과 검색
+
+    python -m benchmarks.indexes --iterations 20 --records 200
+"""
+from pathlib import Path
+from typing import Dict
+import argparse
+import asyncio
+import os
+import random
+import uuid
+
+from benchmarks.common import measure, measure_async, prepare_workdir, print_results, write_results
+from benchmarks.transcripts import srt_inputs, synthetic_srt, timer_records
+
+def collect_cue_index(iterations: int, quick: bool) -> Dict[str, Dict]:
+    import backend
+    import cue_index
+    from cue_index import CueIndex
+
+    results = {}
+    for name, content in srt_inputs(quick):
+        subtitles = backend.parse_srt_content(content)
+        data = cue_index.encode(subtitles)
+        path = Path("bench-cues") / f"{name}.cues"
+        cue_index.save(path, data)
+        index = CueIndex.open(path)
+
+        results[f"index.cue_encode[{name}]"] = measure(lambda: cue_index.encode(subtitles), iterations)
+        # load()는 열어 둔 memmap을 재사용하므로 매번 새로 여는 비용은 open()으로 잽니다
+        results[f"index.cue_open[{name}]"] = measure(lambda: CueIndex.open(path), iterations)
+
+        rng = random.Random(1)
+        windows = [(t, t + 300) for t in (rng.uniform(0, index.duration) for _ in range(1000))]
+
+        def time_ranges():
+            for start, end in windows:
+                index.time_range(start, end)
+
+        stats = measure(time_ranges, iterations)
+        stats["lookups"] = len(windows)
+        results[f"index.cue_time_range[{name}]"] = stats
+
+        results[f"index.cue_coalesce[{name}]"] = measure(
+            lambda: cue_index.coalesce(index, punctuation=cue_index.COALESCE_MODES["sentence"]), iterations
+        )
+    return results
+
+async def collect_records_index(iterations: int, record_count: int) -> Dict[str, Dict]:
+    import backend
+    from fake_github import FakeGitHub
+
+    fake = FakeGitHub(seed=1)
+    fake.install()
+    username, lecture_id = "bench", str(uuid.uuid4())
+    slides = timer_records(3600)
+
+    def record(i: int) -> Dict:
+        return {"id": str(uuid.UUID(int=i)), "lecture_id": lecture_id, "session_name": f"s{i}",
+                "records": slides, "created_at": f"2025-01-{i % 28 + 1:02d}T00:00:{i % 60:02d}",
+                "updated_at": "2025-01-01T00:00:00", "version": 1}
+
+    for i in range(record_count):
+        await backend.add_record_to_index(username, lecture_id, record(i))
+
+    rng = random.Random(1)
+    counter = iter(range(record_count, record_count + 10 * (iterations + 10)))
+
+    async def add_and_remove():
+        data = record(next(counter))
+        await backend.add_record_to_index(username, lecture_id, data)
+        await backend.remove_record_from_index(username, lecture_id, data["id"])
+
+    async def update():
+        data = record(rng.randrange(record_count))
+        data["session_name"] = uuid.uuid4().hex
+        await backend.update_record_in_index(username, lecture_id, data)
+
+    async def load_cold():
+        backend.storage._invalidate_lecture(username, lecture_id)
+        await backend.load_records_index(username, lecture_id)
+
+    results = {
+        "records_index.add_and_remove": await measure_async(add_and_remove, iterations),
+        "records_index.update": await measure_async(update, iterations),
+        "records_index.load_cached": await measure_async(
+            lambda: backend.load_records_index(username, lecture_id), iterations),
+        "records_index.load_uncached": await measure_async(load_cold, iterations),
+        "records_index.list_timer_records": await measure_async(
+            lambda: backend.list_timer_records(username, lecture_id), iterations),
+    }
+    for stats in results.values():
+        stats["records"] = record_count
+    fake.uninstall()
+    return results
+
+def collect_search_index(iterations: int, record_count: int) -> Dict[str, Dict]:
+    from search_index import SearchIndex
+
+    words = synthetic_srt(0.5).split("\n")[2::4]
+    rng = random.Random(1)
+
+    def record(i: int) -> Dict:
+        return {"session_name": f"세션 {i}", "lecture_name": "벤치마크", "records": [
+            dict(slide, notes=" ".join(rng.choice(words) for _ in range(40)))
+            for slide in timer_records(1800)
+        ]}
+
+    records = [("lecture", str(uuid.UUID(int=i)), record(i)) for i in range(record_count)]
+    index = SearchIndex(None)
+    results = {"search.index_records": measure(lambda: index.index_records("bench", records), max(3, iterations // 5))}
+    queries = ["극한", "연속성 정의", "그래프를 보면", "epsilon delta", "시험에 자주"]
+
+    def search():
+        for query in queries:
+            index.search("bench", query)
+
+    stats = measure(search, iterations)
+    stats["queries"] = len(queries)
+    results["search.search"] = stats
+    for stats in results.values():
+        stats["records"] = record_count
+    return results
+
+def collect(iterations: int = 20, quick: bool = False, records: int = 200) -> Dict[str, Dict]:
+    results = collect_cue_index(iterations, quick)
+    results.update(asyncio.run(collect_records_index(iterations, records)))
+    results.update(collect_search_index(iterations, records))
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--records", type=int, default=200, help="강의 하나의 기록 수")
+    parser.add_argument("--quick", action="store_true", help="10시간 전사 제외")
+    parser.add_argument("--output", help="결과 JSON 파일 (benchmarks.compare로 비교)")
+    args = parser.parse_args()
+    output = Path(args.output).resolve() if args.output else None
+
+    os.environ.setdefault("STORAGE_BACKEND", "github")
+    prepare_workdir()
+    results = collect(args.iterations, args.quick, args.records)
+    print_results(results)
+    if output:
+        write_results(output, results, {"iterations": args.iterations, "quick": args.quick,
+                                        "records": args.records})
+
+if __name__ == "__main__":
+    main()
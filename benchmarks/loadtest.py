@@ -0,0 +1,358 @@
+"""부하 테스트: 여러 가상 사용자가 실제 사용 흐름을 동시에 실행합니다.
+
+실행 중인 앱에 HTTP(와 WebSocket)로 요청을 보내고 엔드포인트별 처리량, p50/p95/p99
+지연 시간, 오류율을 보고합니다. --url을 주지 않으면 임시 디렉토리에서 로컬 GitHub
+대역(fake_github.py)과 앱(uvicorn)을 직접 띄운 뒤 끝나면 정리합니다.
+
+    python -m benchmarks.loadtest --users 20 --duration 60
+    python -m benchmarks.loadtest --users 50 --workers 4 --github-latency 0.05 --output load.json
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --users 10 --mix browse=1
+
+사용 흐름 (--mix로 비율 조정, 기본 browse=5,live_timer=3,transcribe=1)
+
+- browse: 로그인 → 강의 목록 → 기록 목록 → 기록 하나 (브라우저처럼 ETag로 재검증)
+- live_timer: 강의 목록 → 실시간 타이머 세션(WebSocket)으로 슬라이드 기록 → 저장 → 기록 목록.
+  websockets 패키지가 없으면 저장 API(POST timer-records)로 한 번에 저장합니다.
+- transcribe: SRT 업로드 → 타이머 기록과 파싱 → 결과 내보내기(CSV)
+
+요청 사이에는 평균 --think초(지수 분포)만큼 쉬며, 0이면 쉬지 않고 최대 부하를 겁니다.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+try:
+    import websockets
+except ImportError:  # 선택 의존성
+    websockets = None
+
+from benchmarks.common import REPO_ROOT, summarize, write_results
+from benchmarks.transcripts import bundled_srts, srt_duration, synthetic_srt, timer_records
+
+DEFAULT_MIX = "browse=5,live_timer=3,transcribe=1"
+PASSWORD = "load-test-pw"
+
+class Recorder:
+    """엔드포인트별 지연 시간과 오류를 모읍니다."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.error_examples: Dict[str, str] = {}
+        self.journeys: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+        if error:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            self.error_examples.setdefault(name, error)
+
+    def results(self, elapsed: float) -> Dict[str, Dict]:
+        results = {}
+        for name in sorted(self.samples):
+            stats = summarize(self.samples[name])
+            stats["rps"] = len(self.samples[name]) / elapsed
+            stats["errors"] = self.errors.get(name, 0)
+            stats["error_rate"] = stats["errors"] / len(self.samples[name])
+            results[name] = stats
+        everything = [s for samples in self.samples.values() for s in samples]
+        if everything:
+            total = summarize(everything)
+            total["rps"] = len(everything) / elapsed
+            total["errors"] = sum(self.errors.values())
+            total["error_rate"] = total["errors"] / len(everything)
+            results["TOTAL"] = total
+        return results
+
+class VirtualUser:
+    def __init__(self, number: int, client: httpx.AsyncClient, base_url: str, recorder: Recorder,
+                 srt: bytes, slides: List[Dict], think: float, rng: random.Random):
+        self.username = f"load{number}-{uuid.uuid4().hex[:6]}"
+        self.client = client
+        self.base_url = base_url
+        self.recorder = recorder
+        self.srt = srt
+        self.slides = slides
+        self.think = think
+        self.rng = rng
+        self.lecture_id = None
+        self.record_ids: List[str] = []
+        # 브라우저 HTTP 캐시 흉내 (URL → 마지막으로 받은 ETag)
+        self.etags: Dict[str, str] = {}
+
+    @property
+    def user_path(self) -> str:
+        return f"/api/users/{self.username}"
+
+    async def pause(self) -> None:
+        if self.think > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think))
+
+    async def request(self, name: str, method: str, url: str, expected=(200,), **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.add(name, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+            return None
+        elapsed = time.perf_counter() - started
+        error = None if response.status_code in expected else f"HTTP {response.status_code}: {response.text[:200]}"
+        self.recorder.add(name, elapsed, error)
+        return response if error is None else None
+
+    async def cached_get(self, name: str, url: str) -> Optional[httpx.Response]:
+        headers = {"If-None-Match": self.etags[url]} if url in self.etags else {}
+        response = await self.request(name, "GET", url, expected=(200, 304), headers=headers)
+        if response is not None and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+        return response
+
+    # 사용 흐름
+
+    async def setup(self) -> None:
+        await self.request("POST /api/auth/register", "POST", "/api/auth/register",
+                           json={"username": self.username, "password": PASSWORD})
+        response = await self.request("POST /api/users/{u}/lectures", "POST", f"{self.user_path}/lectures",
+                                      json={"name": f"부하 테스트 {self.username}"})
+        if response is not None:
+            self.lecture_id = response.json()["lecture"]["id"]
+
+    async def browse(self) -> None:
+        await self.request("POST /api/auth/login", "POST", "/api/auth/login",
+                           json={"username": self.username, "password": PASSWORD})
+        await self.pause()
+        await self.cached_get("GET /api/users/{u}/lectures", f"{self.user_path}/lectures")
+        await self.pause()
+        records = f"{self.user_path}/lectures/{self.lecture_id}/timer-records"
+        await self.cached_get("GET .../timer-records", records)
+        if self.record_ids:
+            await self.pause()
+            await self.cached_get("GET .../timer-records/{r}", f"{records}/{self.rng.choice(self.record_ids)}")
+
+    async def live_timer(self) -> None:
+        await self.cached_get("GET /api/users/{u}/lectures", f"{self.user_path}/lectures")
+        slides = self.slides[:self.rng.randint(5, min(30, len(self.slides)))]
+        if websockets is not None:
+            record_id = await self._live_session(slides)
+        else:
+            response = await self.request("POST .../timer-records", "POST",
+                                          f"{self.user_path}/lectures/{self.lecture_id}/timer-records",
+                                          json=self._session(slides))
+            record_id = response.json()["timer_record"]["id"] if response is not None else None
+        if record_id:
+            self.record_ids.append(record_id)
+        await self.cached_get("GET .../timer-records", f"{self.user_path}/lectures/{self.lecture_id}/timer-records")
+
+    async def _live_session(self, slides: List[Dict]) -> Optional[str]:
+        url = (self.base_url.replace("http", "ws", 1)
+               + f"{self.user_path}/lectures/{self.lecture_id}/live?session_name=load")
+        started = time.perf_counter()
+        try:
+            async with websockets.connect(url) as ws:
+                ready = json.loads(await ws.recv())
+                self.recorder.add("WS live: connect", time.perf_counter() - started,
+                                  None if ready.get("type") == "ready" else str(ready))
+                for slide in slides:
+                    await self.pause()
+                    sent = time.perf_counter()
+                    await ws.send(json.dumps({"type": "slide", "slide": slide}))
+                    ack = json.loads(await ws.recv())
+                    self.recorder.add("WS live: slide event", time.perf_counter() - sent,
+                                      None if ack.get("type") == "ack" else str(ack))
+                sent = time.perf_counter()
+                await ws.send(json.dumps({"type": "finish", "session_name": "load"}))
+                saved = json.loads(await ws.recv())
+                ok = saved.get("type") == "saved"
+                self.recorder.add("WS live: finish (save)", time.perf_counter() - sent, None if ok else str(saved))
+                return saved["timer_record"]["id"] if ok else None
+        except Exception as e:
+            self.recorder.add("WS live: connect", time.perf_counter() - started, f"{type(e).__name__}: {e}")
+            return None
+
+    def _session(self, slides: List[Dict]) -> Dict:
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        return {"lecture_name": "load", "records": slides, "created_at": now, "updated_at": now}
+
+    async def transcribe(self) -> None:
+        response = await self.request("POST /api/srt/upload", "POST", "/api/srt/upload",
+                                      files={"file": ("load.srt", self.srt, "text/plain")})
+        if response is None:
+            return
+        file_id = response.json()["file_id"]
+        await self.pause()
+        response = await self.request("POST /api/srt/parse-with-data", "POST", "/api/srt/parse-with-data",
+                                      data={"file_id": file_id, "timer_records": json.dumps(self.slides)})
+        if response is None:
+            return
+        await self.pause()
+        await self.request("GET /api/srt/jobs/{j}/export", "GET", response.json()["export_url"],
+                           params={"format": "csv"})
+
+async def run_load(base_url: str, users: int, duration: float, ramp_up: float, think: float,
+                   mix: Dict[str, int], seed: int = 1) -> Dict[str, Dict]:
+    bundled = bundled_srts()
+    srt = bundled[0][1] if bundled else synthetic_srt(1)
+    slides = timer_records(srt_duration(srt))
+    recorder = Recorder()
+    journeys = list(mix)
+    weights = [mix[name] for name in journeys]
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        deadline = time.perf_counter() + ramp_up + duration
+
+        async def virtual_user(number: int) -> None:
+            rng = random.Random(seed * 100003 + number)
+            await asyncio.sleep(ramp_up * number / users)
+            user = VirtualUser(number, client, base_url, recorder, srt.encode("utf-8"), slides, think, rng)
+            await user.setup()
+            if user.lecture_id is None:
+                return
+            while time.perf_counter() < deadline:
+                journey = rng.choices(journeys, weights)[0]
+                await getattr(user, journey)()
+                recorder.journeys[journey] = recorder.journeys.get(journey, 0) + 1
+                await user.pause()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(i) for i in range(users)))
+        elapsed = time.perf_counter() - started
+
+    results = recorder.results(elapsed)
+    print(f"가상 사용자 {users}명, {elapsed:.1f}초, 완료한 흐름: "
+          + ", ".join(f"{name} {count}" for name, count in sorted(recorder.journeys.items())))
+    for name, example in recorder.error_examples.items():
+        print(f"  오류 예 [{name}] {example}")
+    return results
+
+def print_load_results(results: Dict[str, Dict]) -> None:
+    width = max((len(name) for name in results), default=0)
+    print(f"{'endpoint':{width}s}  {'count':>7s}  {'req/s':>8s}  {'p50 ms':>9s}  {'p95 ms':>9s}  "
+          f"{'p99 ms':>9s}  {'errors':>7s}")
+    for name, stats in results.items():
+        print(f"{name:{width}s}  {stats['n']:7d}  {stats['rps']:8.2f}  {stats['p50_ms']:9.1f}  "
+              f"{stats['p95_ms']:9.1f}  {stats['p99_ms']:9.1f}  {stats['error_rate'] * 100:6.2f}%")
+
+# 앱과 GitHub 대역 띄우기
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} 프로세스가 종료되었습니다 (코드 {process.returncode})")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} 이(가) {timeout:.0f}초 안에 응답하지 않습니다")
+
+class LocalStack:
+    """임시 디렉토리에서 fake_github.py와 uvicorn backend:app을 실행합니다."""
+
+    def __init__(self, workers: int = 1, github_latency: float = 0.0, github_jitter: float = 0.0):
+        self.workers = workers
+        self.github_latency = github_latency
+        self.github_jitter = github_jitter
+        self.processes: List[subprocess.Popen] = []
+        self.workdir: Optional[Path] = None
+
+    def __enter__(self) -> str:
+        self.workdir = Path(tempfile.mkdtemp(prefix="slide-scribe-load-"))
+        (self.workdir / "static").symlink_to(REPO_ROOT / "static", target_is_directory=True)
+        github_port, app_port = _free_port(), _free_port()
+        repo = "slide-scribe/load-test"
+        log = open(self.workdir / "server.log", "w")
+
+        github = subprocess.Popen(
+            [sys.executable, str(REPO_ROOT / "fake_github.py"), "--port", str(github_port), "--repo", repo,
+             "--latency", str(self.github_latency), "--jitter", str(self.github_jitter),
+             "--rate-limit", "100000000"],
+            cwd=self.workdir, stdout=log, stderr=subprocess.STDOUT
+        )
+        self.processes.append(github)
+        _wait_until_up(f"http://127.0.0.1:{github_port}/", github)
+
+        env = dict(os.environ, STORAGE_BACKEND="github", GITHUB_TOKEN="load-test", GITHUB_REPO=repo,
+                   GITHUB_API_BASE=f"http://127.0.0.1:{github_port}", PYTHONPATH=str(REPO_ROOT),
+                   LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"))
+        app = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend:app", "--port", str(app_port),
+             "--workers", str(self.workers), "--no-access-log"],
+            cwd=self.workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        self.processes.append(app)
+        base_url = f"http://127.0.0.1:{app_port}"
+        _wait_until_up(f"{base_url}/api/health", app)
+        return base_url
+
+    def __exit__(self, *exc) -> None:
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if exc[0] is not None and self.workdir:
+            print(f"서버 로그: {self.workdir / 'server.log'}")
+        elif self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("browse", "live_timer", "transcribe"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 사용 흐름: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="실행 중인 앱 주소 (없으면 GitHub 대역과 앱을 직접 띄움)")
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초, 램프업 제외)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="가상 사용자를 나눠 시작하는 시간 (초)")
+    parser.add_argument("--think", type=float, default=0.5, help="요청 사이 평균 대기 (초, 0이면 대기 없음)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"흐름 비율 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--workers", type=int, default=1, help="직접 띄우는 앱의 uvicorn 워커 수")
+    parser.add_argument("--github-latency", type=float, default=0.0, help="GitHub 대역 요청당 지연 (초)")
+    parser.add_argument("--github-jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="결과 JSON 파일 (benchmarks.compare로 비교)")
+    args = parser.parse_args()
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "url")}
+    load = dict(users=args.users, duration=args.duration, ramp_up=args.ramp_up, think=args.think,
+                mix=args.mix, seed=args.seed)
+    if args.url:
+        results = asyncio.run(run_load(args.url.rstrip("/"), **load))
+    else:
+        with LocalStack(args.workers, args.github_latency, args.github_jitter) as base_url:
+            results = asyncio.run(run_load(base_url, **load))
+
+    print_load_results(results)
+    if args.output:
+        write_results(Path(args.output), {f"load.{name}": stats for name, stats in results.items()}, params)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""전체 벤치마크 실행 (결과를 JSON으로 저장하고 기준선과 비교).
+
+    python -m benchmarks.run                          # 전체 실행, 표 출력
+    python -m benchmarks.run --quick --suite srt      # 일부만 빠르게
+    python -m benchmarks.run --output current.json    # 결과 저장
+    python -m benchmarks.run --save-baseline          # benchmarks/baseline.json 갱신
+    python -m benchmarks.run --compare                # 기준선과 비교 (회귀가 있으면 종료 코드 1)
+
+스위트: srt (파싱/정렬), index (자막/기록/검색 인덱스), endpoints (API 종단),
+github_sync (GitHub 동기화 경로). 모두 한 프로세스에서 로컬 GitHub 대역으로 실행합니다.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+
+from benchmarks.common import BASELINE_PATH, load_results, prepare_workdir, print_results, write_results
+
+SUITES = ("srt", "index", "endpoints", "github_sync")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", action="append", choices=SUITES, help="실행할 스위트 (여러 번 지정 가능, 기본 전체)")
+    parser.add_argument("--iterations", type=int, default=None, help="스위트별 기본 반복 수 대신 사용")
+    parser.add_argument("--quick", action="store_true", help="10시간 전사 제외, 반복 수 축소")
+    parser.add_argument("--output", help="결과 JSON 파일")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 기준선({BASELINE_PATH.name})으로 저장")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_PATH), metavar="BASELINE",
+                        help="기준선 파일과 비교 (기본 benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="회귀로 볼 p50 증가 비율")
+    args = parser.parse_args()
+    output = Path(args.output).resolve() if args.output else None
+    baseline = Path(args.compare).resolve() if args.compare else None
+    suites = args.suite or list(SUITES)
+
+    os.environ.setdefault("STORAGE_BACKEND", "github")
+    prepare_workdir()
+
+    def iterations(default: int) -> int:
+        if args.iterations:
+            return args.iterations
+        return max(3, default // 3) if args.quick else default
+
+    results = {}
+    if "srt" in suites:
+        from benchmarks import srt_paths
+        results.update(srt_paths.collect(iterations(10), args.quick))
+    if "index" in suites:
+        from benchmarks import indexes
+        results.update(indexes.collect(iterations(20), args.quick))
+    if "endpoints" in suites:
+        from benchmarks import endpoints
+        results.update(endpoints.collect(iterations(30)))
+    if "github_sync" in suites:
+        from benchmarks import github_sync
+        results.update(asyncio.run(github_sync.collect(iterations(30))))
+
+    print_results(results)
+    params = {"suites": suites, "quick": args.quick, "iterations": args.iterations}
+    if output:
+        write_results(output, results, params)
+    if args.save_baseline:
+        write_results(BASELINE_PATH, results, params)
+        print(f"기준선 저장: {BASELINE_PATH}")
+    if baseline:
+        from benchmarks.compare import compare, print_comparison
+        reference = load_results(baseline)["benchmarks"]
+        if args.suite:
+            # 일부 스위트만 돌렸으면 나머지 기준선 항목은 비교하지 않습니다
+            reference = {name: stats for name, stats in reference.items() if name in results}
+        rows = compare(reference, results, args.threshold)
+        print()
+        print_comparison(rows)
+        if any(row["status"] == "regression" for row in rows):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""SRT 파싱/정렬 경로 벤치마크.
+
+parse_srt_time, parse_srt_content, process_srt_with_timer를 저장소에 포함된 단어 단위
+SRT와 합성 전사(1시간/3시간/10시간)로 측정합니다.
+
+    python -m benchmarks.srt_paths --iterations 10
+    python -m benchmarks.srt_paths --quick --output srt.json
+"""
+from pathlib import Path
+from typing import Dict
+import argparse
+
+from benchmarks.common import measure, prepare_workdir, print_results, write_results
+from benchmarks.transcripts import srt_duration, srt_inputs, timer_records
+
+def collect(iterations: int = 10, quick: bool = False) -> Dict[str, Dict]:
+    import backend
+
+    results = {}
+    inputs = srt_inputs(quick)
+
+    # 자막 시각 문자열 하나씩 변환 (포함된 SRT의 시각 전부를 한 묶음으로 측정)
+    time_strings = [line.split(" --> ")[0] for line in inputs[0][1].splitlines() if " --> " in line]
+
+    def parse_times_one_by_one():
+        for value in time_strings:
+            backend.parse_srt_time(value)
+
+    stats = measure(parse_times_one_by_one, iterations)
+    stats["calls"] = len(time_strings)
+    stats["per_call_us"] = stats["mean_ms"] * 1000 / len(time_strings)
+    results["srt.parse_srt_time"] = stats
+
+    for name, content in inputs:
+        # 긴 입력은 반복 수를 줄여 전체 시간을 비슷하게 맞춥니다
+        n = max(3, iterations // 3) if name.endswith("10h") else iterations
+        records = timer_records(srt_duration(content))
+
+        stats = measure(lambda: backend.parse_srt_content(content), n)
+        stats["bytes"] = len(content.encode("utf-8"))
+        stats["cues"] = len(backend.parse_srt_content(content))
+        results[f"srt.parse_srt_content[{name}]"] = stats
+
+        stats = measure(lambda: backend.process_srt_with_timer(content, records), n)
+        stats["slides"] = len(records)
+        results[f"srt.process_srt_with_timer[{name}]"] = stats
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--quick", action="store_true", help="10시간 전사 제외")
+    parser.add_argument("--output", help="결과 JSON 파일 (benchmarks.compare로 비교)")
+    args = parser.parse_args()
+    output = Path(args.output).resolve() if args.output else None
+
+    prepare_workdir()
+    results = collect(args.iterations, args.quick)
+    print_results(results)
+    if output:
+        write_results(output, results, {"iterations": args.iterations, "quick": args.quick})
+
+if __name__ == "__main__":
+    main()
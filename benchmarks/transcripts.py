@@ -0,0 +1,83 @@
+"""벤치마크 입력: 저장소에 포함된 단어 단위 SRT와 합성 전사, 타이머 기록."""
+from pathlib import Path
+from typing import Dict, List, Tuple
+import hashlib
+import random
+
+from benchmarks.common import REPO_ROOT
+
+BUNDLED_DIR = REPO_ROOT / "data" / "uploads"
+
+# 합성 전사 단어 (stable-ts 단어 단위 출력처럼 한 자막에 한 단어)
+_WORDS = (
+    "오늘은 지난 시간에 이어서 함수의 극한과 연속성에 대해 살펴보겠습니다 여기서 중요한 것은 "
+    "정의를 정확하게 이해하는 것입니다 예를 들어 다음 그래프를 보면 값이 점점 가까워지는 "
+    "것을 확인할 수 있습니다 이 부분은 시험에 자주 나오니까 꼭 기억해 두세요 the limit of "
+    "f as x approaches zero is defined by epsilon delta"
+).split()
+
+def format_time(seconds: float) -> str:
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+def synthetic_srt(hours: float, seed: int = 1) -> str:
+    """hours 길이의 단어 단위 SRT (같은 seed면 항상 같은 내용)."""
+    rng = random.Random(seed)
+    end_of_transcript = hours * 3600
+    blocks = []
+    t = 0.3
+    number = 1
+    while t < end_of_transcript:
+        duration = rng.uniform(0.15, 0.5)
+        word = rng.choice(_WORDS)
+        sentence_end = rng.random() < 0.08
+        if sentence_end:
+            word += "."
+        blocks.append(f"{number}\n{format_time(t)} --> {format_time(t + duration)}\n{word}\n")
+        # 문장 끝에서는 쉬었다가 (coalesce 경계), 그 밖에는 거의 이어서 말합니다
+        t += duration + (rng.uniform(0.6, 2.0) if sentence_end else rng.uniform(0.0, 0.2))
+        number += 1
+    return "\n".join(blocks)
+
+def bundled_srts() -> List[Tuple[str, str]]:
+    """data/uploads의 SRT 파일 (내용이 같은 사본은 한 번만)."""
+    seen = set()
+    inputs = []
+    for path in sorted(Path(BUNDLED_DIR).glob("*.srt")):
+        content = path.read_text(encoding="utf-8")
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        inputs.append((f"bundled-{len(inputs) + 1}", content))
+    return inputs
+
+def srt_inputs(quick: bool = False) -> List[Tuple[str, str]]:
+    """(이름, SRT 내용) 목록. quick이면 10시간 전사는 뺍니다."""
+    hours = (1, 3) if quick else (1, 3, 10)
+    return bundled_srts() + [(f"synthetic-{h}h", synthetic_srt(h)) for h in hours]
+
+def srt_duration(srt_content: str) -> float:
+    """마지막 자막이 끝나는 시각 (초)."""
+    last_time_line = srt_content.rstrip().rsplit("\n", 2)[-2]
+    end = last_time_line.split(" --> ")[1].replace(",", ".")
+    h, m, s = end.split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+def timer_records(duration: float, slide_seconds: float = 90.0) -> List[Dict]:
+    """duration 동안 slide_seconds마다 넘긴 슬라이드 기록."""
+    records = []
+    start = 0.0
+    number = 1
+    while start < duration:
+        end = min(start + slide_seconds, duration)
+        records.append({
+            "slide_title": f"Slide {number}",
+            "slide_number": str(number),
+            "start_time": format_time(start).replace(",", "."),
+            "end_time": format_time(end).replace(",", "."),
+            "notes": "",
+        })
+        start = end
+        number += 1
+    return records
@@ -0,0 +1,395 @@
+"""사용자 데이터 백업 아카이브 (전체 내보내기/가져오기).
+
+아카이브 구조 (zip 또는 tar.gz):
+
+    manifest.json                           형식, 버전, 사용자, 내보낸 시각
+    lectures.json                           강의 목록 문서
+    records/{lecture_id}/index.json         기록 인덱스
+    records/{lecture_id}/{record_id}.json   타이머 기록
+
+내보내기는 기록을 하나씩 읽어 압축 스트림에 쓰고 쌓인 바이트를 바로 응답으로
+흘려보내므로, 아카이브 전체를 메모리에 만들지 않습니다.
+
+가져오기는 업로드 파일(크면 디스크에 임시 저장됨)을 두 번 읽습니다. 첫 번째에서
+모든 항목을 검증하고 인덱스 항목만 모으며, 통과하면 두 번째에서 기록을 하나씩
+저장소의 import_user_data로 넘깁니다. 검증에 실패하면 아무것도 저장하지 않습니다.
+"""
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import io
+import json
+import re
+import tarfile
+import time
+import zipfile
+
+import fast_json
+from github_scheduler import Priority, github_priority
+from storage import LectureCatalog, StorageBackend, make_empty_index, make_record_info
+from timecode import find_invalid_record_time
+
+BACKUP_FORMAT = "slide-scribe-backup"
+BACKUP_VERSION = 1
+
+# 항목 하나의 최대 크기 (JSON 업로드 API와 같은 10MB)와 최대 항목 수
+MAX_ENTRY_SIZE = 10 * 1024 * 1024
+MAX_ENTRIES = 50000
+
+REQUIRED_RECORD_FIELDS = ('slide_title', 'slide_number', 'start_time', 'end_time')
+
+_ID_RE = re.compile(r"^[A-Za-z0-9_\-]{1,128}$")
+_RECORD_PATH_RE = re.compile(r"^records/([^/]+)/([^/]+)\.json$")
+
+class BackupError(ValueError):
+    """가져오려는 백업 아카이브가 올바르지 않을 때 발생합니다."""
+
+def _dump(data) -> bytes:
+    # 백업은 사람이 열어 보는 다운로드이므로 들여쓰기합니다
+    return fast_json.dumps_pretty(data)
+
+# 내보내기
+
+async def iter_backup_entries(storage: StorageBackend, username: str) -> AsyncIterator[Tuple[str, Dict]]:
+    """사용자의 강의 목록, 인덱스, 기록을 (아카이브 경로, 내용) 순서로 읽어 옵니다."""
+    yield "manifest.json", {
+        "format": BACKUP_FORMAT,
+        "version": BACKUP_VERSION,
+        "username": username,
+        "exported_at": datetime.now().isoformat()
+    }
+
+    catalog = await storage.load_lecture_catalog(username)
+    yield "lectures.json", catalog.to_document()
+
+    # 전체 읽기는 백그라운드 우선순위로 GitHub 한도를 사용자 요청에 양보합니다
+    with github_priority(Priority.BACKGROUND):
+        for lecture_id in catalog.by_id:
+            index_data = await storage.load_index(username, lecture_id)
+            if index_data:
+                yield f"records/{lecture_id}/index.json", index_data
+
+            for record_id in sorted(await storage.list_record_ids(username, lecture_id)):
+                record_data = await storage.load_record(username, lecture_id, record_id)
+                if record_data:
+                    yield f"records/{lecture_id}/{record_id}.json", record_data
+
+class ChunkBuffer(io.RawIOBase):
+    """압축기가 쓴 바이트를 모아 두었다가 응답 청크로 꺼냅니다 (seek 불가 스트림)."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+async def stream_zip(entries: AsyncIterator[Tuple[str, Dict]]) -> AsyncIterator[bytes]:
+    """항목을 zip으로 압축하며 만들어지는 대로 바이트를 내보냅니다."""
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for name, data in entries:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, _dump(data))
+            chunk = buffer.take()
+            if chunk:
+                yield chunk
+    yield buffer.take()
+
+async def stream_tar(entries: AsyncIterator[Tuple[str, Dict]]) -> AsyncIterator[bytes]:
+    """항목을 tar.gz로 압축하며 만들어지는 대로 바이트를 내보냅니다."""
+    buffer = ChunkBuffer()
+    with tarfile.open(fileobj=buffer, mode="w|gz") as archive:
+        async for name, data in entries:
+            content = _dump(data)
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(content))
+            chunk = buffer.take()
+            if chunk:
+                yield chunk
+    yield buffer.take()
+
+# 형식 이름: (스트림 함수, Content-Type, 파일 확장자)
+ARCHIVE_FORMATS = {
+    "zip": (stream_zip, "application/zip", "zip"),
+    "tar": (stream_tar, "application/gzip", "tar.gz"),
+}
+
+# 가져오기
+
+class BackupArchive:
+    """업로드된 zip/tar(.gz) 아카이브의 파일 항목을 하나씩 읽습니다."""
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        fileobj.seek(0)
+        if zipfile.is_zipfile(fileobj):
+            self.kind = "zip"
+            return
+        fileobj.seek(0)
+        try:
+            tarfile.open(fileobj=fileobj, mode="r:*").close()
+        except tarfile.TarError:
+            raise BackupError("zip 또는 tar 형식의 백업 파일이 아닙니다")
+        self.kind = "tar"
+
+    def entries(self) -> Iterator[Tuple[str, bytes]]:
+        """(경로, 내용) 을 차례로 반환합니다. 디렉토리 항목은 건너뜁니다."""
+        self.fileobj.seek(0)
+        if self.kind == "zip":
+            yield from self._zip_entries()
+        else:
+            yield from self._tar_entries()
+
+    def _zip_entries(self) -> Iterator[Tuple[str, bytes]]:
+        with zipfile.ZipFile(self.fileobj) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir()]
+            if len(infos) > MAX_ENTRIES:
+                raise BackupError(f"항목이 너무 많습니다 (최대 {MAX_ENTRIES}개)")
+            for info in infos:
+                if info.file_size > MAX_ENTRY_SIZE:
+                    raise BackupError(f"항목이 너무 큽니다: {info.filename}")
+                with archive.open(info) as f:
+                    yield info.filename, self._read_limited(f, info.filename)
+
+    def _tar_entries(self) -> Iterator[Tuple[str, bytes]]:
+        with tarfile.open(fileobj=self.fileobj, mode="r:*") as archive:
+            count = 0
+            for member in archive:
+                if member.isdir():
+                    continue
+                if not member.isfile():
+                    raise BackupError(f"지원하지 않는 항목입니다: {member.name}")
+                count += 1
+                if count > MAX_ENTRIES:
+                    raise BackupError(f"항목이 너무 많습니다 (최대 {MAX_ENTRIES}개)")
+                if member.size > MAX_ENTRY_SIZE:
+                    raise BackupError(f"항목이 너무 큽니다: {member.name}")
+                yield member.name, self._read_limited(archive.extractfile(member), member.name)
+
+    @staticmethod
+    def _read_limited(f, name: str) -> bytes:
+        # 헤더의 크기 정보를 믿지 않고 실제로 읽은 크기로 다시 확인합니다
+        content = f.read(MAX_ENTRY_SIZE + 1)
+        if len(content) > MAX_ENTRY_SIZE:
+            raise BackupError(f"항목이 너무 큽니다: {name}")
+        return content
+
+def _normalize_path(name: str) -> str:
+    return name[2:] if name.startswith("./") else name
+
+def _parse_json(name: str, content: bytes):
+    try:
+        return json.loads(content.decode("utf-8"))
+    except UnicodeDecodeError:
+        raise BackupError(f"UTF-8로 인코딩되지 않은 항목입니다: {name}")
+    except json.JSONDecodeError as e:
+        raise BackupError(f"올바르지 않은 JSON 형식입니다 ({name}): {str(e)}")
+
+def _check_id(value: str, name: str) -> None:
+    if not _ID_RE.match(value):
+        raise BackupError(f"올바르지 않은 ID입니다 ({name}): {value}")
+
+def _check_record(name: str, data) -> None:
+    if not isinstance(data, dict) or not isinstance(data.get("records"), list):
+        raise BackupError(f"'records' 필드가 있는 타이머 기록이 아닙니다: {name}")
+    for i, record in enumerate(data["records"]):
+        if not isinstance(record, dict):
+            raise BackupError(f"{name}: 기록 {i+1}이 올바른 객체가 아닙니다")
+        for field in REQUIRED_RECORD_FIELDS:
+            if field not in record:
+                raise BackupError(f"{name}: 기록 {i+1}에서 필수 필드가 누락되었습니다: {field}")
+    invalid_time = find_invalid_record_time(data["records"])
+    if invalid_time:
+        i, field = invalid_time
+        raise BackupError(f"{name}: 기록 {i+1}의 {field} 형식이 올바르지 않습니다 (HH:MM:SS.mmm)")
+
+class ImportPlan:
+    """검증을 통과한 가져오기 내용. 기록 본문은 담지 않고 인덱스 항목만 보관합니다."""
+
+    def __init__(self):
+        self.manifest: Optional[Dict] = None
+        self.lectures: Optional[List[Dict]] = None
+        self.record_infos: Dict[str, List[Dict]] = {}
+        self.index_meta: Dict[str, Dict] = {}
+
+    @property
+    def record_count(self) -> int:
+        return sum(len(infos) for infos in self.record_infos.values())
+
+def plan_import(archive: BackupArchive) -> ImportPlan:
+    """아카이브 전체를 검증합니다 (첫 번째 읽기). 문제가 있으면 BackupError."""
+    plan = ImportPlan()
+    seen = set()
+
+    for name, content in archive.entries():
+        name = _normalize_path(name)
+        if name in seen:
+            raise BackupError(f"중복된 항목입니다: {name}")
+        seen.add(name)
+        data = _parse_json(name, content)
+
+        if name == "manifest.json":
+            if not isinstance(data, dict) or data.get("format") != BACKUP_FORMAT:
+                raise BackupError("Slide Scribe 백업 파일이 아닙니다")
+            if not isinstance(data.get("version"), int) or data["version"] > BACKUP_VERSION:
+                raise BackupError(f"지원하지 않는 백업 버전입니다: {data.get('version')}")
+            plan.manifest = data
+            continue
+
+        if name == "lectures.json":
+            if not isinstance(data, dict) or not isinstance(data.get("lectures", []), list):
+                raise BackupError("lectures.json 구조가 올바르지 않습니다")
+            lectures = data.get("lectures", [])
+            ids, names = set(), set()
+            for lecture in lectures:
+                if not isinstance(lecture, dict) or not isinstance(lecture.get("name"), str):
+                    raise BackupError("lectures.json에 올바르지 않은 강의가 있습니다")
+                _check_id(str(lecture.get("id", "")), name)
+                if lecture["id"] in ids or lecture["name"] in names:
+                    raise BackupError(f"중복된 강의가 있습니다: {lecture['name']}")
+                ids.add(lecture["id"])
+                names.add(lecture["name"])
+            plan.lectures = lectures
+            continue
+
+        match = _RECORD_PATH_RE.match(name)
+        if not match:
+            raise BackupError(f"알 수 없는 항목입니다: {name}")
+        lecture_id, record_id = match.groups()
+        _check_id(lecture_id, name)
+
+        if record_id == "index":
+            if not isinstance(data, dict):
+                raise BackupError(f"인덱스 구조가 올바르지 않습니다: {name}")
+            plan.index_meta[lecture_id] = data
+            continue
+
+        _check_id(record_id, name)
+        _check_record(name, data)
+        record_info = make_record_info(data, record_id)
+        record_info["created_at"] = record_info["created_at"] or datetime.now().isoformat()
+        record_info["updated_at"] = record_info["updated_at"] or datetime.now().isoformat()
+        plan.record_infos.setdefault(lecture_id, []).append(record_info)
+
+    if plan.manifest is None:
+        raise BackupError("manifest.json이 없습니다")
+    if plan.lectures is None:
+        raise BackupError("lectures.json이 없습니다")
+
+    lecture_ids = {lecture["id"] for lecture in plan.lectures}
+    for lecture_id in list(plan.record_infos) + list(plan.index_meta):
+        if lecture_id not in lecture_ids:
+            raise BackupError(f"lectures.json에 없는 강의의 기록입니다: {lecture_id}")
+    return plan
+
+# 덮어쓸 기록의 버전을 읽을 때 동시에 보낼 요청 수
+STORED_VERSION_CONCURRENCY = 8
+
+async def load_stored_versions(storage: StorageBackend, username: str,
+                               keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """가져오기로 덮어쓸 기존 기록 (lecture_id, record_id)의 버전.
+
+    기록 ETag는 "ID-버전"이므로, 덮어쓴 기록은 이보다 큰 버전을 받아야
+    브라우저가 예전 내용으로 304를 받지 않습니다. 인덱스 항목에는 버전이 없고
+    (노트만 바뀐 PATCH는 인덱스를 다시 쓰지 않음) 기록을 읽어야 하므로, 한 번에
+    STORED_VERSION_CONCURRENCY개씩 동시에 읽습니다.
+    """
+    semaphore = asyncio.Semaphore(STORED_VERSION_CONCURRENCY)
+
+    async def load(lecture_id: str, record_id: str) -> Tuple[Tuple[str, str], int]:
+        async with semaphore:
+            record_data = await storage.load_record(username, lecture_id, record_id)
+        version = record_data.get("version") if record_data else None
+        return (lecture_id, record_id), version if isinstance(version, int) else 0
+
+    with github_priority(Priority.BACKGROUND):
+        return dict(await asyncio.gather(*(load(*key) for key in keys)))
+
+def iter_import_records(archive: BackupArchive,
+                        stored_versions: Optional[Dict[Tuple[str, str], int]] = None
+                        ) -> Iterator[Tuple[str, str, Dict]]:
+    """검증된 아카이브에서 (lecture_id, record_id, data)를 하나씩 읽습니다 (두 번째 읽기)."""
+    stored_versions = stored_versions or {}
+    for name, content in archive.entries():
+        match = _RECORD_PATH_RE.match(_normalize_path(name))
+        if not match or match.group(2) == "index":
+            continue
+        lecture_id, record_id = match.groups()
+        data = json.loads(content.decode("utf-8"))
+        data["id"] = record_id
+        data["lecture_id"] = lecture_id
+        stored = stored_versions.get((lecture_id, record_id))
+        if stored is not None:
+            version = data.get("version")
+            data["version"] = max(version if isinstance(version, int) else 0, stored + 1)
+        yield lecture_id, record_id, data
+
+def merge_lectures(catalog: LectureCatalog, lectures: List[Dict]) -> LectureCatalog:
+    """가져온 강의를 카탈로그에 합칩니다. 같은 ID는 덮어쓰고, 이름 충돌은 거부합니다."""
+    for lecture in lectures:
+        existing_id = catalog.name_to_id.get(lecture["name"])
+        if existing_id is not None and existing_id != lecture["id"]:
+            raise BackupError(f"같은 이름의 다른 강의가 이미 있습니다: {lecture['name']}")
+    for lecture in lectures:
+        catalog.remove(lecture["id"])
+        catalog.add(lecture)
+    return catalog
+
+def merge_index(index_data: Dict, record_infos: List[Dict]) -> Dict:
+    """기존 인덱스에 가져온 기록 항목을 합칩니다 (같은 ID는 가져온 내용으로 교체)."""
+    imported_ids = {info["id"] for info in record_infos}
+    records = [r for r in index_data.get("records", []) if r.get("id") not in imported_ids]
+    records.extend(record_infos)
+    # 생성 시간 기준 역순 정렬
+    records.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    index_data["records"] = records
+    index_data["updated_at"] = datetime.now().isoformat()
+    index_data.pop("deleted", None)
+    return index_data
+
+async def import_backup(storage: StorageBackend, username: str, archive: BackupArchive) -> Dict:
+    """검증된 백업을 사용자 데이터에 합쳐 한 번에 저장합니다."""
+    plan = plan_import(archive)
+
+    catalog = merge_lectures(await storage.load_lecture_catalog(username), plan.lectures)
+
+    indexes = {}
+    overwritten = []
+    for lecture_id, record_infos in plan.record_infos.items():
+        index_data = await storage.load_index(username, lecture_id)
+        if not index_data or index_data.get("deleted"):
+            index_data = make_empty_index(lecture_id)
+            # 새로 만드는 인덱스는 백업의 생성 시각을 이어받습니다
+            backup_meta = plan.index_meta.get(lecture_id, {})
+            index_data["created_at"] = backup_meta.get("created_at") or index_data["created_at"]
+        else:
+            existing_ids = {info.get("id") for info in index_data.get("records", [])}
+            overwritten.extend((lecture_id, info["id"]) for info in record_infos if info["id"] in existing_ids)
+        indexes[lecture_id] = merge_index(index_data, record_infos)
+
+    stored_versions = await load_stored_versions(storage, username, overwritten)
+
+    success = await storage.import_user_data(
+        username,
+        catalog.to_document(),
+        indexes,
+        lambda: iter_import_records(archive, stored_versions),
+        f"Import backup ({len(plan.lectures)} lectures, {plan.record_count} records)"
+    )
+    return {
+        "success": success,
+        "lectures": len(plan.lectures),
+        "records": plan.record_count
+    }
@@ -0,0 +1,149 @@
+"""응답 압축 (Accept-Encoding 협상: brotli, gzip).
+
+minimum_size보다 작은 응답, 이미 인코딩된 응답(Content-Encoding이 있는 내보내기 파일,
+미리 압축한 정적 파일), 압축 효과가 없는 형식(zip, gzip, 이미지 등)은 그대로 보냅니다.
+brotli는 brotli 패키지가 설치된 경우에만 고르며, 같은 품질이면 gzip보다 JSON을 더 작게
+줄입니다. 스트리밍 응답은 조각마다 이어서 압축합니다.
+"""
+from typing import List, Optional, Tuple
+import asyncio
+import zlib
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 이보다 큰 본문은 이벤트 루프를 막지 않도록 스레드에서 압축합니다
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml"
+)
+
+def available_encodings() -> List[str]:
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding에서 쓸 인코딩 (q=0으로 거절한 것은 제외, 서버 선호 순서 br > gzip)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+class _Encoder:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress, self.finish = self._compressor.process, self._compressor.finish
+        else:
+            # wbits 16+: gzip 헤더/트레일러
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress, self.finish = self._compressor.compress, self._compressor.flush
+
+class CompressionMiddleware:
+    """Accept-Encoding에 따라 응답 본문을 brotli/gzip으로 압축하는 ASGI 미들웨어."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "encoder": None, "passthrough": False}
+
+        async def send_compressed(message):
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if not self._compressible(headers):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    # 본문 첫 조각을 보고 압축 여부를 정할 때까지 보류합니다
+                    state["start"] = message
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            start = state["start"]
+            if start is not None:
+                state["start"] = None
+                if not more_body and (not body or len(body) < self.minimum_size):
+                    state["passthrough"] = True
+                    await send(start)
+                    await send(message)
+                    return
+                state["encoder"] = encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                if not more_body:
+                    # 본문 전체가 한 번에 온 경우: 압축한 길이를 Content-Length로 보냅니다
+                    if len(body) >= THREAD_THRESHOLD:
+                        compressed = await asyncio.to_thread(lambda: encoder.compress(body) + encoder.finish())
+                    else:
+                        compressed = encoder.compress(body) + encoder.finish()
+                    headers = self._encoded_headers(start.get("headers", []), encoding)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                    return
+                await send({**start, "headers": self._encoded_headers(start.get("headers", []), encoding)})
+
+            encoder = state["encoder"]
+            chunk = encoder.compress(body) if body else b""
+            if not more_body:
+                chunk += encoder.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(headers) -> bool:
+        content_type = ""
+        for key, value in headers:
+            key = key.lower()
+            if key == b"content-encoding":
+                return False
+            if key == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _encoded_headers(headers, encoding: str) -> List[Tuple[bytes, bytes]]:
+        # 스트리밍 응답은 압축 후 길이를 미리 알 수 없으므로 Content-Length를 빼고 chunked로 보냅니다
+        result = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"vary")]
+        vary = [v for k, v in headers if k.lower() == b"vary"]
+        vary_value = b", ".join(vary + [b"Accept-Encoding"]) if vary else b"Accept-Encoding"
+        result.append((b"content-encoding", encoding.encode()))
+        result.append((b"vary", vary_value))
+        # 원본 ETag를 그대로 두면 압축본과 원본이 같은 강한 ETag를 갖게 되므로 약한 ETag로 바꿉니다
+        return [(k, b"W/" + v if k.lower() == b"etag" and not v.startswith(b"W/") else v) for k, v in result]
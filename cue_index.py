@@ -0,0 +1,251 @@
+"""업로드된 SRT의 자막(cue) 인덱스 사이드카 파일.
+
+업로드할 때 SRT를 한 번만 파싱해 다음 구조의 바이너리 파일로 저장합니다.
+
+    헤더 (32바이트)  magic "SSCUEIDX", version u32, 예약 u32, count u64, text_size u64
+    starts   float64[count]   시작 시각 (초, 오름차순)
+    ends     float64[count]   종료 시각 (초)
+    numbers  int64[count]     SRT 번호 (숫자가 아니면 -1)
+    offsets  uint64[count+1]  text 안에서 각 자막의 시작 위치
+    text     UTF-8            자막 텍스트를 "\n"으로 이어 붙인 것
+
+모든 배열이 8바이트 경계에 놓이므로 np.memmap 위에서 복사 없이 배열로 볼 수 있고,
+여러 워커가 같은 파일을 열면 OS 페이지 캐시를 공유합니다. 연속된 자막의 텍스트는
+text의 한 구간을 한 번에 디코딩해 만들 수 있습니다 ("\n" → " ").
+
+stable-ts 단어 단위 자막처럼 자막이 아주 잘게 나뉜 경우 coalesce()로 간격과
+문장 부호를 기준으로 구/문장 단위 자막으로 합친 인덱스를 따로 만들 수 있습니다.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+import struct
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSCUEIDX"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+
+class CueIndex:
+    """자막 시작/종료 시각 배열과 텍스트 블롭 (memmap 또는 메모리 버퍼 위의 뷰)."""
+
+    def __init__(self, buffer: np.ndarray):
+        magic, version, _, count, text_size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("cue index 형식이 아닙니다")
+        self.buffer = buffer
+        pos = _HEADER.size
+        self.starts = buffer[pos:pos + 8 * count].view("<f8")
+        pos += 8 * count
+        self.ends = buffer[pos:pos + 8 * count].view("<f8")
+        pos += 8 * count
+        self.numbers = buffer[pos:pos + 8 * count].view("<i8")
+        pos += 8 * count
+        self.offsets = buffer[pos:pos + 8 * (count + 1)].view("<u8")
+        pos += 8 * (count + 1)
+        self.text = buffer[pos:pos + text_size]
+        if len(self.text) != text_size:
+            raise ValueError("cue index 파일이 잘렸습니다")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CueIndex":
+        """파일 없이 메모리에서 인덱스를 만듭니다."""
+        return cls(np.frombuffer(data, dtype=np.uint8))
+
+    @classmethod
+    def from_subtitles(cls, subtitles: Sequence[Dict]) -> "CueIndex":
+        return cls.from_bytes(encode(subtitles))
+
+    @classmethod
+    def open(cls, path: Path) -> "CueIndex":
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def duration(self) -> float:
+        return float(self.ends[-1]) if len(self) else 0.0
+
+    def _decode(self, lo: int, hi: int) -> str:
+        # 마지막 자막 뒤의 "\n" 구분자는 제외합니다
+        return bytes(self.text[self.offsets[lo]:self.offsets[hi] - 1]).decode("utf-8")
+
+    def text_at(self, i: int) -> str:
+        return self._decode(i, i + 1)
+
+    def cue(self, i: int) -> Dict:
+        """parse_srt_content와 같은 형태의 자막 딕셔너리."""
+        number = int(self.numbers[i])
+        return {
+            'index': str(number) if number >= 0 else str(i + 1),
+            'start_time': float(self.starts[i]),
+            'end_time': float(self.ends[i]),
+            'text': self.text_at(i)
+        }
+
+    def cues(self, lo: int = 0, hi: Optional[int] = None) -> List[Dict]:
+        hi = len(self) if hi is None else min(hi, len(self))
+        return [self.cue(i) for i in range(max(0, lo), hi)]
+
+    def time_range(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[int, int]:
+        """시작 시각이 [start, end] 안에 있는 자막의 위치 구간 [lo, hi) (이진 탐색)."""
+        lo = 0 if start is None else int(np.searchsorted(self.starts, start, side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.starts, end, side="right"))
+        return lo, max(lo, hi)
+
+    def skip_ended(self, pos: int, time: float) -> int:
+        """pos부터 보아 종료 시각이 time 이상인 첫 자막 위치 (없으면 len).
+
+        종료 시각은 정렬되어 있지 않으므로 구간을 두 배씩 넓혀 가며 벡터로 찾습니다.
+        """
+        n = len(self)
+        step = 64
+        while pos < n:
+            window = self.ends[pos:pos + step] >= time
+            if window.any():
+                return pos + int(window.argmax())
+            pos += step
+            step *= 2
+        return n
+
+    def joined_text(self, indices: np.ndarray) -> str:
+        """자막들의 텍스트를 공백으로 이어 붙입니다. 연속 구간은 한 번에 디코딩합니다."""
+        if len(indices) == 0:
+            return ""
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        parts = []
+        for run in np.split(indices, breaks):
+            parts.append(self._decode(int(run[0]), int(run[-1]) + 1).replace("\n", " "))
+        return " ".join(parts)
+
+def encode(subtitles: Sequence[Dict]) -> bytes:
+    """자막 목록(parse_srt_content 결과)을 cue index 바이트로 만듭니다."""
+    ordered = sorted(subtitles, key=lambda x: x['start_time'])
+    count = len(ordered)
+
+    starts = np.array([cue['start_time'] for cue in ordered], dtype="<f8")
+    ends = np.array([cue['end_time'] for cue in ordered], dtype="<f8")
+    numbers = np.full(count, -1, dtype="<i8")
+    for i, cue in enumerate(ordered):
+        label = str(cue.get('index', '')).strip().lstrip("\ufeff")
+        if label.isdigit():
+            numbers[i] = int(label)
+
+    texts = [(cue['text'].replace("\n", " ") + "\n").encode("utf-8") for cue in ordered]
+    offsets = np.zeros(count + 1, dtype="<u8")
+    if count:
+        offsets[1:] = np.cumsum([len(t) for t in texts])
+
+    return _pack(starts, ends, numbers, offsets, b"".join(texts))
+
+def _pack(starts: np.ndarray, ends: np.ndarray, numbers: np.ndarray,
+          offsets: np.ndarray, blob: bytes) -> bytes:
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(starts), len(blob))
+    return b"".join([
+        header,
+        starts.astype("<f8").tobytes(),
+        ends.astype("<f8").tobytes(),
+        numbers.astype("<i8").tobytes(),
+        offsets.astype("<u8").tobytes(),
+        blob
+    ])
+
+# 합치기 방식: 끊는 기준이 되는 문장 부호 (phrase는 쉼표류 포함)
+COALESCE_MODES = {
+    "sentence": b".?!",
+    "phrase": b".?!,;:",
+}
+
+def coalesce(index: CueIndex, gap: float = 0.6, max_duration: float = 15.0,
+             punctuation: bytes = COALESCE_MODES["sentence"]) -> bytes:
+    """단어 단위 자막을 구/문장 단위 자막으로 합친 인덱스 바이트를 만듭니다.
+
+    다음 자막과의 간격이 gap초보다 크거나, 자막이 punctuation 중 하나로 끝나거나,
+    합친 자막이 max_duration초를 넘게 되면 끊습니다. 텍스트 블롭은 그대로 두고
+    합쳐지는 자리의 "\n" 구분자만 공백으로 바꿉니다.
+    """
+    n = len(index)
+    if n == 0:
+        return bytes(index.buffer)
+
+    starts = np.asarray(index.starts)
+    ends = np.asarray(index.ends)
+    offsets = np.asarray(index.offsets).astype(np.int64)
+    lengths = np.diff(offsets)
+
+    # 각 자막 텍스트의 마지막 바이트 (구분자 "\n" 바로 앞)
+    last_byte = np.asarray(index.text)[np.maximum(offsets[1:] - 2, 0)]
+    ends_phrase = np.isin(last_byte, np.frombuffer(punctuation, dtype=np.uint8)) & (lengths > 1)
+    breaks = (starts[1:] - ends[:-1] > gap) | ends_phrase[:-1]
+    group_starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+
+    # 너무 긴 묶음은 max_duration마다 나눕니다 (긴 묶음만 순차 처리)
+    group_bounds = np.append(group_starts, n)
+    too_long = np.flatnonzero(np.maximum.reduceat(ends, group_starts) - starts[group_starts] > max_duration)
+    if len(too_long):
+        extra = []
+        for g in too_long:
+            first = int(group_bounds[g])
+            for i in range(first + 1, int(group_bounds[g + 1])):
+                if ends[i] - starts[first] > max_duration:
+                    extra.append(i)
+                    first = i
+        group_starts = np.union1d(group_starts, extra)
+
+    group_ends = np.append(group_starts[1:], n)
+    blob = np.array(index.text)
+    blob[offsets[1:] - 1] = ord(" ")
+    blob[offsets[group_ends] - 1] = ord("\n")
+
+    return _pack(
+        starts[group_starts],
+        np.maximum.reduceat(ends, group_starts),
+        np.arange(1, len(group_starts) + 1),
+        offsets[np.append(group_starts, n)],
+        blob.tobytes()
+    )
+
+def save(path: Path, data: bytes) -> CueIndex:
+    """사이드카 파일을 원자적으로 쓰고 memmap으로 엽니다."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return load(path)
+
+def write(path: Path, subtitles: Sequence[Dict]) -> CueIndex:
+    return save(path, encode(subtitles))
+
+# 프로세스별로 열어 둔 memmap (같은 파일을 요청마다 다시 열지 않음)
+_open_indexes: "OrderedDict[tuple, CueIndex]" = OrderedDict()
+_OPEN_LIMIT = 32
+
+def load(path: Path) -> Optional[CueIndex]:
+    """사이드카를 엽니다. 없거나 손상되었으면 None."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (str(path), st.st_ino, st.st_mtime_ns)
+    index = _open_indexes.get(key)
+    if index is not None:
+        _open_indexes.move_to_end(key)
+        return index
+    try:
+        index = CueIndex.open(path)
+    except (ValueError, struct.error) as e:
+        logger.warning("cue index 읽기 실패 (%s): %s", path, e)
+        return None
+    for stale in [k for k in _open_indexes if k[0] == key[0]]:
+        del _open_indexes[stale]
+    _open_indexes[key] = index
+    while len(_open_indexes) > _OPEN_LIMIT:
+        _open_indexes.popitem(last=False)
+    return index
@@ -0,0 +1,406 @@
+"""로컬 GitHub API 대역 (테스트/벤치마크용).
+
+backend.py가 사용하는 contents API와 Git Data API(trees, blobs, commits, refs)를
+메모리 저장소로 흉내 냅니다. 지연 시간, X-RateLimit-* 헤더, SHA 충돌(409)과
+서버 오류를 설정값으로 재현할 수 있습니다.
+
+인프로세스 사용 (네트워크 없음):
+
+    from fake_github import FakeGitHub
+    fake = FakeGitHub(latency=0.02)
+    fake.install()          # github_api가 ASGITransport로 대역을 호출
+    ...
+    fake.uninstall()
+
+별도 서버로 실행:
+
+    python fake_github.py --port 9000 --latency 0.05
+    GITHUB_API_BASE=http://127.0.0.1:9000 GITHUB_TOKEN=dummy uvicorn backend:app
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from typing import List, Optional, Dict
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+
+import httpx
+
+import github_api
+
+def git_blob_sha(content: bytes) -> str:
+    """Git blob 객체와 같은 방식으로 SHA-1을 계산합니다."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def _object_sha(kind: str, payload: Dict) -> str:
+    data = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(kind.encode("utf-8") + b"\0" + data).hexdigest()
+
+class FakeGitHubRepo:
+    """메모리에 저장되는 단일 브랜치 저장소."""
+
+    def __init__(self, full_name: str, branch: str = "main"):
+        self.full_name = full_name
+        self.branch = branch
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, str]] = {}
+        self.commits: Dict[str, Dict] = {}
+        self.head = self.commit({}, "Initial commit", parents=[])
+
+    @property
+    def files(self) -> Dict[str, str]:
+        """HEAD 커밋의 {path: blob_sha}."""
+        return self.trees[self.commits[self.head]["tree"]]
+
+    def put_blob(self, content: bytes) -> str:
+        sha = git_blob_sha(content)
+        self.blobs[sha] = content
+        return sha
+
+    def put_tree(self, files: Dict[str, str]) -> str:
+        sha = _object_sha("tree", files)
+        self.trees[sha] = dict(files)
+        return sha
+
+    def commit(self, files: Dict[str, str], message: str, parents: Optional[List[str]] = None) -> str:
+        tree_sha = self.put_tree(files)
+        payload = {
+            "tree": tree_sha,
+            "parents": parents if parents is not None else [self.head],
+            "message": message,
+            "date": time.time(),
+        }
+        sha = _object_sha("commit", payload)
+        self.commits[sha] = payload
+        return sha
+
+    def read(self, path: str) -> Optional[bytes]:
+        sha = self.files.get(path)
+        return self.blobs[sha] if sha else None
+
+    def write(self, path: str, content: bytes, message: str) -> str:
+        files = dict(self.files)
+        files[path] = self.put_blob(content)
+        self.head = self.commit(files, message)
+        return self.head
+
+    def delete(self, path: str, message: str) -> str:
+        files = dict(self.files)
+        files.pop(path, None)
+        self.head = self.commit(files, message)
+        return self.head
+
+    def list_dir(self, path: str) -> Optional[List[Dict]]:
+        """디렉토리 항목 목록. 디렉토리가 없으면 None."""
+        prefix = f"{path.rstrip('/')}/" if path else ""
+        entries: Dict[str, Dict] = {}
+        for file_path, sha in self.files.items():
+            if not file_path.startswith(prefix):
+                continue
+            name, _, rest = file_path[len(prefix):].partition("/")
+            if rest:
+                entries.setdefault(name, {"name": name, "path": prefix + name, "type": "dir", "sha": None})
+            else:
+                entries[name] = {"name": name, "path": file_path, "type": "file", "sha": sha,
+                                 "size": len(self.blobs[sha])}
+        if not entries and path:
+            return None
+        return sorted(entries.values(), key=lambda e: e["name"])
+
+class FakeGitHub:
+    """GitHub REST API 대역 서버 (FastAPI 앱)."""
+
+    def __init__(self, repo: str = "slide-scribe/fake-data", latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: int = 5000, rate_window: float = 3600.0,
+                 conflict_rate: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.repo = FakeGitHubRepo(repo)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.conflict_rate = conflict_rate
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.requests_by_route: Dict[str, int] = {}
+        self._rate_used = 0
+        self._rate_reset = time.time() + rate_window
+        self.app = self._build_app()
+
+    # 인프로세스 설치
+    def install(self, token: str = "fake-token") -> None:
+        """github_api가 네트워크 대신 이 대역을 호출하도록 설정합니다."""
+        github_api.configure_github(
+            api_base="http://fake-github",
+            token=token,
+            repo=self.repo.full_name,
+            transport=httpx.ASGITransport(app=self.app),
+        )
+
+    def uninstall(self) -> None:
+        """github_api 설정을 실제 GitHub으로 되돌립니다."""
+        github_api.configure_github(api_base="https://api.github.com", transport=None)
+
+    # 상태 조회/시드
+    def seed_file(self, path: str, data) -> None:
+        """저장소에 JSON 파일을 직접 넣습니다 (요청 카운트 없음)."""
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        self.repo.write(path, content, f"Seed {path}")
+
+    def read_json(self, path: str):
+        content = self.repo.read(path)
+        return json.loads(content) if content is not None else None
+
+    def reset_rate_limit(self) -> None:
+        self._rate_used = 0
+        self._rate_reset = time.time() + self.rate_window
+
+    # 내부 동작
+    def _rate_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - self._rate_used)),
+            "X-RateLimit-Reset": str(int(self._rate_reset)),
+            "X-RateLimit-Used": str(self._rate_used),
+            "X-RateLimit-Resource": "core",
+        }
+
+    def _reply(self, status: int, body) -> JSONResponse:
+        return JSONResponse(body, status_code=status, headers=self._rate_headers())
+
+    async def _gate(self, request: Request, route: str) -> Optional[JSONResponse]:
+        """지연, 인증, 레이트 리밋, 오류 주입을 처리합니다."""
+        self.request_count += 1
+        self.requests_by_route[route] = self.requests_by_route.get(route, 0) + 1
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if not request.headers.get("authorization"):
+            return self._reply(401, {"message": "Requires authentication"})
+
+        now = time.time()
+        if now >= self._rate_reset:
+            self.reset_rate_limit()
+        if self._rate_used >= self.rate_limit:
+            return self._reply(403, {"message": "API rate limit exceeded"})
+        self._rate_used += 1
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self._reply(502, {"message": "Server Error"})
+        return None
+
+    def _content_entry(self, path: str) -> Dict:
+        sha = self.repo.files[path]
+        content = self.repo.blobs[sha]
+        return {
+            "type": "file",
+            "encoding": "base64",
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": sha,
+            "size": len(content),
+            "content": base64.encodebytes(content).decode("ascii"),
+        }
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake GitHub API")
+        repo = self.repo
+        prefix = "/repos/{owner}/{name}"
+
+        @app.get(prefix)
+        async def get_repo(owner: str, name: str, request: Request):
+            if (blocked := await self._gate(request, "repo")):
+                return blocked
+            return self._reply(200, {"full_name": repo.full_name, "private": True,
+                                     "default_branch": repo.branch})
+
+        @app.get(prefix + "/contents/{path:path}")
+        async def get_contents(owner: str, name: str, path: str, request: Request):
+            if (blocked := await self._gate(request, "contents.get")):
+                return blocked
+            if path in repo.files:
+                return self._reply(200, self._content_entry(path))
+            entries = repo.list_dir(path)
+            if entries is None:
+                return self._reply(404, {"message": "Not Found"})
+            return self._reply(200, entries)
+
+        @app.put(prefix + "/contents/{path:path}")
+        async def put_contents(owner: str, name: str, path: str, request: Request):
+            if (blocked := await self._gate(request, "contents.put")):
+                return blocked
+            body = await request.json()
+            current_sha = repo.files.get(path)
+            if current_sha and not body.get("sha"):
+                return self._reply(422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."})
+            if body.get("sha") and body["sha"] != current_sha:
+                return self._reply(409, {"message": f"{path} does not match {body['sha']}"})
+            if self.conflict_rate and self.random.random() < self.conflict_rate:
+                return self._reply(409, {"message": f"{path} does not match {body.get('sha')}"})
+            commit_sha = repo.write(path, base64.b64decode(body.get("content", "")), body.get("message", ""))
+            return self._reply(200 if current_sha else 201, {
+                "content": self._content_entry(path),
+                "commit": {"sha": commit_sha, "message": body.get("message", "")},
+            })
+
+        @app.delete(prefix + "/contents/{path:path}")
+        async def delete_contents(owner: str, name: str, path: str, request: Request):
+            if (blocked := await self._gate(request, "contents.delete")):
+                return blocked
+            body = await request.json()
+            current_sha = repo.files.get(path)
+            if not current_sha:
+                return self._reply(404, {"message": "Not Found"})
+            if body.get("sha") != current_sha:
+                return self._reply(409, {"message": f"{path} does not match {body.get('sha')}"})
+            commit_sha = repo.delete(path, body.get("message", ""))
+            return self._reply(200, {"content": None, "commit": {"sha": commit_sha}})
+
+        @app.get(prefix + "/git/ref/{ref:path}")
+        async def get_ref(owner: str, name: str, ref: str, request: Request):
+            if (blocked := await self._gate(request, "git.ref.get")):
+                return blocked
+            if ref != f"heads/{repo.branch}":
+                return self._reply(404, {"message": "Not Found"})
+            return self._reply(200, {"ref": f"refs/{ref}", "object": {"sha": repo.head, "type": "commit"}})
+
+        @app.patch(prefix + "/git/refs/{ref:path}")
+        async def update_ref(owner: str, name: str, ref: str, request: Request):
+            if (blocked := await self._gate(request, "git.ref.update")):
+                return blocked
+            body = await request.json()
+            sha = body.get("sha")
+            if ref != f"heads/{repo.branch}" or sha not in repo.commits:
+                return self._reply(422, {"message": "Reference update failed"})
+            if not body.get("force") and repo.head not in repo.commits[sha]["parents"] and sha != repo.head:
+                return self._reply(422, {"message": "Update is not a fast forward"})
+            repo.head = sha
+            return self._reply(200, {"ref": f"refs/{ref}", "object": {"sha": sha, "type": "commit"}})
+
+        @app.get(prefix + "/git/commits/{sha}")
+        async def get_commit(owner: str, name: str, sha: str, request: Request):
+            if (blocked := await self._gate(request, "git.commits.get")):
+                return blocked
+            commit = repo.commits.get(sha)
+            if not commit:
+                return self._reply(404, {"message": "Not Found"})
+            return self._reply(200, {"sha": sha, "message": commit["message"], "tree": {"sha": commit["tree"]},
+                                     "parents": [{"sha": p} for p in commit["parents"]]})
+
+        @app.post(prefix + "/git/commits")
+        async def create_commit(owner: str, name: str, request: Request):
+            if (blocked := await self._gate(request, "git.commits.create")):
+                return blocked
+            body = await request.json()
+            tree_sha = body.get("tree")
+            if tree_sha not in repo.trees:
+                return self._reply(422, {"message": "Tree SHA does not exist"})
+            sha = repo.commit(repo.trees[tree_sha], body.get("message", ""), parents=body.get("parents", []))
+            return self._reply(201, {"sha": sha, "tree": {"sha": tree_sha}})
+
+        @app.get(prefix + "/git/trees/{sha}")
+        async def get_tree(owner: str, name: str, sha: str, request: Request, recursive: Optional[str] = None):
+            if (blocked := await self._gate(request, "git.trees.get")):
+                return blocked
+            if sha in repo.commits:
+                sha = repo.commits[sha]["tree"]
+            files = repo.trees.get(sha)
+            if files is None:
+                return self._reply(404, {"message": "Not Found"})
+            entries = []
+            dirs = set()
+            for path in sorted(files):
+                parts = path.split("/")
+                for depth in range(1, len(parts)):
+                    dirs.add("/".join(parts[:depth]))
+                if recursive or len(parts) == 1:
+                    entries.append({"path": path, "mode": "100644", "type": "blob", "sha": files[path],
+                                    "size": len(repo.blobs[files[path]])})
+            for path in sorted(dirs):
+                if recursive or "/" not in path:
+                    entries.append({"path": path, "mode": "040000", "type": "tree", "sha": None})
+            return self._reply(200, {"sha": sha, "tree": entries, "truncated": False})
+
+        @app.post(prefix + "/git/trees")
+        async def create_tree(owner: str, name: str, request: Request):
+            if (blocked := await self._gate(request, "git.trees.create")):
+                return blocked
+            body = await request.json()
+            base = body.get("base_tree")
+            if base and base in repo.commits:
+                base = repo.commits[base]["tree"]
+            if base and base not in repo.trees:
+                return self._reply(422, {"message": "base_tree is not a valid tree"})
+            files = dict(repo.trees[base]) if base else {}
+            for entry in body.get("tree", []):
+                path = entry["path"]
+                if "content" in entry:
+                    files[path] = repo.put_blob(entry["content"].encode("utf-8"))
+                elif entry.get("sha"):
+                    if entry["sha"] not in repo.blobs:
+                        return self._reply(422, {"message": f"Blob {entry['sha']} does not exist"})
+                    files[path] = entry["sha"]
+                else:
+                    files.pop(path, None)
+            sha = repo.put_tree(files)
+            return self._reply(201, {"sha": sha, "truncated": False})
+
+        @app.get(prefix + "/git/blobs/{sha}")
+        async def get_blob(owner: str, name: str, sha: str, request: Request):
+            if (blocked := await self._gate(request, "git.blobs.get")):
+                return blocked
+            content = repo.blobs.get(sha)
+            if content is None:
+                return self._reply(404, {"message": "Not Found"})
+            return self._reply(200, {"sha": sha, "size": len(content), "encoding": "base64",
+                                     "content": base64.encodebytes(content).decode("ascii")})
+
+        @app.post(prefix + "/git/blobs")
+        async def create_blob(owner: str, name: str, request: Request):
+            if (blocked := await self._gate(request, "git.blobs.create")):
+                return blocked
+            body = await request.json()
+            content = body.get("content", "")
+            if body.get("encoding") == "base64":
+                data = base64.b64decode(content)
+            else:
+                data = content.encode("utf-8")
+            return self._reply(201, {"sha": repo.put_blob(data)})
+
+        @app.get("/rate_limit")
+        async def rate_limit():
+            return self._reply(200, {"resources": {"core": {
+                "limit": self.rate_limit,
+                "remaining": max(0, self.rate_limit - self._rate_used),
+                "reset": int(self._rate_reset),
+                "used": self._rate_used,
+            }}})
+
+        return app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 GitHub API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--repo", default="slide-scribe/fake-data")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 시간 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 최대값 (초)")
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--rate-window", type=float, default=3600.0)
+    parser.add_argument("--conflict-rate", type=float, default=0.0, help="PUT 요청 중 409 충돌 비율")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="502 오류 비율")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(repo=args.repo, latency=args.latency, jitter=args.jitter,
+                      rate_limit=args.rate_limit, rate_window=args.rate_window,
+                      conflict_rate=args.conflict_rate, error_rate=args.error_rate)
+    print(f"Fake GitHub: http://{args.host}:{args.port} (repo {args.repo})")
+    uvicorn.run(fake.app, host=args.host, port=args.port)
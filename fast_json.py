@@ -0,0 +1,51 @@
+"""JSON 직렬화 (orjson이 설치되어 있으면 사용).
+
+저장소(GitHub, 로컬 파일, 캐시)에는 공백 없는 compact 형식으로 쓰고, 사람이 받아 보는
+백업 다운로드만 들여쓰기합니다. orjson이 없거나 orjson이 다루지 못하는 값(64비트를
+넘는 정수 등)은 표준 json으로 처리하므로 결과는 같습니다.
+
+FastJSONResponse는 앱의 기본 응답 클래스입니다. 큰 결과(파싱 결과, 타이머 기록)를
+돌려주는 엔드포인트는 이 응답을 직접 반환해 FastAPI의 jsonable_encoder 단계도
+건너뜁니다 (내용이 이미 JSON 타입일 때만).
+"""
+from typing import Any, Union
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+def dumps(data: Any) -> bytes:
+    """compact UTF-8 JSON 바이트."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def dumps_str(data: Any) -> str:
+    return dumps(data).decode("utf-8")
+
+def dumps_pretty(data: Any) -> bytes:
+    """들여쓰기한 JSON 바이트 (다운로드용)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
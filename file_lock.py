@@ -0,0 +1,46 @@
+"""워커 프로세스 사이의 배타적 잠금 (잠금 파일 + flock).
+
+uvicorn --workers N 으로 띄우면 asyncio.Lock은 한 프로세스 안에서만 유효하므로,
+같은 데이터 디렉토리를 쓰는 워커 사이에서는 파일에 fcntl.flock을 겁니다. flock은
+열린 파일마다 걸리므로 같은 프로세스 안의 다른 fd와도 서로 막고, fd를 닫거나
+프로세스가 죽으면 자동으로 풀립니다.
+
+fcntl이 없는 플랫폼(Windows)에서는 잠그지 않으므로 단일 워커로 실행해야 합니다.
+"""
+from contextlib import asynccontextmanager
+from pathlib import Path
+import asyncio
+import os
+
+try:
+    import fcntl
+except ImportError:  # 선택 의존성 (POSIX 전용)
+    fcntl = None
+
+def try_lock(fd: int) -> bool:
+    """fd에 배타적 잠금을 바로 걸면 True, 다른 곳에서 잡고 있으면 False."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+@asynccontextmanager
+async def locked(path: Path, poll: float = 0.005, max_poll: float = 0.1):
+    """path 잠금 파일을 잡고 있는 동안 실행합니다.
+
+    기다리는 동안 이벤트 루프를 막지 않도록 블로킹 flock 대신 짧게 쉬며 다시 시도합니다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        while not try_lock(fd):
+            await asyncio.sleep(poll)
+            poll = min(poll * 2, max_poll)
+        yield
+    finally:
+        # 닫으면 잠금도 풀립니다
+        os.close(fd)
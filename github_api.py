@@ -0,0 +1,363 @@
+"""GitHub contents API 클라이언트.
+
+Slide Scribe 데이터 저장소(GITHUB_REPO)에 대한 모든 HTTP 호출을 한 곳에 모읍니다.
+여러 파일을 한 번에 바꾸는 작업(백업 가져오기, 전체 삭제)은 GitHubCommitBatch로
+Git Data API 커밋 하나에 묶습니다.
+"""
+from typing import List, Optional, Dict
+import contextvars
+import functools
+import logging
+import os
+import base64
+import time
+from dotenv import load_dotenv
+import httpx
+
+from github_scheduler import GitHubScheduler, GitHubUnavailable, Priority, resolve_priority
+import fast_json
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# .env 파일 로드
+load_dotenv()
+
+# GitHub 설정
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_REPO = os.getenv("GITHUB_REPO", "yujinc726/Slide-Scribe_data")
+# 테스트/벤치마크에서는 로컬 대역(fake_github.py)을 가리키도록 바꿀 수 있습니다.
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
+
+# httpx 전송 계층 (None이면 실제 네트워크 사용, 인프로세스 대역은 ASGITransport)
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+# GitHub이 느려질 때 기본 타임아웃만큼 기다리지 않도록 짧게 설정합니다
+GITHUB_TIMEOUT = httpx.Timeout(
+    float(os.getenv("GITHUB_TIMEOUT", "8")),
+    connect=float(os.getenv("GITHUB_CONNECT_TIMEOUT", "3"))
+)
+
+# 모든 GitHub 호출이 거치는 스케줄러 (레이트 리밋, 우선순위, 회로 차단)
+scheduler = GitHubScheduler.from_env()
+
+# 지표: HTTP 호출 하나하나와, 그 호출들을 묶은 작업(get_github_file_content 등) 단위
+GITHUB_REQUEST_SECONDS = metrics.histogram(
+    "slidescribe_github_request_duration_seconds", "GitHub API 호출 시간 (작업, 메서드, 응답 상태별)",
+    ("operation", "method", "status")
+)
+GITHUB_OPERATION_SECONDS = metrics.histogram(
+    "slidescribe_github_operation_duration_seconds", "GitHub 작업 전체 시간 (재시도 포함)", ("operation",)
+)
+
+# 지금 실행 중인 작업 이름 (github_request가 호출 지표에 붙임)
+_operation: contextvars.ContextVar[str] = contextvars.ContextVar("github_operation", default="other")
+
+def _track_operation(func):
+    """함수 이름을 작업 이름으로 삼아 안에서 일어나는 GitHub 호출을 묶어 기록합니다."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _operation.set(func.__qualname__)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            GITHUB_OPERATION_SECONDS.observe(time.perf_counter() - started, operation=func.__qualname__)
+            _operation.reset(token)
+    return wrapper
+
+def configure_github(api_base: Optional[str] = None, token: Optional[str] = None,
+                     repo: Optional[str] = None,
+                     transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """GitHub API 주소, 토큰, 저장소, 전송 계층을 런타임에 변경합니다."""
+    global GITHUB_API_BASE, GITHUB_TOKEN, GITHUB_REPO, _transport
+    if api_base is not None:
+        GITHUB_API_BASE = api_base.rstrip("/")
+    if token is not None:
+        GITHUB_TOKEN = token
+    if repo is not None:
+        GITHUB_REPO = repo
+    _transport = transport
+
+def get_github_client() -> httpx.AsyncClient:
+    """설정된 전송 계층을 사용하는 httpx 클라이언트를 만듭니다."""
+    return httpx.AsyncClient(transport=_transport, timeout=GITHUB_TIMEOUT)
+
+def get_repo_url() -> str:
+    """저장소 API URL을 반환합니다."""
+    return f"{GITHUB_API_BASE}/repos/{GITHUB_REPO}"
+
+def get_github_headers():
+    """GitHub API용 헤더 반환"""
+    if not GITHUB_TOKEN:
+        return None
+    return {
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": "application/vnd.github.v3+json",
+        "Content-Type": "application/json"
+    }
+
+async def github_request(client: httpx.AsyncClient, method: str, url: str,
+                         priority: Optional[Priority] = None, **kwargs) -> httpx.Response:
+    """스케줄러를 거쳐 GitHub API를 호출합니다.
+
+    회로 차단 중이거나 레이트 리밋 한도를 넘으면 요청을 보내지 않고
+    GitHubUnavailable을 발생시킵니다.
+    """
+    operation = _operation.get()
+    started = time.perf_counter()
+    status = "rejected"
+    try:
+        async with scheduler.slot(resolve_priority(method, priority)):
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, headers=get_github_headers(), **kwargs)
+            except httpx.HTTPError:
+                status = "error"
+                scheduler.record_failure()
+                raise
+            status = str(response.status_code)
+            scheduler.record_response(response.status_code, response.headers)
+            return response
+    finally:
+        GITHUB_REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                       operation=operation, method=method, status=status)
+
+def get_contents_url(file_path: str) -> str:
+    """저장소 내 경로에 대한 contents API URL을 반환합니다."""
+    return f"{get_repo_url()}/contents/{file_path}"
+
+@_track_operation
+async def get_github_file_content(file_path: str) -> Optional[Dict]:
+    """GitHub에서 파일 내용을 가져옵니다."""
+    headers = get_github_headers()
+    if not headers:
+        return None
+
+    try:
+        url = get_contents_url(file_path)
+
+        async with get_github_client() as client:
+            response = await github_request(client, "GET", url)
+
+            if response.status_code == 404:
+                return {}  # 파일이 없으면 빈 딕셔너리 반환
+
+            if response.status_code != 200:
+                logger.warning("GitHub API 오류: %s", response.status_code)
+                return None
+
+            data = response.json()
+            return fast_json.loads(base64.b64decode(data['content']))
+
+    except GitHubUnavailable:
+        return None
+    except Exception as e:
+        logger.warning("GitHub에서 파일 읽기 실패 (%s): %s", file_path, e)
+        return None
+
+@_track_operation
+async def save_github_file_content(file_path: str, content: Dict, message: str = "Update file") -> bool:
+    """GitHub에 파일 내용을 저장합니다."""
+    headers = get_github_headers()
+    if not headers:
+        return False
+
+    try:
+        # 먼저 기존 파일이 있는지 확인하여 SHA를 가져옵니다.
+        url = get_contents_url(file_path)
+
+        async with get_github_client() as client:
+            response = await github_request(client, "GET", url)
+
+            sha = None
+            if response.status_code == 200:
+                sha = response.json()['sha']
+
+            # 파일 내용을 compact JSON으로 변환하고 Base64 인코딩
+            content_b64 = base64.b64encode(fast_json.dumps(content)).decode('utf-8')
+
+            # 파일 업데이트/생성 요청
+            data = {
+                "message": message,
+                "content": content_b64
+            }
+
+            if sha:
+                data["sha"] = sha
+
+            put_response = await github_request(client, "PUT", url, json=data)
+
+            if put_response.status_code == 409:
+                # 다른 요청이 먼저 저장해 SHA가 바뀐 경우: 최신 SHA로 한 번 재시도
+                response = await github_request(client, "GET", url)
+                if response.status_code == 200:
+                    data["sha"] = response.json()['sha']
+                    put_response = await github_request(client, "PUT", url, json=data)
+
+            if put_response.status_code in [200, 201]:
+                logger.info("GitHub에 파일 저장 성공: %s", file_path)
+                return True
+            else:
+                logger.warning("GitHub 파일 저장 실패: %s", put_response.status_code)
+                return False
+
+    except GitHubUnavailable:
+        return False
+    except Exception as e:
+        logger.error("GitHub 파일 저장 오류: %s", e)
+        return False
+
+@_track_operation
+async def delete_github_file(file_path: str, message: str = "Delete file") -> bool:
+    """GitHub에서 파일을 삭제합니다. 파일이 없으면 False를 반환합니다."""
+    headers = get_github_headers()
+    if not headers:
+        return False
+
+    try:
+        url = get_contents_url(file_path)
+
+        async with get_github_client() as client:
+            response = await github_request(client, "GET", url)
+            if response.status_code != 200:
+                return False
+
+            sha = response.json()['sha']
+            delete_response = await github_request(
+                client, "DELETE", url,
+                json={"message": message, "sha": sha}
+            )
+
+            if delete_response.status_code == 200:
+                logger.info("GitHub에서 파일 삭제 성공: %s", file_path)
+                return True
+            else:
+                logger.warning("GitHub 파일 삭제 실패: %s", delete_response.status_code)
+                return False
+
+    except GitHubUnavailable:
+        return False
+    except Exception as e:
+        logger.error("GitHub 파일 삭제 오류: %s", e)
+        return False
+
+@_track_operation
+async def get_github_directory_contents(dir_path: str) -> List[str]:
+    """GitHub에서 디렉토리 내 파일 목록을 가져옵니다."""
+    headers = get_github_headers()
+    if not headers:
+        return []
+
+    try:
+        url = get_contents_url(dir_path)
+
+        async with get_github_client() as client:
+            response = await github_request(client, "GET", url)
+
+            if response.status_code == 404:
+                return []  # 디렉토리가 없으면 빈 리스트 반환
+
+            if response.status_code != 200:
+                logger.warning("GitHub API 오류: %s", response.status_code)
+                return []
+
+            data = response.json()
+
+            # 파일들만 필터링 (디렉토리 제외)
+            if isinstance(data, list):
+                files = [item['name'] for item in data if item['type'] == 'file' and item['name'].endswith('.json')]
+                return files
+
+            return []
+
+    except GitHubUnavailable:
+        return []
+    except Exception as e:
+        logger.error("GitHub 디렉토리 내용 가져오기 오류: %s", e)
+        return []
+
+class GitHubBatchError(Exception):
+    """일괄 커밋 중 GitHub API가 예상과 다른 응답을 보냈을 때 발생합니다."""
+
+class GitHubCommitBatch:
+    """여러 파일 변경을 Git Data API 커밋 하나로 묶습니다.
+
+    파일 내용은 추가하는 즉시 blob으로 올리므로 메모리에는 경로와 SHA만 남고,
+    commit()에서 tree → commit → ref 갱신을 한 번씩만 호출합니다.
+    contents API로 파일마다 GET/PUT 하는 것보다 요청 수와 커밋 수가 훨씬 적습니다.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.changes: Dict[str, Optional[str]] = {}
+        self.delete_prefixes: List[str] = []
+
+    async def _call(self, method: str, path: str, expected, **kwargs) -> Dict:
+        response = await github_request(self.client, method, f"{get_repo_url()}{path}", **kwargs)
+        if response.status_code not in expected:
+            raise GitHubBatchError(f"{method} {path}: {response.status_code}")
+        return response.json()
+
+    @_track_operation
+    async def put_json(self, file_path: str, content: Dict) -> None:
+        """파일 하나를 blob으로 올리고 커밋에 포함시킵니다."""
+        blob = await self._call("POST", "/git/blobs", (201,),
+                                json={"content": fast_json.dumps_str(content), "encoding": "utf-8"})
+        self.changes[file_path] = blob["sha"]
+
+    def delete_tree(self, dir_path: str) -> None:
+        """디렉토리 아래 모든 파일을 커밋에서 삭제합니다 (같은 배치의 put_json은 유지)."""
+        self.delete_prefixes.append(f"{dir_path.rstrip('/')}/")
+
+    async def _default_branch(self) -> str:
+        repo_info = await self._call("GET", "", (200,))
+        return repo_info.get("default_branch", "main")
+
+    @_track_operation
+    async def commit(self, message: str) -> Optional[str]:
+        """변경 사항을 커밋하고 커밋 SHA를 반환합니다.
+
+        그 사이 다른 요청이 브랜치를 옮겼으면(fast-forward 실패) 새 HEAD 기준으로
+        한 번 재시도합니다. blob은 이미 올라가 있으므로 다시 보내지 않습니다.
+        """
+        branch = await self._default_branch()
+        for attempt in range(2):
+            ref = await self._call("GET", f"/git/ref/heads/{branch}", (200,))
+            head = ref["object"]["sha"]
+            head_commit = await self._call("GET", f"/git/commits/{head}", (200,))
+            base_tree = head_commit["tree"]["sha"]
+
+            entries = [
+                {"path": path, "mode": "100644", "type": "blob", "sha": sha}
+                for path, sha in self.changes.items()
+            ]
+            if self.delete_prefixes:
+                tree = await self._call("GET", f"/git/trees/{base_tree}", (200,), params={"recursive": "1"})
+                if tree.get("truncated"):
+                    raise GitHubBatchError("저장소 트리가 너무 커서 삭제할 파일 목록을 가져올 수 없습니다")
+                entries.extend(
+                    {"path": item["path"], "mode": "100644", "type": "blob", "sha": None}
+                    for item in tree.get("tree", [])
+                    if item.get("type") == "blob"
+                    and item["path"] not in self.changes
+                    and any(item["path"].startswith(prefix) for prefix in self.delete_prefixes)
+                )
+            if not entries:
+                return head
+
+            new_tree = await self._call("POST", "/git/trees", (201,),
+                                        json={"base_tree": base_tree, "tree": entries})
+            new_commit = await self._call("POST", "/git/commits", (201,), json={
+                "message": message, "tree": new_tree["sha"], "parents": [head]
+            })
+            response = await github_request(
+                self.client, "PATCH", f"{get_repo_url()}/git/refs/heads/{branch}",
+                json={"sha": new_commit["sha"], "force": False}
+            )
+            if response.status_code == 200:
+                logger.info("GitHub 일괄 커밋 성공: %s개 파일 (%s)", len(entries), message)
+                return new_commit["sha"]
+            if response.status_code != 422 or attempt:
+                raise GitHubBatchError(f"PATCH /git/refs/heads/{branch}: {response.status_code}")
+        return None
@@ -0,0 +1,335 @@
+"""GitHub API 요청 스케줄러.
+
+모든 GitHub 호출은 GitHubScheduler.slot()을 거칩니다.
+
+- 토큰 버킷: X-RateLimit-Remaining / X-RateLimit-Reset 헤더를 따라 충전 속도를
+  맞추고, 남은 한도가 적으면 낮은 우선순위(백그라운드 동기화) 요청부터 막습니다.
+- 우선순위: 사용자 화면 읽기(INTERACTIVE) > 쓰기(WRITE) > 백그라운드(BACKGROUND).
+  대기 중인 더 높은 우선순위 요청이 있으면 낮은 우선순위 요청은 기다립니다.
+- 회로 차단기: 연속 실패가 쌓이면 OPEN 상태가 되어 요청을 즉시 거절하고
+  (호출 측은 바로 로컬 백업으로 전환), 대기 시간이 지나면 한 번의 탐색 요청으로
+  복구 여부를 확인합니다.
+"""
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    WRITE = 1
+    BACKGROUND = 2
+
+class GitHubUnavailable(Exception):
+    """회로 차단 또는 레이트 리밋으로 요청을 보내지 않았을 때 발생합니다."""
+
+_current_priority: ContextVar[Optional[Priority]] = ContextVar("github_priority", default=None)
+
+@contextmanager
+def github_priority(priority: Priority):
+    """블록 안의 GitHub 호출 우선순위를 지정합니다 (예: 백그라운드 동기화)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def resolve_priority(method: str, priority: Optional[Priority] = None) -> Priority:
+    """명시값 > 컨텍스트 값 > 메서드 기본값 순으로 우선순위를 정합니다."""
+    if priority is not None:
+        return priority
+    context_priority = _current_priority.get()
+    if context_priority is not None:
+        return context_priority
+    return Priority.INTERACTIVE if method.upper() == "GET" else Priority.WRITE
+
+class RateLimitBucket:
+    """GitHub 레이트 리밋 헤더를 따르는 토큰 버킷."""
+
+    # 남은 한도 중 한 번에 몰아 쓸 수 있는 비율
+    BURST_FRACTION = 0.25
+
+    def __init__(self, burst: int = 100, limit: int = 5000, window: float = 3600.0):
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.limit = limit
+        self.rate = limit / window
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        if self.reset_at is not None and time.time() >= self.reset_at:
+            # 리셋 시각이 지나면 한도가 다시 채워진 것으로 봅니다
+            self.remaining = None
+            self.reset_at = None
+            self.rate = self.limit / 3600.0
+        self.tokens = min(self.current_capacity(), self.tokens + (now - self.updated) * self.rate)
+        if self.remaining is not None:
+            self.tokens = min(self.tokens, float(self.remaining))
+        self.updated = now
+
+    def current_capacity(self) -> float:
+        """한도가 넉넉하면 큰 버스트를 허용하고, 줄어들수록 충전 속도에 맞춰 제한합니다."""
+        if self.remaining is None:
+            return self.capacity
+        return max(self.capacity, self.remaining * self.BURST_FRACTION)
+
+    def update_from_headers(self, headers) -> None:
+        try:
+            remaining = headers.get("x-ratelimit-remaining")
+            reset = headers.get("x-ratelimit-reset")
+            limit = headers.get("x-ratelimit-limit")
+            if remaining is None or reset is None:
+                return
+            self.refill()
+            new_window = self.remaining is None
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+            if limit is not None:
+                self.limit = int(limit)
+            seconds_left = max(1.0, self.reset_at - time.time())
+            self.rate = self.remaining / seconds_left
+            if new_window:
+                self.tokens = self.current_capacity()
+            self.tokens = min(self.tokens, float(self.remaining))
+        except (TypeError, ValueError):
+            pass
+
+    def wait_time(self) -> float:
+        """토큰 하나가 생길 때까지 남은 시간 (초). 리셋 전까지 불가능하면 리셋까지 시간."""
+        if self.tokens >= 1:
+            return 0.0
+        if self.remaining == 0 and self.reset_at is not None:
+            return max(0.0, self.reset_at - time.time())
+        if self.rate <= 0:
+            return float("inf")
+        return (1 - self.tokens) / self.rate
+
+class CircuitBreaker:
+    """연속 실패 시 GitHub 호출을 차단하고, 대기 후 탐색 요청으로 복구합니다."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def allow(self) -> bool:
+        """요청 허용 여부. HALF_OPEN에서는 탐색 요청 하나만 허용합니다."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def end_probe(self) -> None:
+        """결과를 반영하지 못하고 끝난 탐색 요청을 정리합니다 (취소, HTTP 밖의 예외).
+
+        결과가 이미 반영됐으면 HALF_OPEN을 벗어났으므로 아무것도 하지 않습니다.
+        """
+        if self.state == self.HALF_OPEN:
+            self.probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("GitHub 회로 복구: 정상 모드로 전환")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            # 탐색 실패: 대기 시간을 늘려 다시 차단
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+        logger.warning("GitHub 회로 차단: %.0f초 동안 로컬 전용 모드", self.cooldown)
+
+class GitHubScheduler:
+    """우선순위, 동시 요청 수, 레이트 리밋, 회로 차단을 함께 관리합니다."""
+
+    # 남은 한도 비율이 이 값 이하이면 해당 우선순위 요청을 보내지 않습니다
+    RESERVE = {
+        Priority.INTERACTIVE: 0.0,
+        Priority.WRITE: 0.02,
+        Priority.BACKGROUND: 0.10,
+    }
+    # 토큰을 기다릴 최대 시간 (초). 넘으면 GitHubUnavailable
+    MAX_WAIT = {
+        Priority.INTERACTIVE: 2.0,
+        Priority.WRITE: 5.0,
+        Priority.BACKGROUND: 30.0,
+    }
+
+    def __init__(self, max_concurrency: int = 8, burst: int = 100,
+                 failure_threshold: int = 3, cooldown: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.bucket = RateLimitBucket(burst=burst)
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown=cooldown)
+        self.in_flight = 0
+        self.waiting: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.stats = {"sent": 0, "rejected": 0, "failures": 0, "rate_limited": 0}
+        self._changed: Optional[asyncio.Event] = None
+        self._changed_loop = None
+
+    @classmethod
+    def from_env(cls) -> "GitHubScheduler":
+        return cls(
+            max_concurrency=int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")),
+            burst=int(os.getenv("GITHUB_BURST", "100")),
+            failure_threshold=int(os.getenv("GITHUB_BREAKER_THRESHOLD", "3")),
+            cooldown=float(os.getenv("GITHUB_BREAKER_COOLDOWN", "30")),
+        )
+
+    def _event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._changed is None or self._changed_loop is not loop:
+            self._changed = asyncio.Event()
+            self._changed_loop = loop
+        return self._changed
+
+    def _notify(self) -> None:
+        """대기 중인 요청들을 깨웁니다."""
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def _reject(self, reason: str) -> GitHubUnavailable:
+        self.stats["rejected"] += 1
+        return GitHubUnavailable(reason)
+
+    def _below_reserve(self, priority: Priority) -> bool:
+        bucket = self.bucket
+        if bucket.remaining is None or not bucket.limit:
+            return False
+        return bucket.remaining <= bucket.limit * self.RESERVE[priority]
+
+    def _blocked_by_higher(self, priority: Priority) -> bool:
+        return any(self.waiting[p] for p in Priority if p < priority)
+
+    async def acquire(self, priority: Priority) -> bool:
+        """슬롯을 얻습니다. 이 요청이 HALF_OPEN 탐색 요청이면 True."""
+        if not self.breaker.allow():
+            raise self._reject("GitHub 회로 차단 중 (로컬 전용 모드)")
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+
+        try:
+            await self._wait_for_slot(priority)
+        except BaseException:
+            # 탐색 요청이 나가지 못했으면 (거절, 취소) 다음 요청이 탐색할 수 있게 합니다
+            if probe:
+                self.breaker.end_probe()
+            raise
+        return probe
+
+    async def _wait_for_slot(self, priority: Priority) -> None:
+        deadline = time.monotonic() + self.MAX_WAIT[priority]
+        self.waiting[priority] += 1
+        try:
+            while True:
+                self.bucket.refill()
+                now = time.monotonic()
+
+                if self._below_reserve(priority):
+                    # 남은 한도는 더 높은 우선순위 요청 몫: 리셋까지 기다릴 수 없으면 거절
+                    wait = max(0.0, self.bucket.reset_at - time.time())
+                    if now + wait > deadline:
+                        self.stats["rate_limited"] += 1
+                        raise self._reject("GitHub 레이트 리밋 예약분 도달")
+                elif (self.in_flight < self.max_concurrency
+                        and self.bucket.tokens >= 1
+                        and not self._blocked_by_higher(priority)):
+                    self.bucket.tokens -= 1
+                    if self.bucket.remaining is not None:
+                        self.bucket.remaining -= 1
+                    self.in_flight += 1
+                    return
+                else:
+                    wait = self.bucket.wait_time() if self.bucket.tokens < 1 else 0.05
+                    if now + wait > deadline:
+                        self.stats["rate_limited"] += 1
+                        raise self._reject("GitHub 요청 대기 시간 초과")
+
+                try:
+                    await asyncio.wait_for(self._event().wait(), timeout=max(0.01, min(wait, deadline - now)))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.waiting[priority] -= 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._notify()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority):
+        """요청 하나를 보낼 수 있을 때까지 기다립니다."""
+        probe = await self.acquire(priority)
+        self.stats["sent"] += 1
+        try:
+            yield
+        finally:
+            self.release()
+            if probe:
+                # 응답을 반영하기 전에 취소되거나 예외로 끝난 탐색 요청
+                self.breaker.end_probe()
+
+    def record_response(self, status_code: int, headers) -> None:
+        """응답 상태와 레이트 리밋 헤더를 반영합니다."""
+        self.bucket.update_from_headers(headers)
+        if status_code >= 500:
+            self.record_failure()
+        elif status_code in (403, 429) and self.bucket.remaining == 0:
+            # 레이트 리밋 소진은 장애가 아니므로 회로 차단에 반영하지 않습니다
+            self.stats["rate_limited"] += 1
+            self.breaker.end_probe()
+        else:
+            self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.breaker.record_failure()
+
+    def snapshot(self) -> Dict:
+        """현재 상태 (상태 API용)."""
+        self.bucket.refill()
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "rate_limit_remaining": self.bucket.remaining,
+            "rate_limit_reset": self.bucket.reset_at,
+            "tokens": round(self.bucket.tokens, 2),
+            "in_flight": self.in_flight,
+            "waiting": {p.name.lower(): n for p, n in self.waiting.items()},
+            **self.stats,
+        }
@@ -0,0 +1,261 @@
+"""data/uploads 정리 작업 (업로드된 SRT와 내보낸 결과 파일).
+
+업로드/내보내기 파일은 요청이 끝나도 남아 있으므로, 백그라운드 작업이 주기적으로
+디렉토리를 한 번 훑어 다음 순서로 지웁니다.
+
+1. TTL: 마지막 사용 시각(mtime)이 ttl보다 오래된 파일
+2. 용량: 남은 파일 합계가 max_bytes를 넘으면 가장 오래전에 사용한 파일부터 (LRU)
+
+파일을 사용할 때 touch()로 mtime을 갱신하므로 여러 워커가 같은 디렉토리를 써도
+사용 시각이 공유됩니다. 처리 중인 요청이 hold()로 잡고 있는 파일과 만든 지
+min_age가 지나지 않은 파일은 지우지 않습니다.
+
+hold()는 한 프로세스의 요청 동안만 유효하므로, 요청이 끝난 뒤에도 쓰일 파일(파싱
+작업이 가리키는 SRT 등)은 pin(name, ttl)으로 그 시각까지 고정합니다. 고정 시각은
+`<파일명>.pin` 파일의 mtime으로 남기므로 어느 워커의 정리 작업이든 같이 지킵니다.
+
+sidecar_dir을 주면 파일을 지울 때 그 디렉토리에서 `<파일명>.`으로 시작하는
+파생 파일(자막 인덱스 등)도 함께 지웁니다.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class UploadJanitor:
+    """업로드 디렉토리의 TTL/용량 기반 정리와 사용 중 파일 보호."""
+
+    def __init__(self, directory: Path, ttl: float = 86400.0, max_bytes: int = 500 * 1024 * 1024,
+                 interval: float = 600.0, min_age: float = 300.0,
+                 sidecar_dir: Optional[Path] = None):
+        self.directory = Path(directory)
+        self.sidecar_dir = Path(sidecar_dir) if sidecar_dir is not None else None
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.min_age = min_age
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.usage = {"files": 0, "bytes": 0}
+        self.stats = {
+            "sweeps": 0,
+            "evicted_expired": 0,
+            "evicted_size": 0,
+            "bytes_freed": 0,
+            "skipped_in_use": 0,
+            "errors": 0,
+            "last_sweep_at": None,
+            "last_sweep_ms": None,
+        }
+
+    @classmethod
+    def from_env(cls, directory: Path, sidecar_dir: Optional[Path] = None) -> "UploadJanitor":
+        return cls(
+            directory,
+            sidecar_dir=sidecar_dir,
+            ttl=float(os.getenv("UPLOAD_TTL", "86400")),
+            max_bytes=int(float(os.getenv("UPLOAD_MAX_MB", "500")) * 1024 * 1024),
+            interval=float(os.getenv("UPLOAD_SWEEP_INTERVAL", "600")),
+        )
+
+    # 사용 중 파일 추적
+    @contextmanager
+    def hold(self, name: str):
+        """블록이 끝날 때까지 파일이 정리되지 않도록 잡아 둡니다."""
+        with self._lock:
+            self._refs[name] = self._refs.get(name, 0) + 1
+        try:
+            yield self.directory / name
+        finally:
+            with self._lock:
+                self._refs[name] -= 1
+                if not self._refs[name]:
+                    del self._refs[name]
+
+    def is_held(self, name: str) -> bool:
+        with self._lock:
+            return name in self._refs
+
+    def touch(self, name: str) -> None:
+        """파일의 마지막 사용 시각을 지금으로 갱신합니다 (LRU 기준)."""
+        try:
+            os.utime(self.directory / name)
+        except OSError:
+            pass
+
+    def _pin_path(self, name: str) -> Path:
+        return (self.sidecar_dir or self.directory / ".pins") / f"{name}.pin"
+
+    def pin(self, name: str, ttl: float) -> None:
+        """지금부터 ttl초 동안 파일을 지우지 않습니다 (워커 간 공유, 더 긴 고정은 줄이지 않음)."""
+        path = self._pin_path(name)
+        until = time.time() + ttl
+        try:
+            if path.exists() and path.stat().st_mtime >= until:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+            os.utime(path, (until, until))
+        except OSError as e:
+            logger.warning("업로드 파일 고정 실패 (%s): %s", name, e)
+
+    def is_pinned(self, name: str, now: Optional[float] = None) -> bool:
+        try:
+            return self._pin_path(name).stat().st_mtime > (now or time.time())
+        except OSError:
+            return False
+
+    def drop_sidecars(self, name: str) -> None:
+        """같은 이름으로 파일을 다시 쓰기 전에, 예전 내용에서 만든 파생 파일을 지웁니다."""
+        self._evict_sidecars(name)
+
+    def record_write(self, size: int) -> None:
+        """새 파일이 생겼음을 알립니다. 용량을 넘으면 다음 정리를 앞당깁니다."""
+        self.usage["files"] += 1
+        self.usage["bytes"] += size
+        if self.usage["bytes"] > self.max_bytes:
+            self.request_sweep()
+
+    # 정리
+    def sweep(self) -> Dict:
+        """디렉토리를 한 번 훑어 만료/초과 파일을 지우고 이번 결과를 반환합니다."""
+        started = time.monotonic()
+        now = time.time()
+        result = {"evicted_expired": 0, "evicted_size": 0, "bytes_freed": 0}
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.name))
+        entries.sort()
+
+        kept = []
+        total = 0
+        for last_used, size, name in entries:
+            if now - last_used > self.ttl:
+                if self._evict(name, size, "evicted_expired", result):
+                    continue
+            kept.append((last_used, size, name))
+            total += size
+
+        for last_used, size, name in kept:
+            if total <= self.max_bytes:
+                break
+            if now - last_used < self.min_age:
+                continue
+            if self._evict(name, size, "evicted_size", result):
+                total -= size
+
+        self.usage = {"files": len(kept) - result["evicted_size"], "bytes": total}
+        self.stats["sweeps"] += 1
+        self.stats["last_sweep_at"] = now
+        self.stats["last_sweep_ms"] = round((time.monotonic() - started) * 1000, 2)
+        if result["evicted_expired"] or result["evicted_size"]:
+            logger.info("업로드 정리: 만료 %d개, 용량 초과 %d개, %.1fMB 확보",
+                        result["evicted_expired"], result["evicted_size"], result["bytes_freed"] / 1024 / 1024)
+        return result
+
+    def _evict(self, name: str, size: int, reason: str, result: Dict) -> bool:
+        if self.is_held(name) or self.is_pinned(name):
+            self.stats["skipped_in_use"] += 1
+            return False
+        try:
+            (self.directory / name).unlink()
+        except FileNotFoundError:
+            # 다른 워커가 먼저 지운 경우
+            return True
+        except OSError as e:
+            logger.warning("업로드 파일 삭제 실패 (%s): %s", name, e)
+            self.stats["errors"] += 1
+            return False
+        size += self._evict_sidecars(name)
+        try:
+            self._pin_path(name).unlink()
+        except OSError:
+            pass
+        result[reason] += 1
+        result["bytes_freed"] += size
+        self.stats[reason] += 1
+        self.stats["bytes_freed"] += size
+        return True
+
+    def _evict_sidecars(self, name: str) -> int:
+        """원본 파일에서 만든 파생 파일을 지우고 확보한 바이트 수를 반환합니다."""
+        if self.sidecar_dir is None:
+            return 0
+        freed = 0
+        prefix = f"{name}."
+        try:
+            with os.scandir(self.sidecar_dir) as it:
+                entries = [entry for entry in it if entry.name.startswith(prefix)]
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+                os.unlink(entry.path)
+                freed += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("파생 파일 삭제 실패 (%s): %s", entry.name, e)
+                self.stats["errors"] += 1
+        return freed
+
+    # 백그라운드 실행
+    async def run(self) -> None:
+        while True:
+            self._wake = asyncio.Event()
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error("업로드 정리 오류: %s", e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def request_sweep(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        """디스크 사용량과 정리 통계 (상태 API용)."""
+        with self._lock:
+            in_use = len(self._refs)
+        return {
+            "directory": str(self.directory),
+            "ttl": self.ttl,
+            "max_bytes": self.max_bytes,
+            "in_use": in_use,
+            **self.usage,
+            **self.stats,
+        }
@@ -0,0 +1,149 @@
+"""타이머 기록 문서에 JSON Patch (RFC 6902)를 적용합니다.
+
+지원하는 연산: add, remove, replace, move, copy, test.
+경로는 JSON Pointer (RFC 6901) 형식이며 "~1"은 "/", "~0"은 "~"를 뜻합니다.
+
+    [{"op": "replace", "path": "/records/3/notes", "value": "새 노트"},
+     {"op": "test", "path": "/records/3/slide_number", "value": "4"}]
+
+패치는 원본을 건드리지 않고 복사본에 적용되며, 연산 하나라도 실패하면 아무것도
+바뀌지 않습니다. 형식이 잘못된 패치는 PatchError, test 연산이 맞지 않으면
+PatchConflict를 던집니다.
+"""
+import copy
+from typing import Any, Dict, Iterable, List, Tuple
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+class PatchError(ValueError):
+    """패치 문서나 경로가 잘못되었습니다."""
+
+class PatchConflict(PatchError):
+    """test 연산의 값이 현재 문서와 다릅니다."""
+
+def parse_pointer(pointer: str) -> List[str]:
+    """JSON Pointer를 토큰 목록으로 바꿉니다 ("" 는 문서 전체)."""
+    if not isinstance(pointer, str):
+        raise PatchError("path는 문자열이어야 합니다")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"잘못된 경로입니다: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+def _list_index(container: List, token: str, pointer: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise PatchError(f"배열 위치가 잘못되었습니다: {pointer}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"배열 범위를 벗어났습니다: {pointer}")
+    return index
+
+def _resolve_parent(document: Any, tokens: List[str], pointer: str) -> Tuple[Any, str]:
+    """경로의 마지막 토큰을 제외한 부분을 따라가 (부모 컨테이너, 마지막 토큰)을 반환합니다."""
+    node = document
+    for token in tokens[:-1]:
+        node = _child(node, token, pointer)
+    return node, tokens[-1]
+
+def _child(node: Any, token: str, pointer: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise PatchError(f"경로가 존재하지 않습니다: {pointer}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_list_index(node, token, pointer)]
+    raise PatchError(f"경로가 존재하지 않습니다: {pointer}")
+
+def get_value(document: Any, pointer: str) -> Any:
+    node = document
+    for token in parse_pointer(pointer):
+        node = _child(node, token, pointer)
+    return node
+
+def _add(document: Any, pointer: str, value: Any) -> Any:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return value
+    parent, token = _resolve_parent(document, tokens, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, token, pointer, allow_end=True), value)
+    else:
+        raise PatchError(f"경로가 존재하지 않습니다: {pointer}")
+    return document
+
+def _remove(document: Any, pointer: str) -> Tuple[Any, Any]:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("문서 전체는 삭제할 수 없습니다")
+    parent, token = _resolve_parent(document, tokens, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"경로가 존재하지 않습니다: {pointer}")
+        return document, parent.pop(token)
+    if isinstance(parent, list):
+        return document, parent.pop(_list_index(parent, token, pointer))
+    raise PatchError(f"경로가 존재하지 않습니다: {pointer}")
+
+def _require(operation: Dict, field: str) -> Any:
+    if field not in operation:
+        raise PatchError(f"{operation.get('op')} 연산에 {field}가 없습니다")
+    return operation[field]
+
+def apply_patch(document: Any, operations: Iterable[Dict]) -> Any:
+    """패치를 적용한 새 문서를 반환합니다 (원본은 바뀌지 않음)."""
+    if not isinstance(operations, list):
+        raise PatchError("패치는 연산의 배열이어야 합니다")
+
+    result = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise PatchError(f"지원하지 않는 연산입니다: {operation!r}")
+        op = operation["op"]
+        path = _require(operation, "path")
+
+        if op == "add":
+            result = _add(result, path, copy.deepcopy(_require(operation, "value")))
+        elif op == "remove":
+            result, _ = _remove(result, path)
+        elif op == "replace":
+            # replace는 이미 있는 값만 바꿀 수 있습니다
+            get_value(result, path)
+            value = copy.deepcopy(_require(operation, "value"))
+            if path == "":
+                result = value
+            else:
+                result, _ = _remove(result, path)
+                result = _add(result, path, value)
+        elif op == "move":
+            source = _require(operation, "from")
+            if path.startswith(source + "/"):
+                raise PatchError("값을 자기 자신의 하위 경로로 옮길 수 없습니다")
+            result, value = _remove(result, source)
+            result = _add(result, path, value)
+        elif op == "copy":
+            value = copy.deepcopy(get_value(result, _require(operation, "from")))
+            result = _add(result, path, value)
+        elif op == "test":
+            expected = _require(operation, "value")
+            actual = get_value(result, path)
+            # JSON에서는 1과 true가 다르므로 타입까지 비교합니다
+            if type(actual) is not type(expected) or actual != expected:
+                raise PatchConflict(f"test 실패: {path}")
+    return result
+
+def touched_roots(operations: Iterable[Dict]) -> set:
+    """패치가 바꿀 수 있는 최상위 필드 이름들 (test 연산 제외)."""
+    roots = set()
+    for operation in operations:
+        if operation.get("op") == "test":
+            continue
+        for key in ("path", "from"):
+            if operation.get(key) is not None and (key == "path" or operation.get("op") == "move"):
+                tokens = parse_pointer(operation[key])
+                roots.add(tokens[0] if tokens else "")
+    return roots
@@ -0,0 +1,209 @@
+"""실시간 전사(자막)와 슬라이드 전환을 점진적으로 맞추는 스트리밍 정렬기.
+
+강의를 실시간으로 전사하는 동안 자막(cue)과 타이머 기록(또는 슬라이드 전환 시각)을
+들어오는 대로 받아, 슬라이드의 종료 시각이 전사 워터마크를 지나면 그 슬라이드의
+텍스트를 확정해 내보냅니다. 결과는 같은 입력 전체에 align_slide_texts를 한 번
+돌린 것과 같습니다.
+
+- 자막은 시작 시각 순으로 들어와야 합니다. 워터마크는 지금까지 받은 마지막 자막의
+  시작 시각이며 (이후 자막은 그보다 늦게 시작), advance()로 더 앞당길 수 있습니다.
+- 확정되지 않은 슬라이드마다 자막 위치(포인터)와 버퍼를 두고 새 자막이 올 때마다
+  그 위치에서 이어서 보므로, 자막 하나당 작업량은 대기 중인 슬라이드 수에만
+  비례합니다 (실시간에서는 보통 1~2개). 이미 확정된 슬라이드보다 앞의 자막은
+  버립니다.
+- transition()으로 전환 시각만 보내면 다음 전환까지 슬라이드의 끝이 열려 있으며,
+  그동안 받은 자막은 버퍼에 모았다가 끝이 정해질 때 한 번 걸러냅니다.
+"""
+from bisect import bisect_right
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import math
+
+from result_export import format_timestamp
+from timecode import parse_times
+
+class _PendingSlide:
+    __slots__ = ("record", "start", "end", "pos", "anchor", "scan", "buffer")
+
+    def __init__(self, record: Dict, start: float, end: float):
+        self.record = record
+        self.start = start
+        self.end = end  # 전환만 받은 슬라이드는 다음 전환까지 inf
+        self.pos: Optional[int] = None  # 앞 슬라이드가 정해 주는 시작 위치 (이전 자막 건너뛰기 진행 위치)
+        self.anchor: Optional[int] = None  # 종료 시각이 슬라이드 시작 이후인 첫 자막 위치
+        self.scan = 0
+        self.buffer: List[int] = []
+
+class StreamingAligner:
+    """자막과 슬라이드를 조금씩 받아 확정된 슬라이드 텍스트를 내보냅니다."""
+
+    # 확정된 자막이 이만큼 쌓이면 앞부분을 잘라냅니다
+    TRIM_THRESHOLD = 1024
+
+    def __init__(self):
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._texts: List[str] = []
+        self._base = 0  # 잘라낸 자막 수 (위치는 모두 처음부터의 절대 위치)
+        self._pending: Deque[_PendingSlide] = deque()
+        self._anchor = 0  # 마지막으로 확정된 슬라이드가 다음 슬라이드에 넘기는 위치
+        self.watermark = -math.inf
+        self._last_end = 0.0  # 지금까지 받은 자막의 가장 늦은 종료 시각
+        self.stats = {"cues": 0, "slides": 0, "emitted": 0}
+
+    # 입력
+
+    def add_cues(self, cues: List[Dict]) -> List[Dict]:
+        """자막들(parse_srt_content 형태: start_time/end_time 초, text)을 추가합니다."""
+        for cue in cues:
+            start, end = float(cue['start_time']), float(cue['end_time'])
+            if self._starts and start < self._starts[-1]:
+                raise ValueError("자막은 시작 시각 순으로 추가해야 합니다")
+            self._starts.append(start)
+            self._ends.append(end)
+            self._texts.append(str(cue.get('text', '')).replace("\n", " "))
+            self._last_end = max(self._last_end, end)
+            self.watermark = max(self.watermark, start)
+            self.stats["cues"] += 1
+        return self._update()
+
+    def add_slides(self, records: List[Dict]) -> List[Dict]:
+        """시작/종료 시각이 정해진 타이머 기록들을 추가합니다."""
+        if not records:
+            return []
+        starts = parse_times([r.get('start_time', '00:00:00.000') for r in records])
+        ends = parse_times([r.get('end_time', '00:00:00.000') for r in records])
+        for record, start, end in zip(records, starts.tolist(), ends.tolist()):
+            if start != start or end != end:
+                raise ValueError(f"Invalid time format in slide {record.get('slide_number', '')}. Expected HH:MM:SS,mmm")
+            self._close_open_slide(start)
+            self._pending.append(_PendingSlide(record, start, end))
+            self.stats["slides"] += 1
+        return self._update()
+
+    def transition(self, time: str, record: Optional[Dict] = None) -> List[Dict]:
+        """time에 다음 슬라이드로 넘어갔음을 알립니다. 열려 있던 슬라이드는 time에 끝납니다."""
+        start = float(parse_times([time])[0])
+        if start != start:
+            raise ValueError(f"Invalid time format: {time}. Expected HH:MM:SS,mmm")
+        self._close_open_slide(start)
+        record = {**(record or {}), 'start_time': time}
+        self._pending.append(_PendingSlide(record, start, math.inf))
+        self.stats["slides"] += 1
+        return self._update()
+
+    def advance(self, watermark: float) -> List[Dict]:
+        """watermark초 전에 시작하는 자막은 모두 보냈음을 알립니다."""
+        self.watermark = max(self.watermark, float(watermark))
+        return self._update()
+
+    def finish(self) -> List[Dict]:
+        """입력이 끝났습니다. 열린 슬라이드는 마지막 자막이 끝나는 시각에 닫고 모두 확정합니다."""
+        if self._pending and math.isinf(self._pending[-1].end):
+            self._close_open_slide(max(self._last_end, self._pending[-1].start))
+        self.watermark = math.inf
+        return self._update()
+
+    @property
+    def pending_slides(self) -> int:
+        return len(self._pending)
+
+    # 내부
+
+    def _close_open_slide(self, end: float) -> None:
+        if not self._pending or not math.isinf(self._pending[-1].end):
+            return
+        slide = self._pending[-1]
+        slide.end = end
+        slide.record = {**slide.record, 'end_time': format_timestamp(end, ".")}
+        if slide.anchor is not None:
+            # 열려 있는 동안 모은 버퍼를 실제 종료 시각으로 거릅니다 (시작 순이므로 scan은 되돌림)
+            base = self._base
+            slide.scan = min(slide.scan, base + bisect_right(self._starts, end, lo=slide.anchor - base))
+            slide.buffer = [i for i in slide.buffer if i < slide.scan and self._ends[i - base] <= end]
+
+    def _scan(self, slide: _PendingSlide) -> None:
+        base, n = self._base, self._base + len(self._starts)
+        starts, ends = self._starts, self._ends
+        if slide.anchor is None:
+            # 슬라이드 시작 전에 끝난 자막 건너뛰기
+            p = slide.pos
+            while p < n and ends[p - base] < slide.start:
+                p += 1
+            slide.pos = p
+            if p == n:
+                return
+            slide.anchor = slide.scan = p
+        # 슬라이드 끝 전에 시작한 자막 중 끝도 그 안에 있는 것
+        i = slide.scan
+        while i < n and starts[i - base] <= slide.end:
+            if ends[i - base] <= slide.end:
+                slide.buffer.append(i)
+            i += 1
+        slide.scan = i
+
+    def _update(self) -> List[Dict]:
+        ready: Optional[int] = self._anchor
+        for slide in self._pending:
+            if slide.pos is None:
+                if ready is None:
+                    break
+                slide.pos = ready
+            self._scan(slide)
+            ready = slide.anchor
+
+        finalized = []
+        while self._pending and self._pending[0].end < self.watermark:
+            slide = self._pending.popleft()
+            if slide.pos is None:
+                slide.pos = self._anchor
+                self._scan(slide)
+            self._anchor = slide.anchor if slide.anchor is not None else slide.pos
+            if slide.buffer:
+                finalized.append(self._emit(slide))
+        if finalized:
+            self._trim()
+        return finalized
+
+    def _emit(self, slide: _PendingSlide) -> Dict:
+        record = slide.record
+        self.stats["emitted"] += 1
+        return {
+            'slide_title': record.get('slide_title', ''),
+            'slide_number': record.get('slide_number', ''),
+            'notes': record.get('notes', ''),
+            'text': ' '.join(self._texts[i - self._base] for i in slide.buffer),
+            'start_time': record.get('start_time'),
+            'end_time': record.get('end_time')
+        }
+
+    def _trim(self) -> None:
+        keep_from = self._anchor
+        for slide in self._pending:
+            if slide.pos is not None:
+                keep_from = min(keep_from, slide.pos)
+        drop = keep_from - self._base
+        if drop >= self.TRIM_THRESHOLD and drop * 2 >= len(self._starts):
+            del self._starts[:drop], self._ends[:drop], self._texts[:drop]
+            self._base = keep_from
+
+class SrtChunkReader:
+    """조각나서 들어오는 SRT 텍스트에서 완성된 블록만 꺼냅니다 (마지막 미완성 블록은 보관)."""
+
+    def __init__(self):
+        self._rest = ""
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        """지금까지 완성된 블록들의 텍스트 (parse_srt_content에 그대로 넘길 수 있음)."""
+        text = self._rest + chunk.replace("\r\n", "\n")
+        if not self._rest:
+            text = text.lstrip("\ufeff")
+        if final:
+            self._rest = ""
+            return text
+        cut = text.rfind("\n\n")
+        if cut < 0:
+            self._rest = text
+            return ""
+        self._rest = text[cut + 2:]
+        return text[:cut]
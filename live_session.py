@@ -0,0 +1,236 @@
+"""실시간 타이머 세션 (WebSocket)의 서버 쪽 상태와 추가 전용 로그.
+
+브라우저가 슬라이드를 기록할 때마다 이벤트를 보내면 서버는 세션 상태에 반영하고
+data/live/<사용자>/<강의>/<세션>.ndjson 에 한 줄씩 덧붙입니다. 이벤트는 쓰자마자
+OS로 넘기므로(flush) 서버 프로세스가 죽어도 남고, 디스크 동기화(fsync)는
+fsync_interval초마다 한 번 모아서 합니다. 따라서 전원이 나가도 잃는 것은 마지막
+fsync_interval초의 이벤트뿐이고, 이벤트가 많아도 fsync 횟수는 늘지 않습니다.
+
+세션을 마치면(finish) 로그를 재생한 결과를 타이머 기록 하나로 만들어 저장하고
+로그를 지웁니다. 연결이 끊긴 세션은 같은 session_id로 다시 연결하면 이어집니다.
+
+로그를 여는 쪽은 로그 파일에 배타적 flock을 걸고 닫을 때까지 유지하므로, 다른 워커
+프로세스의 연결이나 finish/삭제 요청이 같은 로그를 동시에 쓰거나 지우지 못합니다
+(LiveSessionBusy).
+
+이벤트 (클라이언트 → 서버, JSON)
+
+    {"type": "slide", "slide": {...}}                  슬라이드 기록 추가
+    {"type": "update", "index": 2, "fields": {...}}    슬라이드 필드 수정
+    {"type": "remove", "index": 2}                     슬라이드 삭제
+    {"type": "clear"}                                  모든 슬라이드 삭제
+    {"type": "rename", "session_name": "..."}          세션 이름 변경
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import threading
+
+import file_lock
+from timecode import first_invalid
+
+logger = logging.getLogger(__name__)
+
+SLIDE_FIELDS = ("slide_title", "slide_number", "start_time", "end_time", "notes")
+EVENT_TYPES = ("open", "slide", "update", "remove", "clear", "rename")
+
+class LiveSessionError(ValueError):
+    """이벤트 형식이 잘못되었습니다."""
+
+class LiveSessionBusy(Exception):
+    """다른 연결이나 요청(다른 워커 포함)이 세션 로그를 잡고 있습니다."""
+
+def _check_slide_fields(fields: Dict, require_all: bool) -> Dict:
+    if not isinstance(fields, dict):
+        raise LiveSessionError("슬라이드는 객체여야 합니다")
+    unknown = set(fields) - set(SLIDE_FIELDS)
+    if unknown:
+        raise LiveSessionError(f"알 수 없는 필드입니다: {', '.join(sorted(unknown))}")
+    if require_all:
+        missing = [f for f in SLIDE_FIELDS if f != "notes" and f not in fields]
+        if missing:
+            raise LiveSessionError(f"필수 필드가 누락되었습니다: {', '.join(missing)}")
+    slide = {}
+    for field, value in fields.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and field == "slide_number":
+            value = str(value)
+        if not isinstance(value, str):
+            raise LiveSessionError(f"{field}는 문자열이어야 합니다")
+        slide[field] = value
+    for field in ("start_time", "end_time"):
+        if field in slide and first_invalid([slide[field]]) >= 0:
+            raise LiveSessionError(f"{field} 형식이 올바르지 않습니다 (HH:MM:SS.mmm)")
+    return slide
+
+class LiveSession:
+    """세션 하나의 상태(슬라이드 목록)와 그 로그 파일."""
+
+    def __init__(self, path: Path, fsync_interval: float = 0.5):
+        self.path = Path(path)
+        self.session_id = self.path.stem
+        self.fsync_interval = fsync_interval
+        self.session_name = ""
+        self.created_at: Optional[str] = None
+        self.records: List[Dict] = []
+        self.seq = 0
+        self.stats = {"events": 0, "fsyncs": 0}
+        self._file = None
+        self._sync_task: Optional[asyncio.Task] = None
+        # 백그라운드 스레드의 fsync와 close가 겹치지 않도록
+        self._file_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path, session_name: str = "", fsync_interval: float = 0.5,
+             create: bool = True) -> "LiveSession":
+        """로그를 잠그고, 있으면 재생해 이어 쓰고 없으면 새로 만듭니다.
+
+        다른 곳에서 로그를 잡고 있으면 LiveSessionBusy, create=False인데 로그가 없으면
+        FileNotFoundError를 냅니다. 잠금은 close()/discard()까지 유지됩니다.
+        """
+        session = cls(path, fsync_interval)
+        if create:
+            session.path.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_RDWR | os.O_APPEND | (os.O_CREAT if create else 0)
+        f = os.fdopen(os.open(session.path, flags, 0o644), "ab+")
+        try:
+            if not file_lock.try_lock(f.fileno()):
+                raise LiveSessionBusy(f"다른 연결에서 사용 중인 세션입니다: {session.session_id}")
+            # 잠그기 직전에 다른 쪽이 마치고 지운 로그라면 경로가 가리키는 파일이 다릅니다
+            try:
+                replaced = os.stat(session.path).st_ino != os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                raise LiveSessionBusy(f"방금 저장되거나 삭제된 세션입니다: {session.session_id}")
+            session._replay()
+            # 쓰다 만 마지막 줄 뒤에 새 이벤트가 붙지 않도록 줄을 끝냅니다
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        except BaseException:
+            f.close()
+            raise
+        session._file = f
+        if session.seq == 0:
+            session.apply({"type": "open", "session_name": session_name,
+                           "created_at": datetime.now().isoformat()})
+        return session
+
+    def _replay(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # 마지막 줄이 쓰다 만 상태로 끊긴 경우
+                    logger.warning("실시간 세션 로그의 손상된 줄을 건너뜁니다: %s", self.path)
+                    continue
+                try:
+                    self.apply(event, log=False)
+                except LiveSessionError as e:
+                    logger.warning("실시간 세션 로그 재생 오류 (%s): %s", self.path, e)
+
+    def apply(self, event: Dict, log: bool = True) -> int:
+        """이벤트를 상태에 반영하고 로그에 덧붙입니다. 반영된 이벤트 번호를 반환합니다."""
+        if not isinstance(event, dict) or event.get("type") not in EVENT_TYPES:
+            raise LiveSessionError(f"지원하지 않는 이벤트입니다: {event!r}")
+        kind = event["type"]
+
+        if kind == "open":
+            self.session_name = str(event.get("session_name") or "")
+            self.created_at = event.get("created_at") or self.created_at
+        elif kind == "slide":
+            self.records.append(_check_slide_fields(event.get("slide"), require_all=True))
+        elif kind in ("update", "remove"):
+            index = event.get("index")
+            if not isinstance(index, int) or not 0 <= index < len(self.records):
+                raise LiveSessionError(f"슬라이드 위치가 잘못되었습니다: {index}")
+            if kind == "update":
+                self.records[index].update(_check_slide_fields(event.get("fields"), require_all=False))
+            else:
+                del self.records[index]
+        elif kind == "clear":
+            self.records = []
+        elif kind == "rename":
+            self.session_name = str(event.get("session_name") or "")
+
+        self.seq += 1
+        if log:
+            self._write(event)
+        return self.seq
+
+    def _write(self, event: Dict) -> None:
+        self._file.write((json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+        # OS 버퍼까지는 바로 넘기고 fsync는 모아서 합니다
+        self._file.flush()
+        self.stats["events"] += 1
+        if self._sync_task is None or self._sync_task.done():
+            try:
+                self._sync_task = asyncio.get_running_loop().create_task(self._sync_later())
+            except RuntimeError:
+                # 이벤트 루프 밖(재생/스크립트)에서는 바로 동기화
+                self._fsync()
+
+    async def _sync_later(self) -> None:
+        await asyncio.sleep(self.fsync_interval)
+        await asyncio.to_thread(self._fsync)
+
+    def _fsync(self) -> None:
+        with self._file_lock:
+            if self._file is None or self._file.closed:
+                return
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "session_name": self.session_name,
+            "created_at": self.created_at,
+            "records": self.records,
+            "seq": self.seq
+        }
+
+    async def close(self) -> None:
+        """남은 이벤트를 동기화하고 로그 파일을 닫습니다 (로그는 남겨 둠, 잠금 해제)."""
+        if self._file is None:
+            return
+        if self._sync_task is not None and not self._sync_task.done():
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+        self._fsync()
+        with self._file_lock:
+            self._file.close()
+            self._file = None
+
+    async def discard(self) -> None:
+        """로그를 지우고 닫습니다 (기록으로 저장한 뒤). 잠금을 쥔 채 지워야 다른 쪽이 이어 쓰지 못합니다."""
+        if self._file is not None:
+            self.path.unlink(missing_ok=True)
+        await self.close()
+
+def list_sessions(directory: Path) -> List[Dict]:
+    """디렉토리에 남아 있는 (마치지 않은) 세션 로그 목록."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    sessions = []
+    for path in sorted(directory.glob("*.ndjson"), key=lambda p: p.stat().st_mtime, reverse=True):
+        session = LiveSession(path)
+        session._replay()
+        sessions.append({
+            "session_id": session.session_id,
+            "session_name": session.session_name,
+            "created_at": session.created_at,
+            "records_count": len(session.records),
+            "last_event_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        })
+    return sessions
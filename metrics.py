@@ -0,0 +1,315 @@
+"""Prometheus 텍스트 형식의 운영 지표 (/metrics).
+
+외부 라이브러리 없이 카운터, 게이지, 히스토그램을 워커 프로세스 메모리에 모읍니다.
+uvicorn --workers N 이면 워커마다 따로 집계되므로 Prometheus가 워커별로 긁거나
+합산해야 합니다.
+
+- MetricsMiddleware: 요청 지연 히스토그램/응답 수 (라우트 템플릿, 메서드, 상태별)
+- EventLoopMonitor: 이벤트 루프 지연(예정보다 늦게 깨어난 시간)과 기본 스레드
+  풀 실행기의 대기 작업 수
+- register_collector(): /metrics를 만들 때마다 호출되어 다른 모듈의 snapshot()을
+  게이지/카운터로 내보내는 콜백 (캐시 적중률, GitHub 스케줄러 등)
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response가 charset=utf-8을 붙입니다
+
+# 초 단위 지연 히스토그램 기본 구간
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값별 [구간별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, key, _INF_BOUND)} {_format_value(state[-1])}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(state[-1])}"
+
+_INF_BOUND = 'le="+Inf"'
+
+class _Timer:
+    """with 블록 실행 시간을 히스토그램에 기록합니다."""
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+# 레지스트리
+
+_metrics: List[_Metric] = []
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+def _register(metric: _Metric) -> _Metric:
+    _metrics.append(metric)
+    return metric
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge(name, documentation, labelnames))
+
+def register_collector(collect: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]) -> None:
+    """/metrics를 만들 때 호출될 콜백을 등록합니다.
+
+    콜백은 (이름, 종류 "gauge"|"counter", 설명, 라벨, 값) 튜플들을 돌려줍니다.
+    """
+    _collectors.append(collect)
+
+def render() -> str:
+    """모든 지표를 Prometheus 텍스트 형식으로 만듭니다."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+
+    collected: Dict[str, Tuple[str, str, List[str]]] = {}
+    for collect in _collectors:
+        try:
+            samples = list(collect())
+        except Exception as e:
+            logger.error("지표 수집 오류 (%s): %s", getattr(collect, "__name__", collect), e)
+            continue
+        for name, kind, documentation, labels, value in samples:
+            if value is None:
+                continue
+            entry = collected.setdefault(name, (kind, documentation, []))
+            entry[2].append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(float(value))}")
+    for name, (kind, documentation, samples) in collected.items():
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", *samples])
+    return "\n".join(lines) + "\n"
+
+# 요청 지표
+
+HTTP_REQUEST_SECONDS = histogram(
+    "slidescribe_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_PROGRESS = gauge(
+    "slidescribe_http_requests_in_progress", "처리 중인 HTTP 요청 수", ("method",)
+)
+
+class MetricsMiddleware:
+    """요청마다 라우트 템플릿(/api/users/{username}/...) 기준으로 지연과 상태를 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = set(exclude)
+        self._route_paths: Optional[Dict[object, str]] = None
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._route_paths is None:
+            router = scope.get("router")
+            self._route_paths = {
+                getattr(route, "endpoint", None) or getattr(route, "app", None): route.path
+                for route in getattr(router, "routes", [])
+            }
+        return self._route_paths.get(endpoint, getattr(endpoint, "__name__", "unknown"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=method, route=self._route_path(scope), status=str(status["code"])
+            )
+            HTTP_REQUESTS_IN_PROGRESS.inc(-1, method=method)
+
+# 이벤트 루프 지표
+
+EVENT_LOOP_LAG_SECONDS = histogram(
+    "slidescribe_event_loop_lag_seconds", "이벤트 루프가 예정보다 늦게 깨어난 시간",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+EVENT_LOOP_LAG_MAX = gauge(
+    "slidescribe_event_loop_lag_max_seconds", "최근 측정 구간의 최대 이벤트 루프 지연"
+)
+
+class EventLoopMonitor:
+    """interval초마다 깨어나 이벤트 루프 지연을 재는 백그라운드 작업."""
+
+    def __init__(self, interval: float = 0.5, window: int = 20):
+        self.interval = interval
+        self.window = window
+        self._task: Optional[asyncio.Task] = None
+        self._recent: List[float] = []
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            self._recent = (self._recent + [lag])[-self.window:]
+            EVENT_LOOP_LAG_MAX.set(max(self._recent))
+
+def executor_queue_depth() -> Optional[int]:
+    """기본 스레드 풀(asyncio.to_thread, run_in_executor)에서 대기 중인 작업 수."""
+    try:
+        executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    except RuntimeError:
+        return None
+    if executor is None:
+        return 0
+    queue = getattr(executor, "_work_queue", None)
+    return queue.qsize() if queue is not None else None
+
+def collect_executor() -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+    depth = executor_queue_depth()
+    yield ("slidescribe_executor_queue_depth", "gauge", "기본 스레드 풀에서 대기 중인 작업 수", {}, depth)
+
+register_collector(collect_executor)
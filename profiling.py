@@ -0,0 +1,180 @@
+"""느린 요청을 운영 중에 들여다보기 위한 선택적 cProfile 프로파일링.
+
+켜는 방법은 두 가지입니다.
+
+- 요청 단위: PROFILE_TOKEN을 설정하고 요청에 `X-Profile: <토큰>` 헤더나
+  `?profile=<토큰>` 쿼리를 붙이면 그 요청만 프로파일링합니다 (토큰을 아는 관리자만).
+- 표본 추출: PROFILE_SAMPLE_RATE(0~1) 비율로 대상 요청을 무작위로 프로파일링합니다.
+
+대상은 PROFILE_PATHS 정규식에 맞는 경로(기본: /api/srt/* 와 타이머 기록 API)입니다.
+결과는 data/profiles/ 에 pstats 파일(.prof, snakeviz 등으로 열 수 있음)로 저장되고
+응답의 X-Profile-Id 헤더로 이름을 알려 줍니다. 파일은 최근 max_files개만 남깁니다.
+
+토큰도 표본 비율도 없으면 미들웨어를 아예 붙이지 않으므로 꺼져 있을 때 비용은 없습니다.
+
+cProfile은 이벤트 루프 스레드 전체를 기록하므로, 요청이 await로 쉬는 동안 같은 루프에서
+돈 다른 작업도 함께 잡힙니다. 그래서 한 번에 요청 하나만 프로파일링하며, 스레드 풀
+(asyncio.to_thread)에서 돈 작업은 포함되지 않습니다.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+from urllib.parse import parse_qs
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATHS = r"^/api/srt/|/timer-records(/|$)"
+
+# 프로파일 파일 이름 (download 경로 검증에도 사용)
+PROFILE_NAME_RE = re.compile(r"^[0-9]{8}T[0-9]{6}_[A-Z]+_[A-Za-z0-9_.-]+_[0-9a-f]{8}\.prof$")
+
+class RequestProfiler:
+    """프로파일 설정, 저장, 목록/다운로드."""
+
+    def __init__(self, directory: Path, token: Optional[str] = None, sample_rate: float = 0.0,
+                 paths: str = DEFAULT_PATHS, max_files: int = 50):
+        self.directory = Path(directory)
+        self.token = token or None
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.paths: Pattern = re.compile(paths)
+        self.max_files = max_files
+        self.stats = {"profiled": 0, "requested": 0, "sampled": 0, "skipped_busy": 0}
+        self._active = False
+
+    @classmethod
+    def from_env(cls, directory: Path) -> "RequestProfiler":
+        return cls(
+            directory,
+            token=os.getenv("PROFILE_TOKEN"),
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            paths=os.getenv("PROFILE_PATHS", DEFAULT_PATHS),
+            max_files=int(os.getenv("PROFILE_MAX_FILES", "50")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
+
+    def is_admin(self, token: Optional[str]) -> bool:
+        """관리자 토큰이 맞는지 (토큰이 설정되지 않았으면 항상 False)."""
+        return bool(self.token and token) and hmac.compare_digest(self.token, token)
+
+    # 저장
+
+    @staticmethod
+    def new_name(method: str, path: str) -> str:
+        route = re.sub(r"[^A-Za-z0-9_.-]+", "_", path.strip("/"))[:80] or "root"
+        return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{method}_{route}_{uuid.uuid4().hex[:8]}.prof"
+
+    def save(self, profile: cProfile.Profile, name: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.directory / name))
+        self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in files[self.max_files:]:
+            old.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True):
+            stat = path.stat()
+            profiles.append({
+                "name": path.name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        return profiles
+
+    def path(self, name: str) -> Optional[Path]:
+        """저장된 프로파일 파일 경로 (이름이 잘못되었거나 없으면 None)."""
+        if not PROFILE_NAME_RE.match(name):
+            return None
+        path = self.directory / name
+        return path if path.exists() else None
+
+    def summary(self, name: str, sort: str = "cumulative", limit: int = 60) -> Optional[str]:
+        """pstats 표 형태의 텍스트 요약."""
+        path = self.path(name)
+        if path is None:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(str(path), stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    # 요청 판정
+
+    def _wants_profile(self, scope) -> Optional[str]:
+        """이 요청을 프로파일링할 이유 ("requested" | "sampled") 또는 None."""
+        if self.token:
+            token = None
+            for key, value in scope.get("headers", []):
+                if key == b"x-profile":
+                    token = value.decode("latin-1")
+                    break
+            if token is None and b"profile=" in scope.get("query_string", b""):
+                token = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+            if token is not None and self.is_admin(token):
+                return "requested"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+class ProfilingMiddleware:
+    """대상 경로의 요청을 조건에 따라 cProfile로 감싸는 ASGI 미들웨어."""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if scope["type"] != "http" or not profiler.paths.search(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        reason = profiler._wants_profile(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+        if profiler._active:
+            profiler.stats["skipped_busy"] += 1
+            await self.app(scope, receive, send)
+            return
+
+        # 이름은 미리 정해 응답 헤더로 알려 주고, 파일은 요청이 끝난 뒤 저장합니다
+        profile = cProfile.Profile()
+        name = profiler.new_name(scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", name.encode())]}
+            await send(message)
+
+        profiler._active = True
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            profiler._active = False
+            profiler.stats["profiled"] += 1
+            profiler.stats[reason] += 1
+            try:
+                await asyncio.to_thread(profiler.save, profile, name)
+                logger.info("요청 프로파일 저장 (%s): %s", reason, name)
+            except Exception as e:
+                logger.error("요청 프로파일 저장 실패: %s", e)
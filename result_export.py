@@ -0,0 +1,213 @@
+"""SRT 파싱 결과 내보내기.
+
+파싱 결과(슬라이드별 텍스트)를 JSON, NDJSON, CSV, Markdown 발표자 노트,
+슬라이드별 SRT/VTT 자막으로 변환합니다. 모든 형식은 생성기로 조금씩 만들어
+응답으로 바로 흘려보내므로 임시 파일을 쓰지 않고, 선택적으로 gzip 또는
+zstd(zstandard 패키지가 설치된 경우)로 압축합니다.
+
+슬라이드별 SRT/VTT는 자막 시간을 슬라이드 시작 시각 기준(0초부터)으로 다시 맞춥니다.
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+import re
+import time
+import zipfile
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+from bulk_data import ChunkBuffer
+
+class ExportError(ValueError):
+    """지원하지 않는 형식/압축 방식이나 잘못된 요청일 때 발생합니다."""
+
+# 압축기에 한 번에 넘길 텍스트 크기
+CHUNK_SIZE = 64 * 1024
+
+CSV_FIELDS = ['slide_number', 'slide_title', 'start_time', 'end_time', 'notes', 'text']
+
+# 슬라이드 하나와 그 슬라이드에 속한 자막: (결과 항목, 슬라이드 시작 초, 자막 목록)
+SlideCues = Tuple[Dict, float, List[Dict]]
+
+def format_timestamp(seconds: float, separator: str = ",") -> str:
+    """초를 `HH:MM:SS,mmm` (VTT는 `HH:MM:SS.mmm`) 형식으로 바꿉니다."""
+    total_ms = max(0, int(round(seconds * 1000)))
+    h, rest = divmod(total_ms, 3600 * 1000)
+    m, rest = divmod(rest, 60 * 1000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{separator}{ms:03d}"
+
+# 형식별 텍스트 생성기
+
+def iter_json(results: List[Dict], metadata: Optional[Dict] = None) -> Iterator[str]:
+    """기존 내보내기와 같은 {"exported_at", "slide_count", "slides"} 문서를 만듭니다."""
+    header = {"exported_at": datetime.now().isoformat(), "slide_count": len(results)}
+    if metadata:
+        header["metadata"] = metadata
+    yield json.dumps(header, ensure_ascii=False)[:-1] + ', "slides": ['
+    for i, slide in enumerate(results):
+        yield ("\n  " if i == 0 else ",\n  ") + json.dumps(slide, ensure_ascii=False)
+    yield "\n]}\n"
+
+def iter_ndjson(results: List[Dict], metadata: Optional[Dict] = None) -> Iterator[str]:
+    """슬라이드 하나를 한 줄의 JSON으로 씁니다."""
+    for slide in results:
+        yield json.dumps(slide, ensure_ascii=False) + "\n"
+
+def iter_csv(results: List[Dict], metadata: Optional[Dict] = None) -> Iterator[str]:
+    """엑셀에서 한글이 깨지지 않도록 BOM을 붙인 CSV를 만듭니다."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    buffer.write("\ufeff")
+    writer.writeheader()
+    for slide in results:
+        writer.writerow({field: slide.get(field, "") for field in CSV_FIELDS})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def iter_markdown(results: List[Dict], metadata: Optional[Dict] = None) -> Iterator[str]:
+    """슬라이드별 발표자 노트 Markdown 문서를 만듭니다."""
+    title = (metadata or {}).get("title") or "Speaker Notes"
+    yield f"# {title}\n\n"
+    for slide in results:
+        yield f"## Slide {slide.get('slide_number', '')}: {slide.get('slide_title') or 'Untitled'}\n\n"
+        yield f"*{slide.get('start_time', '')} → {slide.get('end_time', '')}*\n\n"
+        notes = (slide.get("notes") or "").strip()
+        if notes:
+            yield "".join(f"> {line}\n" for line in notes.splitlines()) + "\n"
+        yield f"{slide.get('text', '')}\n\n"
+
+def iter_subtitles(slide_start: float, cues: List[Dict], vtt: bool = False) -> Iterator[str]:
+    """슬라이드 하나의 자막을 슬라이드 시작 기준 시간으로 SRT/VTT로 씁니다."""
+    separator = "." if vtt else ","
+    if vtt:
+        yield "WEBVTT\n\n"
+    for number, cue in enumerate(cues, start=1):
+        start = format_timestamp(cue["start_time"] - slide_start, separator)
+        end = format_timestamp(cue["end_time"] - slide_start, separator)
+        yield f"{number}\n{start} --> {end}\n{cue['text']}\n\n"
+
+# 형식 이름: (생성기, Content-Type, 파일 확장자)
+TEXT_FORMATS: Dict[str, Tuple[Callable, str, str]] = {
+    "json": (iter_json, "application/json", "json"),
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (iter_csv, "text/csv", "csv"),
+    "md": (iter_markdown, "text/markdown", "md"),
+}
+SUBTITLE_FORMATS = {
+    "srt": ("application/x-subrip", "srt"),
+    "vtt": ("text/vtt", "vtt"),
+}
+EXPORT_FORMATS = list(TEXT_FORMATS) + list(SUBTITLE_FORMATS)
+
+# 인코딩/압축
+
+def _encode(chunks: Iterable[str]) -> Iterator[bytes]:
+    """작은 문자열 조각을 CHUNK_SIZE 정도로 모아 UTF-8 바이트로 내보냅니다."""
+    pending: List[str] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_SIZE:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _zstd(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+# 압축 이름: (압축 함수, Content-Type, 확장자)
+COMPRESSIONS = {
+    "gzip": (_gzip, "application/gzip", "gz"),
+    "zstd": (_zstd, "application/zstd", "zst"),
+}
+
+def available_compressions() -> List[str]:
+    return [name for name in COMPRESSIONS if name != "zstd" or zstandard is not None]
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^\w\-]+", "_", value, flags=re.UNICODE).strip("_")[:40]
+
+def _iter_subtitle_zip(slides: List[SlideCues], vtt: bool, extension: str) -> Iterator[bytes]:
+    """슬라이드마다 자막 파일 하나씩 담은 zip을 스트리밍합니다."""
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for position, (slide, slide_start, cues) in enumerate(slides, start=1):
+            name = f"slide_{position:03d}"
+            title = _safe_name(str(slide.get("slide_title") or ""))
+            if title:
+                name += f"_{title}"
+            info = zipfile.ZipInfo(f"{name}.{extension}", date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, "w") as f:
+                for data in _encode(iter_subtitles(slide_start, cues, vtt)):
+                    f.write(data)
+            chunk = buffer.take()
+            if chunk:
+                yield chunk
+    yield buffer.take()
+
+def build_export(results: List[Dict], fmt: str, compress: Optional[str] = None,
+                 metadata: Optional[Dict] = None,
+                 slide_cues: Optional[Callable[[], List[SlideCues]]] = None,
+                 slide: Optional[int] = None,
+                 basename: str = "parsed_results") -> Tuple[Iterator[bytes], str, str]:
+    """(바이트 생성기, Content-Type, 파일명)을 반환합니다.
+
+    srt/vtt는 slide_cues가 필요합니다. slide(1부터)를 주면 그 슬라이드의 자막 파일 하나,
+    없으면 슬라이드별 파일을 담은 zip을 만듭니다 (zip은 따로 압축하지 않습니다).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(EXPORT_FORMATS)})")
+    if compress and compress not in COMPRESSIONS:
+        raise ExportError(f"지원하지 않는 압축 방식입니다: {compress} ({', '.join(available_compressions())})")
+    if compress == "zstd" and zstandard is None:
+        raise ExportError("zstd 압축을 사용하려면 zstandard 패키지를 설치하세요")
+
+    if fmt in TEXT_FORMATS:
+        generator, media_type, extension = TEXT_FORMATS[fmt]
+        body = _encode(generator(results, metadata))
+        filename = f"{basename}.{extension}"
+    else:
+        if slide_cues is None:
+            raise ExportError("SRT/VTT 내보내기에는 파싱 작업(job_id)의 자막 정보가 필요합니다")
+        media_type, extension = SUBTITLE_FORMATS[fmt]
+        slides = slide_cues()
+        vtt = fmt == "vtt"
+        if slide is not None:
+            if not 1 <= slide <= len(slides):
+                raise ExportError(f"슬라이드 번호는 1~{len(slides)} 사이여야 합니다")
+            _, slide_start, cues = slides[slide - 1]
+            body = _encode(iter_subtitles(slide_start, cues, vtt))
+            filename = f"{basename}_slide_{slide:03d}.{extension}"
+        else:
+            return _iter_subtitle_zip(slides, vtt, extension), "application/zip", f"{basename}_{fmt}.zip"
+
+    if compress:
+        compressor, media_type, compressed_extension = COMPRESSIONS[compress]
+        body = compressor(body)
+        filename = f"{filename}.{compressed_extension}"
+    return body, media_type, filename
@@ -0,0 +1,296 @@
+"""타이머 기록 노트와 슬라이드 스크립트 전문 검색 인덱스.
+
+SQLite 파일 하나(data/search/search_index.db, WAL 모드)에 역색인을 둡니다.
+
+- docs: 검색 결과로 돌려줄 문서 (슬라이드 하나 = 문서 하나) 메타데이터와 원문
+- docs_fts: FTS5 역색인 (rowid = docs.id). 제목/본문 두 컬럼, bm25로 순위를 매깁니다
+
+한국어는 띄어쓰기 단위가 조사와 붙어 있어 단어 색인으로는 "문제"로 "문제가"를 찾을 수
+없으므로, 한글은 글자 2-gram으로, 그 밖의 문자(영문/숫자)는 단어 단위(소문자)로 토큰을
+만들어 FTS5에 공백으로 구분해 넣습니다. 검색어도 같은 방식으로 나눠 모든 토큰을 포함한
+문서를 찾고, 영문/숫자 토큰은 접두어 검색을 합니다.
+
+문서 종류(kind)
+- note: 타이머 기록의 슬라이드 제목/노트 (save_timer_record_file 때 갱신)
+- transcript: SRT 파싱 결과의 슬라이드 텍스트 (기록을 지정해 파싱했을 때 갱신)
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import contextlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# 한글 음절/자모 연속 구간과 그 밖의 글자/숫자 연속 구간
+_HANGUL = "\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f"
+_TOKEN_RE = re.compile(f"[{_HANGUL}]+|[^\\W_{_HANGUL}]+")
+_HANGUL_RE = re.compile(f"[{_HANGUL}]")
+
+SNIPPET_RADIUS = 60
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+def tokenize(text: str) -> List[str]:
+    """한글은 2-gram(한 글자짜리 구간은 그대로), 나머지는 단어 단위 토큰."""
+    tokens = []
+    for run in _TOKEN_RE.findall(_normalize(text)):
+        if _HANGUL_RE.match(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+def build_match_query(query: str) -> Optional[str]:
+    """검색어를 FTS5 MATCH 식으로 바꿉니다 (모든 토큰 AND). 토큰이 없으면 None."""
+    terms = []
+    for token in dict.fromkeys(tokenize(query)):
+        # 한글 2-gram은 정확히, 영문/숫자와 한 글자 한글은 접두어로 찾습니다
+        prefix = "" if _HANGUL_RE.match(token) and len(token) > 1 else "*"
+        terms.append(f'"{token}"{prefix}')
+    return " AND ".join(terms) if terms else None
+
+def make_snippet(text: str, query: str) -> str:
+    """원문에서 검색어가 처음 나오는 곳 주변을 잘라 반환합니다."""
+    text = text or ""
+    lowered = _normalize(text)
+    positions = [lowered.find(word) for word in _normalize(query).split()]
+    positions = [p for p in positions if p >= 0]
+    if not positions or len(text) <= SNIPPET_RADIUS * 2:
+        return text[:SNIPPET_RADIUS * 2]
+    start = max(0, min(positions) - SNIPPET_RADIUS)
+    end = start + SNIPPET_RADIUS * 2
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+# 검색 결과에 포함하는 문서 메타데이터 컬럼
+_DOC_COLUMNS = ("username", "lecture_id", "record_id", "kind", "lecture_name", "session_name",
+                "slide_number", "slide_title", "start_time", "end_time", "text")
+
+class SearchIndex:
+    """사용자별 강의/세션/슬라이드 전문 검색 (SQLite FTS5)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        # path가 None이면 프로세스 전용 메모리 DB (테스트용)
+        self.path = str(path) if path else ":memory:"
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self.stats = {"searches": 0, "indexed_docs": 0, "removed_docs": 0, "last_search_ms": None}
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self.path == ":memory:":
+            if self._memory_conn is None:
+                self._memory_conn = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+            return self._memory_conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _read_lock(self):
+        """읽기용 잠금. 메모리 DB는 연결 하나를 스레드가 나눠 쓰므로 쓰기 잠금과 함께 씁니다."""
+        return self._write_lock if self.path == ":memory:" else contextlib.nullcontext()
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " id INTEGER PRIMARY KEY,"
+            " username TEXT NOT NULL, lecture_id TEXT NOT NULL, record_id TEXT NOT NULL,"
+            " kind TEXT NOT NULL, lecture_name TEXT, session_name TEXT,"
+            " slide_number TEXT, slide_title TEXT, start_time TEXT, end_time TEXT, text TEXT)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS docs_owner ON docs (username, lecture_id, record_id, kind)"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, body, tokenize='unicode61')"
+        )
+
+    # 갱신
+    def _replace(self, conn: sqlite3.Connection, where: str, params: Tuple, docs: List[Dict]) -> None:
+        ids = [row[0] for row in conn.execute(f"SELECT id FROM docs WHERE {where}", params)]
+        if ids:
+            conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", [(i,) for i in ids])
+            conn.execute(f"DELETE FROM docs WHERE {where}", params)
+            self.stats["removed_docs"] += len(ids)
+        for doc in docs:
+            cursor = conn.execute(
+                f"INSERT INTO docs ({', '.join(_DOC_COLUMNS)}) VALUES ({', '.join('?' * len(_DOC_COLUMNS))})",
+                tuple(doc.get(column) for column in _DOC_COLUMNS)
+            )
+            conn.execute(
+                "INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (cursor.lastrowid, " ".join(tokenize(doc.get("slide_title"))), " ".join(tokenize(doc.get("text"))))
+            )
+        self.stats["indexed_docs"] += len(docs)
+
+    def _write(self, where: str, params: Tuple, docs: List[Dict]) -> None:
+        conn = self._conn()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._replace(conn, where, params, docs)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _note_docs(username: str, lecture_id: str, record_id: str, record_data: Dict) -> List[Dict]:
+        docs = []
+        for slide in record_data.get("records", []):
+            if not (slide.get("slide_title") or slide.get("notes")):
+                continue
+            docs.append({
+                "username": username,
+                "lecture_id": lecture_id,
+                "record_id": record_id,
+                "kind": "note",
+                "lecture_name": record_data.get("lecture_name", ""),
+                "session_name": record_data.get("session_name", ""),
+                "slide_number": str(slide.get("slide_number", "")),
+                "slide_title": slide.get("slide_title", ""),
+                "start_time": slide.get("start_time", ""),
+                "end_time": slide.get("end_time", ""),
+                "text": slide.get("notes", "")
+            })
+        return docs
+
+    def index_record(self, username: str, lecture_id: str, record_id: str, record_data: Dict) -> None:
+        """타이머 기록의 슬라이드 노트 문서를 새 내용으로 바꿉니다."""
+        self._write(
+            "username = ? AND lecture_id = ? AND record_id = ? AND kind = 'note'",
+            (username, lecture_id, record_id),
+            self._note_docs(username, lecture_id, record_id, record_data)
+        )
+
+    def index_records(self, username: str, records: Iterable[Tuple[str, str, Dict]],
+                      reset: bool = False) -> int:
+        """(lecture_id, record_id, data) 여러 개를 트랜잭션 하나로 색인합니다 (가져오기/재구성용).
+
+        reset이면 사용자의 기존 노트 문서를 먼저 모두 지웁니다.
+        """
+        conn = self._conn()
+        count = 0
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if reset:
+                    self._replace(conn, "username = ? AND kind = 'note'", (username,), [])
+                for lecture_id, record_id, record_data in records:
+                    self._replace(
+                        conn,
+                        "username = ? AND lecture_id = ? AND record_id = ? AND kind = 'note'",
+                        (username, lecture_id, record_id),
+                        self._note_docs(username, lecture_id, record_id, record_data)
+                    )
+                    count += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def index_transcript(self, username: str, lecture_id: str, record_id: str,
+                         results: List[Dict], lecture_name: str = "", session_name: str = "") -> None:
+        """SRT 파싱 결과(슬라이드별 텍스트)를 기록의 스크립트 문서로 저장합니다."""
+        if not (lecture_name and session_name):
+            # 이름을 모르면 같은 기록의 노트 문서에서 가져옵니다
+            with self._read_lock():
+                row = self._conn().execute(
+                    "SELECT lecture_name, session_name FROM docs"
+                    " WHERE username = ? AND lecture_id = ? AND record_id = ? LIMIT 1",
+                    (username, lecture_id, record_id)
+                ).fetchone()
+            if row:
+                lecture_name = lecture_name or row[0]
+                session_name = session_name or row[1]
+        docs = [{
+            "username": username,
+            "lecture_id": lecture_id,
+            "record_id": record_id,
+            "kind": "transcript",
+            "lecture_name": lecture_name,
+            "session_name": session_name,
+            "slide_number": str(slide.get("slide_number", "")),
+            "slide_title": slide.get("slide_title", ""),
+            "start_time": slide.get("start_time", ""),
+            "end_time": slide.get("end_time", ""),
+            "text": slide.get("text", "")
+        } for slide in results]
+        self._write(
+            "username = ? AND lecture_id = ? AND record_id = ? AND kind = 'transcript'",
+            (username, lecture_id, record_id),
+            docs
+        )
+
+    def remove_record(self, username: str, lecture_id: str, record_id: str) -> None:
+        self._write("username = ? AND lecture_id = ? AND record_id = ?", (username, lecture_id, record_id), [])
+
+    def remove_lecture(self, username: str, lecture_id: str) -> None:
+        self._write("username = ? AND lecture_id = ?", (username, lecture_id), [])
+
+    def remove_user(self, username: str) -> None:
+        self._write("username = ?", (username,), [])
+
+    # 검색
+    def search(self, username: str, query: str, lecture_id: Optional[str] = None,
+               kind: Optional[str] = None, limit: int = 20, offset: int = 0) -> Dict:
+        """사용자 문서에서 검색어를 찾아 관련도 순으로 반환합니다 (제목 일치에 가중치)."""
+        match = build_match_query(query)
+        if match is None:
+            raise ValueError("검색어에 검색할 수 있는 글자가 없습니다")
+
+        started = time.monotonic()
+        where = ["d.username = ?"]
+        params: List = [match, username]
+        if lecture_id:
+            where.append("d.lecture_id = ?")
+            params.append(lecture_id)
+        if kind:
+            where.append("d.kind = ?")
+            params.append(kind)
+
+        with self._read_lock():
+            rows = self._conn().execute(
+                # 역색인 검색을 먼저 끝내고 그 결과에만 사용자/강의 조건을 적용합니다
+                "WITH m AS MATERIALIZED ("
+                " SELECT rowid, bm25(docs_fts, 2.0, 1.0) AS score FROM docs_fts WHERE docs_fts MATCH ?)"
+                f" SELECT {', '.join('d.' + c for c in _DOC_COLUMNS[1:])}, m.score, COUNT(*) OVER () AS total"
+                " FROM m JOIN docs d ON d.id = m.rowid"
+                f" WHERE {' AND '.join(where)}"
+                " ORDER BY m.score LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            doc = dict(zip(_DOC_COLUMNS[1:], row))
+            text = doc.pop("text")
+            doc["snippet"] = make_snippet(text, query)
+            doc["score"] = round(-row[-2], 4)
+            results.append(doc)
+
+        took_ms = round((time.monotonic() - started) * 1000, 2)
+        self.stats["searches"] += 1
+        self.stats["last_search_ms"] = took_ms
+        return {
+            "query": query,
+            "total": rows[0][-1] if rows else 0,
+            "results": results,
+            "took_ms": took_ms
+        }
+
+    def snapshot(self) -> Dict:
+        with self._read_lock():
+            row = self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()
+        return {"path": self.path, "documents": row[0], **self.stats}
@@ -0,0 +1,203 @@
+"""프로세스 간 공유 캐시.
+
+uvicorn --workers N 으로 여러 워커를 띄우면 각 워커의 메모리 캐시가 따로 놀게 됩니다.
+SharedCache는 외부 서비스 없이 SQLite 파일 하나(WAL 모드)를 두 번째 계층으로 두고,
+네임스페이스별 버전 번호를 무효화 채널로 사용합니다.
+
+- L1: 워커별 메모리 LRU (디코딩된 값 보관)
+- L2: data/cache/shared_cache.db 의 entries 테이블 (JSON 문자열)
+- 무효화: versions 테이블의 네임스페이스 버전을 올리면, 모든 워커가 다음 읽기에서
+  버전 불일치를 보고 L1/L2 항목을 버립니다. 읽을 때마다 버전 한 행만 확인하므로
+  워커 간 캐시가 항상 일관됩니다.
+- 정리: purge_every번 저장할 때마다 만료된 L2 항목을 지우고, max_entries를 넘으면
+  만료가 가장 이른 항목부터 지웁니다.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import sqlite3
+import threading
+import time
+
+import fast_json
+
+class SharedCache:
+    """SQLite 기반 2계층 캐시."""
+
+    def __init__(self, path: Optional[Path] = None, default_ttl: float = 300.0, l1_size: int = 1024,
+                 max_entries: int = 10000, purge_every: int = 200):
+        # path가 None이면 프로세스 전용 메모리 DB (단일 워커/테스트용)
+        self.path = str(path) if path else ":memory:"
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self.l1_size = l1_size
+        self.max_entries = max_entries
+        self.purge_every = purge_every
+        self._sets_since_purge = 0
+        self._l1: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._local = threading.local()
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "sets": 0, "invalidations": 0, "purged": 0}
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self.path == ":memory:":
+            if self._memory_conn is None:
+                self._memory_conn = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+            return self._memory_conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " version INTEGER NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS versions ("
+            " namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+
+    def namespace_version(self, namespace: str) -> int:
+        """네임스페이스의 현재 버전. 다른 워커가 무효화하면 값이 바뀝니다."""
+        row = self._conn().execute(
+            "SELECT version FROM versions WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, namespace: str, key: str, decode: Optional[Callable[[Any], Any]] = None) -> Optional[Any]:
+        """캐시된 값을 반환합니다. decode가 없으면 매번 새로 디코딩한 사본을 반환합니다."""
+        now = time.time()
+        version = self.namespace_version(namespace)
+        cache_key = (namespace, key)
+
+        entry = self._l1.get(cache_key)
+        if entry is not None:
+            raw, decoded, entry_version, expires_at = entry
+            if entry_version == version and expires_at > now:
+                self._l1.move_to_end(cache_key)
+                self.stats["l1_hits"] += 1
+                if not decode:
+                    return fast_json.loads(raw)
+                if decoded is None:
+                    decoded = decode(fast_json.loads(raw))
+                    self._l1[cache_key] = (raw, decoded, entry_version, expires_at)
+                return decoded
+            del self._l1[cache_key]
+
+        row = self._conn().execute(
+            "SELECT value, version, expires_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        if row is None or row[1] != version or row[2] <= now:
+            self.stats["misses"] += 1
+            return None
+
+        raw, _, expires_at = row
+        decoded = decode(fast_json.loads(raw)) if decode else None
+        self._remember(cache_key, raw, decoded, version, expires_at)
+        self.stats["l2_hits"] += 1
+        return decoded if decode else fast_json.loads(raw)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None,
+            expected_version: Optional[int] = None, decoded: Any = None) -> bool:
+        """값을 저장합니다.
+
+        expected_version을 주면, 값을 읽어 오는 동안 다른 워커가 무효화한 경우
+        (버전이 바뀐 경우) 오래된 값을 저장하지 않고 False를 반환합니다.
+        """
+        raw = fast_json.dumps_str(value)
+        expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+        conn = self._conn()
+        version = self.namespace_version(namespace)
+        if expected_version is not None and version != expected_version:
+            return False
+
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, version, expires_at)"
+            " SELECT ?, ?, ?, ?, ? WHERE COALESCE("
+            "  (SELECT version FROM versions WHERE namespace = ?), 0) = ?",
+            (namespace, key, raw, version, expires_at, namespace, version)
+        )
+        self._remember((namespace, key), raw, decoded, version, expires_at)
+        self.stats["sets"] += 1
+        self._sets_since_purge += 1
+        if self._sets_since_purge >= self.purge_every:
+            self.purge_expired()
+        return True
+
+    def invalidate(self, namespace: str) -> int:
+        """네임스페이스 버전을 올려 모든 워커의 해당 캐시를 무효화합니다."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO versions (namespace, version) VALUES (?, 1)"
+                " ON CONFLICT(namespace) DO UPDATE SET version = version + 1",
+                (namespace,)
+            )
+            conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        for cache_key in [k for k in self._l1 if k[0] == namespace]:
+            del self._l1[cache_key]
+        self.stats["invalidations"] += 1
+        return self.namespace_version(namespace)
+
+    def purge_expired(self) -> int:
+        """만료된 L2 항목을 삭제하고, max_entries를 넘는 만큼 만료가 이른 항목부터 삭제합니다."""
+        self._sets_since_purge = 0
+        conn = self._conn()
+        purged = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            purged += conn.execute(
+                "DELETE FROM entries WHERE rowid IN"
+                " (SELECT rowid FROM entries ORDER BY expires_at LIMIT ?)", (excess,)
+            ).rowcount
+        self.stats["purged"] += purged
+        return purged
+
+    def trim(self, namespace: str, max_entries: int) -> int:
+        """네임스페이스의 만료된 항목을 지우고, max_entries개를 넘으면 오래된(만료가 이른) 것부터 지웁니다."""
+        conn = self._conn()
+        keys = [row[0] for row in conn.execute(
+            "SELECT key FROM entries WHERE namespace = ? AND expires_at <= ?", (namespace, time.time())
+        )]
+        live = conn.execute(
+            "SELECT key FROM entries WHERE namespace = ? AND expires_at > ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?",
+            (namespace, time.time(), max_entries)
+        )
+        keys.extend(row[0] for row in live)
+        for key in keys:
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            self._l1.pop((namespace, key), None)
+        self.stats["purged"] += len(keys)
+        return len(keys)
+
+    def _remember(self, cache_key: tuple, raw: str, decoded: Any, version: int, expires_at: float) -> None:
+        self._l1[cache_key] = (raw, decoded, version, expires_at)
+        self._l1.move_to_end(cache_key)
+        while len(self._l1) > self.l1_size:
+            self._l1.popitem(last=False)
+
+    def snapshot(self) -> Dict:
+        lookups = self.stats["l1_hits"] + self.stats["l2_hits"] + self.stats["misses"]
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        return {
+            "path": self.path,
+            "l1_entries": len(self._l1),
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            **self.stats,
+        }
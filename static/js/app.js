@@ -13,6 +13,8 @@ class SlideScribeApp {
         
         this.slides = [];
         this.timerInterval = null;
+        // 서버에 슬라이드 기록을 실시간으로 남기는 WebSocket 세션 (새 기록일 때만)
+        this.liveSession = null;
 
         // SRT Parser state
         this.srtParser = {
@@ -728,6 +730,7 @@ class SlideScribeApp {
         
         // 슬라이드 데이터 초기화
         this.slides = [];
+        this.liveSend({ type: 'clear' });
         this.updateSlidesTable();
         this.updateRecordCount();
         
@@ -861,6 +864,7 @@ class SlideScribeApp {
         };
 
         this.slides.push(slide);
+        this.liveSend({ type: 'slide', slide });
         
         // 다음 슬라이드를 위한 업데이트
         document.getElementById('slideNumber').value = parseInt(slideNumber) + 1;
@@ -938,6 +942,7 @@ class SlideScribeApp {
 
     deleteSlide(index) {
         this.slides.splice(index, 1);
+        this.liveSend({ type: 'remove', index });
         this.updateSlidesTable();
         this.updateRecordCount();
         this.showToast('Slide record deleted', 'success');
@@ -1092,6 +1097,7 @@ class SlideScribeApp {
         
         // Update slide data
         this.slides[index][field] = newValue || '';
+        this.liveSend({ type: 'update', index, fields: { [field]: newValue || '' } });
         
         // Show success message if value changed
         if (newValue !== originalValue) {
@@ -1150,12 +1156,111 @@ class SlideScribeApp {
 
         if (confirm('Are you sure you want to clear all slide records?')) {
             this.slides = [];
+            this.liveSend({ type: 'clear' });
             this.updateSlidesTable();
             this.updateRecordCount();
             this.showToast('All records cleared', 'success');
         }
     }
 
+    // ===== Live Session =====
+    // 새 기록을 만드는 동안 슬라이드 기록/수정/삭제를 WebSocket으로 서버에 바로 남깁니다.
+    // 브라우저가 닫히거나 연결이 끊겨도 서버 로그에 남은 기록은 잃지 않습니다.
+    canUseLiveSession() {
+        return this.userState.isLoggedIn
+            && this.timerState.currentLecture
+            && (!this.timerState.currentRecord || this.timerState.currentRecord === 'new')
+            && typeof WebSocket !== 'undefined';
+    }
+
+    openLiveSession() {
+        const live = this.liveSession;
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const params = new URLSearchParams({ session_name: this.timerState.currentLectureName || '' });
+        if (live.sessionId) {
+            params.set('session_id', live.sessionId);
+        }
+        const url = `${protocol}//${window.location.host}/api/users/${this.userState.currentUser.username}/lectures/${live.lectureId}/live?${params}`;
+
+        const socket = new WebSocket(url);
+        live.socket = socket;
+        live.ready = false;
+
+        socket.onmessage = (event) => {
+            const message = JSON.parse(event.data);
+            if (message.type === 'ready') {
+                const resumed = Boolean(live.sessionId);
+                live.sessionId = message.session_id;
+                live.ready = true;
+                // 다시 연결했는데 서버 상태가 다르면 현재 슬라이드로 맞춥니다
+                if (resumed && JSON.stringify(message.records) !== JSON.stringify(this.slides)) {
+                    live.queue = [{ type: 'clear' }, ...this.slides.map(slide => ({ type: 'slide', slide }))];
+                }
+                live.queue.splice(0).forEach(item => socket.send(JSON.stringify(item)));
+            } else if (message.type === 'saved') {
+                live.finished = true;
+                if (live.onSaved) live.onSaved(message);
+            } else if (message.type === 'error') {
+                console.error('Live session error:', message.detail);
+                if (live.onSaved && !live.ready) live.onSaved(null);
+            }
+        };
+
+        socket.onclose = () => {
+            live.ready = false;
+            if (live.socket === socket) live.socket = null;
+            if (live.onSaved && !live.finished) live.onSaved(null);
+        };
+    }
+
+    liveSend(event) {
+        if (!this.liveSession) {
+            if (!this.canUseLiveSession() || event.type !== 'slide') return;
+            // 새 세션은 지금까지의 슬라이드 전체로 시작합니다 (방금 추가한 슬라이드 포함)
+            this.liveSession = {
+                lectureId: this.timerState.currentLecture,
+                sessionId: null,
+                socket: null,
+                ready: false,
+                queue: this.slides.map(slide => ({ type: 'slide', slide }))
+            };
+            this.openLiveSession();
+            return;
+        }
+
+        const live = this.liveSession;
+        if (live.ready && live.socket) {
+            live.socket.send(JSON.stringify(event));
+            return;
+        }
+        live.queue.push(event);
+        if (!live.socket) {
+            this.openLiveSession();
+        }
+    }
+
+    closeLiveSession() {
+        if (this.liveSession && this.liveSession.socket) {
+            this.liveSession.socket.close();
+        }
+        this.liveSession = null;
+    }
+
+    finishLiveSession(sessionName) {
+        // 서버가 로그로 기록을 만들어 저장합니다. 실패하면 null (일반 저장으로 대체)
+        const live = this.liveSession;
+        if (!live || !live.ready || !live.socket || live.lectureId !== this.timerState.currentLecture) {
+            return Promise.resolve(null);
+        }
+        return new Promise((resolve) => {
+            live.onSaved = (message) => {
+                live.onSaved = null;
+                resolve(message);
+            };
+            live.socket.send(JSON.stringify({ type: 'finish', session_name: sessionName }));
+        });
+    }
+
     // ===== File Operations =====
     async saveRecords() {
         if (!this.timerState.currentLecture) {
@@ -1189,6 +1294,18 @@ class SlideScribeApp {
                 updated_at: timestamp.toISOString()
             };
             
+            // 실시간 세션이 있으면 서버에 이미 남은 기록을 저장합니다
+            const liveResult = await this.finishLiveSession(recordName);
+            if (liveResult) {
+                this.liveSession = null;
+                this.showToast(`기록이 성공적으로 저장되었습니다 (${liveResult.timer_record.records_count}개 슬라이드)`, 'success');
+                await this.loadRecords();
+                return;
+            }
+            const orphanSessionId = this.liveSession && this.liveSession.lectureId === this.timerState.currentLecture
+                ? this.liveSession.sessionId : null;
+            this.closeLiveSession();
+            
             const url = `/api/users/${this.userState.currentUser.username}/lectures/${this.timerState.currentLecture}/timer-records`;
             
             // GitHub API를 통해 저장
@@ -1211,6 +1328,13 @@ class SlideScribeApp {
             if (response.ok && data.success) {
                 this.showToast(`기록이 성공적으로 저장되었습니다 (${this.slides.length}개 슬라이드)`, 'success');
                 
+                // 전체 기록으로 저장했으므로 서버에 남은 실시간 세션 로그는 지웁니다
+                if (orphanSessionId) {
+                    fetch(`/api/users/${this.userState.currentUser.username}/lectures/${this.timerState.currentLecture}/live/${orphanSessionId}`, {
+                        method: 'DELETE'
+                    }).catch(() => {});
+                }
+                
                 // 기록 목록 새로고침
                 await this.loadRecords();
             } else {
@@ -1582,6 +1706,8 @@ class SlideScribeApp {
         
         // Sync record variables
         this.timerState.currentRecord = this.currentRecord;
+        // 이전 실시간 세션은 닫습니다 (서버 로그는 남아 나중에 저장할 수 있음)
+        this.closeLiveSession();
         
         // Update selection info - show record name instead of ID
         const recordText = this.currentRecord === 'new' ? '새 기록' : (this.timerState.currentRecordName || this.currentRecord);
@@ -1965,6 +2091,12 @@ class SlideScribeApp {
             const formData = new FormData();
             formData.append('file_id', this.srtParser.uploadedFileId);
             formData.append('timer_records', JSON.stringify(timerRecord));
+            if (this.userState.isLoggedIn) {
+                // 파싱한 스크립트를 이 기록의 검색 인덱스에 추가
+                formData.append('username', this.userState.currentUser.username);
+                formData.append('lecture_id', this.srtParser.selectedLecture);
+                formData.append('record_id', this.srtParser.selectedRecord);
+            }
             
             const response = await fetch('/api/srt/parse-with-data', {
                 method: 'POST',
@@ -3326,7 +3458,7 @@ class SlideScribeApp {
     
     async exportAllData() {
         try {
-            const response = await fetch('/api/export/all');
+            const response = await fetch(`/api/export/all?username=${encodeURIComponent(this.userState.currentUser.username)}`);
             if (response.ok) {
                 const blob = await response.blob();
                 const url = URL.createObjectURL(blob);
@@ -3356,7 +3488,7 @@ class SlideScribeApp {
             const formData = new FormData();
             formData.append('file', file);
             
-            const response = await fetch('/api/import/all', {
+            const response = await fetch(`/api/import/all?username=${encodeURIComponent(this.userState.currentUser.username)}`, {
                 method: 'POST',
                 body: formData
             });
@@ -3384,7 +3516,7 @@ class SlideScribeApp {
         }
         
         try {
-            const response = await fetch('/api/clear/all', {
+            const response = await fetch(`/api/clear/all?username=${encodeURIComponent(this.userState.currentUser.username)}`, {
                 method: 'DELETE'
             });
             
@@ -3604,6 +3736,7 @@ class SlideScribeApp {
 
     clearUserData() {
         // 현재 선택사항과 데이터 정리
+        this.closeLiveSession();
         this.timerState.currentLecture = null;
         this.timerState.currentRecord = null;
         this.timerState.slides = [];
@@ -0,0 +1,192 @@
+"""정적 파일 (static/) 서빙: 내용 해시 지문, 미리 압축, 장기 캐시.
+
+시작할 때 static/ 아래 파일을 모두 읽어 다음을 준비합니다.
+
+- 지문 URL: 내용 해시를 파일 이름에 넣은 주소 (/static/js/app.1a2b3c4d5e.js).
+  내용이 바뀌면 주소도 바뀌므로 `Cache-Control: immutable`로 1년 동안 캐시하게 합니다.
+- 미리 압축: gzip(최고 압축)과 brotli(설치된 경우) 본문을 메모리에 만들어 두고,
+  Accept-Encoding에 맞는 것을 그대로 보냅니다. 요청마다 압축하지 않습니다.
+- 첫 화면(index.html): 정적 파일 주소를 지문 URL로 바꾼 HTML을 한 번만 만들어 둡니다.
+  HTML 자체는 배포 후 바로 바뀌어야 하므로 ETag로 매번 검증합니다(no-cache).
+
+지문이 없는 원래 주소(/static/css/style.css)도 그대로 동작하며 ETag로 검증합니다.
+파일을 고치면 서버를 다시 시작해야 반영됩니다. 개발 중에는 STATIC_AUTO_RELOAD=1로
+첫 화면을 요청할 때마다 파일이 바뀌었는지 확인해 다시 준비하게 할 수 있습니다.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+from fastapi import Response
+
+from compression import brotli, choose_encoding, COMPRESSIBLE_TYPES
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# index.html 안의 정적 파일 참조 (쿼리 문자열로 붙인 수동 버전 ?v=... 은 지문으로 대체)
+_STATIC_REF_RE = re.compile(r'(["\'])/static/([^"\'?#]+)(?:\?[^"\'#]*)?\1')
+
+@dataclass
+class Asset:
+    content_type: str
+    etag: str
+    # 인코딩("identity" | "gzip" | "br") → 본문
+    bodies: Dict[str, bytes]
+    immutable: bool = False
+
+    def body_for(self, accept_encoding: str) -> tuple:
+        encoding = choose_encoding(accept_encoding) if accept_encoding else None
+        if encoding and encoding in self.bodies:
+            return encoding, self.bodies[encoding]
+        return None, self.bodies["identity"]
+
+def _precompress(content_type: str, data: bytes, brotli_quality: int) -> Dict[str, bytes]:
+    bodies = {"identity": data}
+    if not content_type.startswith(COMPRESSIBLE_TYPES) or len(data) < 256:
+        return bodies
+    # mtime=0: 같은 내용이면 항상 같은 gzip 바이트
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) < len(data):
+        bodies["gzip"] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=brotli_quality)
+        if len(compressed) < len(data):
+            bodies["br"] = compressed
+    return bodies
+
+def _content_type(path: str) -> str:
+    # text/* 에는 Response가 charset=utf-8을 붙입니다
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+class StaticAssets:
+    """static/ 디렉터리의 지문 URL 표와 미리 압축한 본문."""
+
+    def __init__(self, directory: Path, mount_path: str = "/static", index_name: str = "index.html",
+                 brotli_quality: int = 11, auto_reload: bool = False):
+        self.directory = Path(directory)
+        self.mount_path = mount_path.rstrip("/")
+        self.index_name = index_name
+        self.brotli_quality = brotli_quality
+        self.auto_reload = auto_reload
+        self.assets: Dict[str, Asset] = {}
+        self.urls: Dict[str, str] = {}
+        self.index: Optional[Asset] = None
+        self._signature = None
+        self.build()
+
+    @classmethod
+    def from_env(cls, directory: Path) -> "StaticAssets":
+        return cls(
+            directory,
+            brotli_quality=int(os.getenv("STATIC_BROTLI_QUALITY", "11")),
+            auto_reload=os.getenv("STATIC_AUTO_RELOAD", "0").lower() in ("1", "true", "yes"),
+        )
+
+    def _files(self):
+        return sorted(p for p in self.directory.rglob("*") if p.is_file() and not p.name.startswith("."))
+
+    def _current_signature(self):
+        return tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in self._files())
+
+    def build(self) -> None:
+        """파일을 다시 읽어 지문 URL, 압축 본문, 첫 화면 HTML을 새로 만듭니다."""
+        assets: Dict[str, Asset] = {}
+        urls: Dict[str, str] = {}
+        index_source = None
+        signature = self._current_signature()
+        for path in self._files():
+            relative = path.relative_to(self.directory).as_posix()
+            data = path.read_bytes()
+            if relative == self.index_name:
+                index_source = data.decode("utf-8")
+                continue
+            digest = hashlib.blake2b(data, digest_size=5).hexdigest()
+            content_type = _content_type(relative)
+            bodies = _precompress(content_type, data, self.brotli_quality)
+            etag = f'"{digest}"'
+            stem, dot, suffix = relative.rpartition(".")
+            hashed = f"{stem}.{digest}.{suffix}" if dot else f"{relative}.{digest}"
+            assets[relative] = Asset(content_type, etag, bodies)
+            assets[hashed] = Asset(content_type, etag, bodies, immutable=True)
+            urls[relative] = f"{self.mount_path}/{hashed}"
+
+        index = None
+        if index_source is not None:
+            html = _STATIC_REF_RE.sub(
+                lambda m: f"{m.group(1)}{urls.get(m.group(2), m.group(0)[1:-1])}{m.group(1)}", index_source
+            ).encode("utf-8")
+            digest = hashlib.blake2b(html, digest_size=8).hexdigest()
+            index = Asset("text/html", f'"{digest}"',
+                          _precompress("text/html", html, self.brotli_quality))
+
+        # 다 만든 뒤 한 번에 바꿔 끼우므로 요청이 반쯤 만든 표를 보지 않습니다
+        self.assets, self.urls, self.index, self._signature = assets, urls, index, signature
+        raw = sum(len(a.bodies["identity"]) for a in assets.values() if not a.immutable)
+        compressed = sum(len(a.bodies.get("br", a.bodies.get("gzip", a.bodies["identity"])))
+                         for a in assets.values() if not a.immutable)
+        logger.info("정적 파일 %d개 준비 (%d → %d 바이트, brotli=%s)",
+                    len(urls), raw, compressed, brotli is not None)
+
+    def _reload_if_changed(self) -> None:
+        if self.auto_reload and self._current_signature() != self._signature:
+            logger.info("정적 파일 변경 감지, 다시 준비합니다")
+            self.build()
+
+    def url(self, path: str) -> str:
+        """static/ 기준 경로의 지문 URL (없는 파일이면 원래 주소)."""
+        return self.urls.get(path, f"{self.mount_path}/{path}")
+
+    # 응답
+
+    @staticmethod
+    def _respond(asset: Asset, accept_encoding: str, if_none_match: Optional[str],
+                 method: str = "GET") -> Response:
+        cache_control = IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL
+        headers = {"ETag": asset.etag, "Cache-Control": cache_control}
+        if len(asset.bodies) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if if_none_match and any(tag.strip().removeprefix("W/") in (asset.etag, "*")
+                                 for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        encoding, body = asset.body_for(accept_encoding)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        response = Response(body if method != "HEAD" else b"", media_type=asset.content_type, headers=headers)
+        if method == "HEAD":
+            response.headers["content-length"] = str(len(body))
+        return response
+
+    def index_response(self, request) -> Response:
+        """캐시해 둔 첫 화면 HTML."""
+        self._reload_if_changed()
+        if self.index is None:
+            return Response("index.html not found", status_code=404, media_type="text/plain")
+        return self._respond(self.index, request.headers.get("accept-encoding", ""),
+                             request.headers.get("if-none-match"), request.method)
+
+    async def __call__(self, scope, receive, send):
+        """/static 에 마운트하는 ASGI 앱."""
+        assert scope["type"] == "http"
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            response = Response("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+        else:
+            headers = {k: v.decode("latin-1") for k, v in scope.get("headers", [])
+                       if k in (b"accept-encoding", b"if-none-match")}
+            # Mount가 넘기는 path는 /static 뒤의 나머지 경로입니다
+            asset = self.assets.get(scope["path"].lstrip("/"))
+            if asset is None:
+                response = Response("Not Found", status_code=404, media_type="text/plain")
+            else:
+                response = self._respond(asset, headers.get(b"accept-encoding", ""),
+                                         headers.get(b"if-none-match"), method)
+        await response(scope, receive, send)
@@ -0,0 +1,1058 @@
+"""저장소 백엔드 인터페이스와 구현체.
+
+사용자(users), 강의 목록(lectures), 타이머 기록(records), 기록 인덱스(index)를
+하나의 인터페이스로 다룹니다. 구현체는 다음과 같습니다.
+
+- GitHubStorage: GitHub contents API (기존 원격 저장 방식)
+- LocalJSONStorage: data/ 아래 JSON 파일 (기존 로컬 백업 형식과 동일)
+- SQLiteStorage: SQLAlchemy + SQLite, (user, lecture, created_at) 인덱스로 목록 조회
+- MirroredStorage: 주 저장소 + 백업 저장소 이중 저장 (GitHub + 로컬이 기본값)
+- CachingStorage: 사용자 목록/강의 카탈로그(LectureCatalog)/기록 인덱스 캐시 래퍼
+  (shared_cache.SharedCache로 워커 프로세스 간 공유 및 무효화). 기록은 조건부 GET용
+  version만 기억합니다
+
+import_user_data/clear_user_data(백업 가져오기, 전체 삭제)는 백엔드가 지원하면
+GitHub 커밋 하나, SQLite 트랜잭션 하나로 처리합니다.
+
+load_* 메서드는 데이터를 읽지 못하면 None, 원격에는 닿았지만 파일이 없으면 {} 를
+반환할 수 있습니다. 호출하는 쪽은 두 경우 모두 "데이터 없음"으로 취급합니다.
+"""
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List, Optional, Dict, Tuple
+from pathlib import Path
+from datetime import datetime
+import asyncio
+import functools
+import logging
+import os
+import shutil
+
+import fast_json
+import github_api
+from shared_cache import SharedCache
+
+logger = logging.getLogger(__name__)
+
+# (lecture_id, record_id, record_data) 이터러블을 새로 만드는 함수
+RecordSource = Callable[[], Iterable[Tuple[str, str, Dict]]]
+
+class LectureCatalog:
+    """사용자 강의 목록 문서와 id/이름 조회용 맵.
+
+    강의 존재 확인과 이름 중복 확인을 목록 순회 없이 처리하고,
+    추가/삭제 시 맵을 증분 갱신합니다.
+    """
+
+    def __init__(self, document: Optional[Dict] = None):
+        document = document or {}
+        self.extra = {k: v for k, v in document.items() if k != "lectures"}
+        self.by_id: Dict[str, Dict] = {}
+        self.name_to_id: Dict[str, str] = {}
+        for lecture in document.get("lectures", []):
+            self.add(lecture)
+        self.exists = bool(document)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, lecture_id: str) -> Optional[Dict]:
+        return self.by_id.get(lecture_id)
+
+    def has_name(self, name: str) -> bool:
+        return name in self.name_to_id
+
+    def add(self, lecture: Dict) -> None:
+        self.by_id[lecture.get("id")] = lecture
+        self.name_to_id[lecture.get("name", "")] = lecture.get("id")
+        self.exists = True
+
+    def remove(self, lecture_id: str) -> Optional[Dict]:
+        lecture = self.by_id.pop(lecture_id, None)
+        if lecture is not None:
+            name = lecture.get("name", "")
+            if self.name_to_id.get(name) == lecture_id:
+                del self.name_to_id[name]
+                # 같은 이름의 다른 강의가 남아 있으면 그 강의로 다시 연결
+                for other in self.by_id.values():
+                    if other.get("name", "") == name:
+                        self.name_to_id[name] = other.get("id")
+        return lecture
+
+    def to_document(self) -> Dict:
+        return {**self.extra, "lectures": list(self.by_id.values())}
+
+    def copy(self) -> "LectureCatalog":
+        """수정해도 원본(캐시된 객체)에 영향이 없는 사본."""
+        clone = LectureCatalog()
+        clone.extra = dict(self.extra)
+        clone.by_id = {lecture_id: dict(lecture) for lecture_id, lecture in self.by_id.items()}
+        clone.name_to_id = dict(self.name_to_id)
+        clone.exists = self.exists
+        return clone
+
+class StorageBackend(ABC):
+    """사용자/강의/타이머 기록/인덱스 저장소 인터페이스."""
+
+    name = "base"
+
+    # Users
+    @abstractmethod
+    async def load_users(self) -> Optional[Dict]:
+        """{username: user_dict} 형태의 사용자 데이터를 반환합니다."""
+
+    @abstractmethod
+    async def save_users(self, users_data: Dict) -> bool:
+        """사용자 데이터 전체를 저장합니다."""
+
+    @abstractmethod
+    async def delete_user(self, username: str) -> bool:
+        """사용자의 강의/기록 데이터를 삭제합니다 (users 문서는 제외)."""
+
+    # Lectures
+    @abstractmethod
+    async def load_lectures(self, username: str) -> Optional[Dict]:
+        """{"lectures": [...]} 형태의 강의 목록 문서를 반환합니다."""
+
+    @abstractmethod
+    async def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        """강의 목록 문서를 저장합니다."""
+
+    async def load_lecture_catalog(self, username: str) -> LectureCatalog:
+        """강의 목록을 조회용 카탈로그로 반환합니다."""
+        return LectureCatalog(await self.load_lectures(username))
+
+    async def save_lecture_catalog(self, username: str, catalog: LectureCatalog,
+                                   message: str = "Update lectures") -> bool:
+        """카탈로그 내용을 강의 목록 문서로 저장합니다."""
+        return await self.save_lectures(username, catalog.to_document(), message)
+
+    # Timer records
+    @abstractmethod
+    async def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        """타이머 기록 하나를 반환합니다."""
+
+    @abstractmethod
+    async def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        """타이머 기록 하나를 저장합니다."""
+
+    @abstractmethod
+    async def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        """타이머 기록 하나를 삭제합니다. 삭제할 기록이 없으면 False."""
+
+    @abstractmethod
+    async def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        """저장된 타이머 기록 ID 목록을 반환합니다 (인덱스가 아닌 실제 저장 상태 기준)."""
+
+    @abstractmethod
+    async def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        """강의의 모든 타이머 기록을 삭제합니다."""
+
+    # Records index
+    @abstractmethod
+    async def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        """강의의 타이머 기록 인덱스 문서를 반환합니다."""
+
+    @abstractmethod
+    async def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        """강의의 타이머 기록 인덱스 문서를 저장합니다."""
+
+    @abstractmethod
+    async def delete_index(self, username: str, lecture_id: str) -> bool:
+        """강의의 타이머 기록 인덱스를 삭제합니다."""
+
+    # Bulk
+    async def import_user_data(self, username: str, lectures: Dict, indexes: Dict[str, Dict],
+                               records: RecordSource, message: str = "Import backup") -> bool:
+        """강의 목록, 타이머 기록, 인덱스를 한꺼번에 저장합니다.
+
+        records는 (lecture_id, record_id, data)를 차례로 내보내는 이터러블을 만드는
+        함수입니다. 기록 전체를 메모리에 올리지 않고, 여러 저장소에 쓸 때는 다시 호출합니다.
+        기본 구현은 파일 단위로 저장하고, 일괄 쓰기를 지원하는 백엔드는 재정의합니다.
+        """
+        success = await self.save_lectures(username, lectures, message)
+        for lecture_id, record_id, data in records():
+            success = await self.save_record(username, lecture_id, record_id, data, message) and success
+        for lecture_id, index_data in indexes.items():
+            success = await self.save_index(username, lecture_id, index_data, message) and success
+        return success
+
+    async def clear_user_data(self, username: str) -> bool:
+        """사용자의 강의/기록/인덱스를 한 번에 모두 삭제합니다 (계정은 유지)."""
+        return await self.delete_user(username)
+
+def make_record_info(record_data: Dict, record_id: Optional[str] = None) -> Dict:
+    """타이머 기록에서 인덱스 항목을 만듭니다."""
+    return {
+        "id": record_id or record_data.get("id"),
+        "session_name": record_data.get("session_name", ""),
+        "created_at": record_data.get("created_at"),
+        "updated_at": record_data.get("updated_at"),
+        "records_count": len(record_data.get("records", []))
+    }
+
+def make_empty_index(lecture_id: str) -> Dict:
+    """빈 기록 인덱스 문서를 만듭니다."""
+    return {
+        "version": "1.0",
+        "lecture_id": lecture_id,
+        "records": [],
+        "created_at": datetime.now().isoformat(),
+        "updated_at": datetime.now().isoformat()
+    }
+
+class GitHubStorage(StorageBackend):
+    """GitHub 저장소(users/ 트리)에 JSON 파일로 저장합니다."""
+
+    name = "github"
+
+    def users_path(self) -> str:
+        return "users.json"
+
+    def lectures_path(self, username: str) -> str:
+        return f"users/{username}/lectures.json"
+
+    def records_dir(self, username: str, lecture_id: str) -> str:
+        return f"users/{username}/records/{lecture_id}"
+
+    def record_path(self, username: str, lecture_id: str, record_id: str) -> str:
+        return f"{self.records_dir(username, lecture_id)}/{record_id}.json"
+
+    def index_path(self, username: str, lecture_id: str) -> str:
+        return f"{self.records_dir(username, lecture_id)}/index.json"
+
+    async def load_users(self) -> Optional[Dict]:
+        return await github_api.get_github_file_content(self.users_path())
+
+    async def save_users(self, users_data: Dict) -> bool:
+        return await github_api.save_github_file_content(self.users_path(), users_data, "Update users data")
+
+    async def delete_user(self, username: str) -> bool:
+        # GitHub의 사용자 데이터는 보존합니다 (기존 동작과 동일)
+        return True
+
+    async def load_lectures(self, username: str) -> Optional[Dict]:
+        return await github_api.get_github_file_content(self.lectures_path(username))
+
+    async def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        return await github_api.save_github_file_content(self.lectures_path(username), data, message)
+
+    async def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        return await github_api.get_github_file_content(self.record_path(username, lecture_id, record_id))
+
+    async def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        return await github_api.save_github_file_content(
+            self.record_path(username, lecture_id, record_id), data, message
+        )
+
+    async def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        return await github_api.delete_github_file(
+            self.record_path(username, lecture_id, record_id), f"Delete timer record {record_id}"
+        )
+
+    async def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        files = await github_api.get_github_directory_contents(self.records_dir(username, lecture_id))
+        return [Path(name).stem for name in files if name != "index.json"]
+
+    async def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        # GitHub에서는 기록 파일을 지우지 않고 인덱스만 삭제 표시합니다 (delete_index 참고)
+        return True
+
+    async def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        return await github_api.get_github_file_content(self.index_path(username, lecture_id))
+
+    async def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        return await github_api.save_github_file_content(self.index_path(username, lecture_id), index_data, message)
+
+    async def delete_index(self, username: str, lecture_id: str) -> bool:
+        # GitHub에서는 인덱스 파일을 빈 내용으로 덮어쓰기 (삭제 대신)
+        empty_index = make_empty_index(lecture_id)
+        empty_index["deleted"] = True
+        return await github_api.save_github_file_content(
+            self.index_path(username, lecture_id),
+            empty_index,
+            f"Delete records index for lecture {lecture_id}"
+        )
+
+    async def import_user_data(self, username: str, lectures: Dict, indexes: Dict[str, Dict],
+                               records: RecordSource, message: str = "Import backup") -> bool:
+        # 파일마다 커밋하지 않고 blob을 올린 뒤 커밋 하나로 묶습니다
+        if not github_api.get_github_headers():
+            return False
+        try:
+            async with github_api.get_github_client() as client:
+                batch = github_api.GitHubCommitBatch(client)
+                await batch.put_json(self.lectures_path(username), lectures)
+                for lecture_id, record_id, data in records():
+                    await batch.put_json(self.record_path(username, lecture_id, record_id), data)
+                for lecture_id, index_data in indexes.items():
+                    await batch.put_json(self.index_path(username, lecture_id), index_data)
+                return await batch.commit(f"{message} for {username}") is not None
+        except github_api.GitHubUnavailable:
+            return False
+        except Exception as e:
+            logger.error("GitHub 일괄 가져오기 오류: %s", e)
+            return False
+
+    async def clear_user_data(self, username: str) -> bool:
+        # users/{username}/ 아래 파일을 커밋 하나로 삭제합니다 (이전 내용은 Git 이력에 남음)
+        if not github_api.get_github_headers():
+            return False
+        try:
+            async with github_api.get_github_client() as client:
+                batch = github_api.GitHubCommitBatch(client)
+                batch.delete_tree(f"users/{username}")
+                return await batch.commit(f"Clear all data for {username}") is not None
+        except github_api.GitHubUnavailable:
+            return False
+        except Exception as e:
+            logger.error("GitHub 일괄 삭제 오류: %s", e)
+            return False
+
+class LocalJSONStorage(StorageBackend):
+    """data/ 디렉토리에 JSON 파일로 저장합니다."""
+
+    name = "local"
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+
+    def users_file(self) -> Path:
+        return self.data_dir / "users.json"
+
+    def user_dir(self, username: str) -> Path:
+        return self.data_dir / f"user_{username}"
+
+    def lectures_file(self, username: str) -> Path:
+        return self.user_dir(username) / "lectures.json"
+
+    def records_dir(self, username: str, lecture_id: str) -> Path:
+        return self.user_dir(username) / "records" / lecture_id
+
+    def record_file(self, username: str, lecture_id: str, record_id: str) -> Path:
+        return self.records_dir(username, lecture_id) / f"{record_id}.json"
+
+    def index_file(self, username: str, lecture_id: str) -> Path:
+        return self.records_dir(username, lecture_id) / "index.json"
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            if path.exists():
+                return fast_json.loads(path.read_bytes())
+        except Exception as e:
+            logger.warning("로컬 파일 읽기 오류 (%s): %s", path, e)
+        return None
+
+    def _write(self, path: Path, data: Dict) -> bool:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(fast_json.dumps(data))
+            return True
+        except Exception as e:
+            logger.error("로컬 파일 저장 오류 (%s): %s", path, e)
+            return False
+
+    async def load_users(self) -> Optional[Dict]:
+        return self._read(self.users_file())
+
+    async def save_users(self, users_data: Dict) -> bool:
+        return self._write(self.users_file(), users_data)
+
+    async def delete_user(self, username: str) -> bool:
+        user_dir = self.user_dir(username)
+        if user_dir.exists():
+            shutil.rmtree(user_dir)
+        return True
+
+    async def load_lectures(self, username: str) -> Optional[Dict]:
+        return self._read(self.lectures_file(username))
+
+    async def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        return self._write(self.lectures_file(username), data)
+
+    async def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        return self._read(self.record_file(username, lecture_id, record_id))
+
+    async def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        return self._write(self.record_file(username, lecture_id, record_id), data)
+
+    async def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        record_file = self.record_file(username, lecture_id, record_id)
+        if record_file.exists():
+            record_file.unlink()
+            return True
+        return False
+
+    async def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        records_dir = self.records_dir(username, lecture_id)
+        if not records_dir.exists():
+            return []
+        return [f.stem for f in records_dir.glob("*.json") if f.name != "index.json"]
+
+    async def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        records_dir = self.records_dir(username, lecture_id)
+        if records_dir.exists():
+            shutil.rmtree(records_dir)
+        return True
+
+    async def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        return self._read(self.index_file(username, lecture_id))
+
+    async def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        return self._write(self.index_file(username, lecture_id), index_data)
+
+    async def delete_index(self, username: str, lecture_id: str) -> bool:
+        index_file = self.index_file(username, lecture_id)
+        if index_file.exists():
+            index_file.unlink()
+        return True
+
+def _in_thread(method):
+    """동기 메서드를 스레드 풀에서 실행하는 비동기 메서드로 바꿉니다 (이벤트 루프를 막지 않도록)."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await asyncio.to_thread(method, self, *args, **kwargs)
+    return wrapper
+
+class SQLiteStorage(StorageBackend):
+    """SQLAlchemy(SQLite) 테이블에 저장합니다.
+
+    기록 인덱스는 별도 문서 대신 timer_records 테이블의
+    (username, lecture_id, created_at) 인덱스 조회로 만들어집니다.
+    SQLAlchemy 호출은 동기이므로 각 메서드는 스레드 풀에서 실행합니다.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database_url: str):
+        from sqlalchemy import (
+            MetaData, Table, Column, String, Integer, Text, Boolean, Index, create_engine
+        )
+
+        self.engine = create_engine(database_url, future=True)
+        self.metadata = MetaData()
+        self.users = Table(
+            "users", self.metadata,
+            Column("username", String, primary_key=True),
+            Column("password_hash", String, nullable=False),
+            Column("created_at", String, nullable=False),
+        )
+        self.lectures = Table(
+            "lectures", self.metadata,
+            Column("username", String, primary_key=True),
+            Column("id", String, primary_key=True),
+            Column("name", String, nullable=False),
+            Column("created_at", String),
+            Column("position", Integer, nullable=False, default=0),
+            Column("data", Text, nullable=False),
+            Index("ix_lectures_user_name", "username", "name"),
+        )
+        self.timer_records = Table(
+            "timer_records", self.metadata,
+            Column("username", String, primary_key=True),
+            Column("lecture_id", String, primary_key=True),
+            Column("id", String, primary_key=True),
+            Column("session_name", String),
+            Column("created_at", String),
+            Column("updated_at", String),
+            Column("records_count", Integer, nullable=False, default=0),
+            Column("data", Text, nullable=False),
+            Index("ix_timer_records_user_lecture_created", "username", "lecture_id", "created_at"),
+        )
+        self.record_indexes = Table(
+            "record_indexes", self.metadata,
+            Column("username", String, primary_key=True),
+            Column("lecture_id", String, primary_key=True),
+            Column("version", String, nullable=False, default="1.0"),
+            Column("created_at", String),
+            Column("updated_at", String),
+            Column("deleted", Boolean, nullable=False, default=False),
+        )
+        self.metadata.create_all(self.engine)
+
+    @_in_thread
+    def load_users(self) -> Optional[Dict]:
+        from sqlalchemy import select
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(self.users)).mappings().all()
+        return {row["username"]: dict(row) for row in rows}
+
+    @_in_thread
+    def save_users(self, users_data: Dict) -> bool:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.users.delete())
+                if users_data:
+                    conn.execute(self.users.insert(), [
+                        {
+                            "username": username,
+                            "password_hash": user.get("password_hash", ""),
+                            "created_at": user.get("created_at", ""),
+                        }
+                        for username, user in users_data.items()
+                    ])
+            return True
+        except Exception as e:
+            logger.error("SQLite 사용자 저장 오류: %s", e)
+            return False
+
+    @_in_thread
+    def delete_user(self, username: str) -> bool:
+        with self.engine.begin() as conn:
+            for table in (self.lectures, self.timer_records, self.record_indexes):
+                conn.execute(table.delete().where(table.c.username == username))
+        return True
+
+    @_in_thread
+    def load_lectures(self, username: str) -> Optional[Dict]:
+        from sqlalchemy import select
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(self.lectures.c.data)
+                .where(self.lectures.c.username == username)
+                .order_by(self.lectures.c.position)
+            ).scalars().all()
+        if not rows:
+            return None
+        return {"lectures": [fast_json.loads(data) for data in rows]}
+
+    @_in_thread
+    def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.lectures.delete().where(self.lectures.c.username == username))
+                lectures = data.get("lectures", [])
+                if lectures:
+                    conn.execute(self.lectures.insert(), [
+                        {
+                            "username": username,
+                            "id": lecture.get("id"),
+                            "name": lecture.get("name", ""),
+                            "created_at": lecture.get("created_at"),
+                            "position": position,
+                            "data": fast_json.dumps_str(lecture),
+                        }
+                        for position, lecture in enumerate(lectures)
+                    ])
+            return True
+        except Exception as e:
+            logger.error("SQLite 강의 목록 저장 오류: %s", e)
+            return False
+
+    def _record_key(self, username: str, lecture_id: str):
+        table = self.timer_records
+        return (table.c.username == username) & (table.c.lecture_id == lecture_id)
+
+    @_in_thread
+    def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        from sqlalchemy import select
+
+        table = self.timer_records
+        with self.engine.connect() as conn:
+            data = conn.execute(
+                select(table.c.data).where(self._record_key(username, lecture_id) & (table.c.id == record_id))
+            ).scalar_one_or_none()
+        return fast_json.loads(data) if data else None
+
+    @_in_thread
+    def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        from sqlalchemy.dialects.sqlite import insert
+
+        info = make_record_info(data, record_id)
+        values = {
+            "username": username,
+            "lecture_id": lecture_id,
+            "id": record_id,
+            "session_name": info["session_name"],
+            "created_at": info["created_at"],
+            "updated_at": info["updated_at"],
+            "records_count": info["records_count"],
+            "data": fast_json.dumps_str(data),
+        }
+        try:
+            stmt = insert(self.timer_records).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["username", "lecture_id", "id"],
+                set_={key: stmt.excluded[key] for key in
+                      ("session_name", "created_at", "updated_at", "records_count", "data")}
+            )
+            with self.engine.begin() as conn:
+                conn.execute(stmt)
+            return True
+        except Exception as e:
+            logger.error("SQLite 타이머 기록 저장 오류: %s", e)
+            return False
+
+    @_in_thread
+    def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        table = self.timer_records
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                table.delete().where(self._record_key(username, lecture_id) & (table.c.id == record_id))
+            )
+        return result.rowcount > 0
+
+    @_in_thread
+    def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        from sqlalchemy import select
+
+        with self.engine.connect() as conn:
+            return list(conn.execute(
+                select(self.timer_records.c.id).where(self._record_key(username, lecture_id))
+            ).scalars().all())
+
+    @_in_thread
+    def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        with self.engine.begin() as conn:
+            conn.execute(self.timer_records.delete().where(self._record_key(username, lecture_id)))
+        return True
+
+    @_in_thread
+    def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        from sqlalchemy import select
+
+        table = self.timer_records
+        meta_table = self.record_indexes
+        with self.engine.connect() as conn:
+            meta = conn.execute(
+                select(meta_table).where(
+                    (meta_table.c.username == username) & (meta_table.c.lecture_id == lecture_id)
+                )
+            ).mappings().first()
+            rows = conn.execute(
+                select(table.c.id, table.c.session_name, table.c.created_at,
+                       table.c.updated_at, table.c.records_count)
+                .where(self._record_key(username, lecture_id))
+                .order_by(table.c.created_at.desc())
+            ).mappings().all()
+
+        if meta is None and not rows:
+            return None
+
+        index_data = make_empty_index(lecture_id)
+        if meta is not None:
+            index_data["version"] = meta["version"]
+            index_data["created_at"] = meta["created_at"]
+            index_data["updated_at"] = meta["updated_at"]
+        index_data["records"] = [dict(row) for row in rows]
+        return index_data
+
+    @_in_thread
+    def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        # 기록 목록은 timer_records 테이블에서 파생되므로 메타데이터만 저장합니다.
+        from sqlalchemy.dialects.sqlite import insert
+
+        try:
+            stmt = insert(self.record_indexes).values(
+                username=username,
+                lecture_id=lecture_id,
+                version=index_data.get("version", "1.0"),
+                created_at=index_data.get("created_at"),
+                updated_at=index_data.get("updated_at"),
+                deleted=False,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["username", "lecture_id"],
+                set_={"version": stmt.excluded.version, "updated_at": stmt.excluded.updated_at,
+                      "deleted": False}
+            )
+            with self.engine.begin() as conn:
+                conn.execute(stmt)
+            return True
+        except Exception as e:
+            logger.error("SQLite 기록 인덱스 저장 오류: %s", e)
+            return False
+
+    @_in_thread
+    def delete_index(self, username: str, lecture_id: str) -> bool:
+        meta_table = self.record_indexes
+        with self.engine.begin() as conn:
+            conn.execute(meta_table.delete().where(
+                (meta_table.c.username == username) & (meta_table.c.lecture_id == lecture_id)
+            ))
+        return True
+
+    # 일괄 가져오기에서 executemany 한 번에 보낼 기록 수
+    IMPORT_CHUNK_SIZE = 500
+
+    @_in_thread
+    def import_user_data(self, username: str, lectures: Dict, indexes: Dict[str, Dict],
+                               records: RecordSource, message: str = "Import backup") -> bool:
+        # 트랜잭션 하나로 저장하므로 중간에 실패하면 아무것도 반영되지 않습니다
+        from sqlalchemy.dialects.sqlite import insert
+
+        record_stmt = insert(self.timer_records)
+        record_stmt = record_stmt.on_conflict_do_update(
+            index_elements=["username", "lecture_id", "id"],
+            set_={key: record_stmt.excluded[key] for key in
+                  ("session_name", "created_at", "updated_at", "records_count", "data")}
+        )
+        index_stmt = insert(self.record_indexes)
+        index_stmt = index_stmt.on_conflict_do_update(
+            index_elements=["username", "lecture_id"],
+            set_={"version": index_stmt.excluded.version, "updated_at": index_stmt.excluded.updated_at,
+                  "deleted": False}
+        )
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.lectures.delete().where(self.lectures.c.username == username))
+                if lectures.get("lectures"):
+                    conn.execute(self.lectures.insert(), [
+                        {
+                            "username": username,
+                            "id": lecture.get("id"),
+                            "name": lecture.get("name", ""),
+                            "created_at": lecture.get("created_at"),
+                            "position": position,
+                            "data": fast_json.dumps_str(lecture),
+                        }
+                        for position, lecture in enumerate(lectures["lectures"])
+                    ])
+
+                chunk = []
+                for lecture_id, record_id, data in records():
+                    info = make_record_info(data, record_id)
+                    chunk.append({
+                        "username": username,
+                        "lecture_id": lecture_id,
+                        "id": record_id,
+                        "session_name": info["session_name"],
+                        "created_at": info["created_at"],
+                        "updated_at": info["updated_at"],
+                        "records_count": info["records_count"],
+                        "data": fast_json.dumps_str(data),
+                    })
+                    if len(chunk) >= self.IMPORT_CHUNK_SIZE:
+                        conn.execute(record_stmt, chunk)
+                        chunk = []
+                if chunk:
+                    conn.execute(record_stmt, chunk)
+
+                if indexes:
+                    conn.execute(index_stmt, [
+                        {
+                            "username": username,
+                            "lecture_id": lecture_id,
+                            "version": index_data.get("version", "1.0"),
+                            "created_at": index_data.get("created_at"),
+                            "updated_at": index_data.get("updated_at"),
+                            "deleted": False,
+                        }
+                        for lecture_id, index_data in indexes.items()
+                    ])
+            return True
+        except Exception as e:
+            logger.error("SQLite 일괄 가져오기 오류: %s", e)
+            return False
+
+class MirroredStorage(StorageBackend):
+    """주 저장소에 저장하고 백업 저장소에도 항상 같은 내용을 기록합니다.
+
+    읽기는 주 저장소를 먼저 시도하고, 실패하거나 비어 있으면 백업을 사용합니다.
+    쓰기 결과는 주 저장소 기준으로 반환합니다 (github_sync 값).
+    """
+
+    def __init__(self, primary: StorageBackend, backup: StorageBackend):
+        self.primary = primary
+        self.backup = backup
+        self.name = f"{primary.name}+{backup.name}"
+
+    async def _read(self, method: str, *args, mirror: bool = True) -> Optional[Dict]:
+        data = await getattr(self.primary, method)(*args)
+        if data:
+            if mirror:
+                # 주 저장소에서 읽은 내용을 백업에도 반영
+                await getattr(self.backup, method.replace("load_", "save_"))(*args, data)
+            return data
+        backup_data = await getattr(self.backup, method)(*args)
+        return backup_data if backup_data else data
+
+    async def load_users(self) -> Optional[Dict]:
+        return await self._read("load_users")
+
+    async def save_users(self, users_data: Dict) -> bool:
+        primary_ok = await self.primary.save_users(users_data)
+        await self.backup.save_users(users_data)
+        return primary_ok
+
+    async def delete_user(self, username: str) -> bool:
+        primary_ok = await self.primary.delete_user(username)
+        backup_ok = await self.backup.delete_user(username)
+        return primary_ok and backup_ok
+
+    async def load_lectures(self, username: str) -> Optional[Dict]:
+        return await self._read("load_lectures", username)
+
+    async def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        primary_ok = await self.primary.save_lectures(username, data, message)
+        await self.backup.save_lectures(username, data, message)
+        return primary_ok
+
+    async def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        return await self._read("load_record", username, lecture_id, record_id, mirror=False)
+
+    async def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        primary_ok = await self.primary.save_record(username, lecture_id, record_id, data, message)
+        await self.backup.save_record(username, lecture_id, record_id, data, message)
+        return primary_ok
+
+    async def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        primary_ok = await self.primary.delete_record(username, lecture_id, record_id)
+        backup_ok = await self.backup.delete_record(username, lecture_id, record_id)
+        return primary_ok or backup_ok
+
+    async def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        primary_ids = await self.primary.list_record_ids(username, lecture_id)
+        backup_ids = await self.backup.list_record_ids(username, lecture_id)
+        return list(dict.fromkeys(primary_ids + backup_ids))
+
+    async def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        primary_ok = await self.primary.delete_lecture_records(username, lecture_id)
+        backup_ok = await self.backup.delete_lecture_records(username, lecture_id)
+        return primary_ok and backup_ok
+
+    async def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        return await self._read("load_index", username, lecture_id)
+
+    async def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        primary_ok = await self.primary.save_index(username, lecture_id, index_data, message)
+        await self.backup.save_index(username, lecture_id, index_data, message)
+        return primary_ok
+
+    async def delete_index(self, username: str, lecture_id: str) -> bool:
+        primary_ok = await self.primary.delete_index(username, lecture_id)
+        backup_ok = await self.backup.delete_index(username, lecture_id)
+        return primary_ok and backup_ok
+
+    async def import_user_data(self, username: str, lectures: Dict, indexes: Dict[str, Dict],
+                               records: RecordSource, message: str = "Import backup") -> bool:
+        primary_ok = await self.primary.import_user_data(username, lectures, indexes, records, message)
+        await self.backup.import_user_data(username, lectures, indexes, records, message)
+        return primary_ok
+
+    async def clear_user_data(self, username: str) -> bool:
+        primary_ok = await self.primary.clear_user_data(username)
+        backup_ok = await self.backup.clear_user_data(username)
+        return primary_ok and backup_ok
+
+class CachingStorage(StorageBackend):
+    """사용자 목록, 강의 카탈로그, 기록 인덱스를 SharedCache에 캐시하는 저장소 래퍼.
+
+    이 래퍼를 거친 쓰기는 해당 네임스페이스를 무효화한 뒤 새 값을 캐시하므로,
+    타이머 기록 저장 때마다 강의 존재 확인을 위해 GitHub을 다시 읽지 않습니다.
+    SharedCache가 파일 기반이면 다른 워커 프로세스의 캐시도 함께 무효화됩니다.
+    외부에서 바뀐 내용은 ttl(초)이 지나면 다시 읽습니다.
+    """
+
+    def __init__(self, inner: StorageBackend, cache: Optional[SharedCache] = None, ttl: float = 300.0):
+        self.inner = inner
+        self.cache = cache or SharedCache(default_ttl=ttl)
+        self.ttl = ttl
+        self.name = inner.name
+
+    @staticmethod
+    def _users_ns() -> str:
+        return "users"
+
+    @staticmethod
+    def _lectures_ns(username: str) -> str:
+        return f"lectures:{username}"
+
+    @staticmethod
+    def _index_ns(username: str, lecture_id: str) -> str:
+        return f"index:{username}:{lecture_id}"
+
+    @staticmethod
+    def _record_versions_ns(username: str, lecture_id: str) -> str:
+        return f"record-versions:{username}:{lecture_id}"
+
+    def _invalidate_lecture(self, username: str, lecture_id: str) -> None:
+        self.invalidate(self._index_ns(username, lecture_id))
+        self.invalidate(self._record_versions_ns(username, lecture_id))
+
+    def cached_record_version(self, username: str, lecture_id: str, record_id: str) -> Optional[int]:
+        """마지막으로 읽거나 저장한 기록의 version (캐시에 없으면 None, 저장소는 읽지 않음).
+
+        조건부 GET(If-None-Match)이 기록 파일을 읽지 않고 304를 돌려줄 때 씁니다.
+        """
+        version = self.cache.get(self._record_versions_ns(username, lecture_id), record_id)
+        return version if isinstance(version, int) else None
+
+    def _remember_record_version(self, username: str, lecture_id: str, record_id: str, data: Dict) -> None:
+        version = data.get("version", 0)
+        self.cache.set(self._record_versions_ns(username, lecture_id), record_id,
+                       version if isinstance(version, int) else 0, ttl=self.ttl)
+
+    def invalidate(self, namespace: str) -> None:
+        """네임스페이스의 캐시를 모든 워커에서 무효화합니다."""
+        self.cache.invalidate(namespace)
+
+    async def _cached_load(self, namespace: str, loader, decode=None):
+        cached = self.cache.get(namespace, "value", decode=decode)
+        if cached is not None:
+            return cached
+        version = self.cache.namespace_version(namespace)
+        data = await loader()
+        if data:
+            decoded = decode(data) if decode else None
+            self.cache.set(namespace, "value", data, ttl=self.ttl, expected_version=version, decoded=decoded)
+            return decoded if decode else data
+        return decode(data) if decode else data
+
+    async def _write_through(self, namespace: str, writer, data: Dict, decoded=None) -> bool:
+        try:
+            result = await writer()
+        finally:
+            self.cache.invalidate(namespace)
+        self.cache.set(namespace, "value", data, ttl=self.ttl, decoded=decoded)
+        return result
+
+    async def load_lecture_catalog(self, username: str) -> LectureCatalog:
+        # 캐시된 객체는 모든 요청이 공유하므로, 호출자가 고쳐도 저장 전에는 드러나지 않게 사본을 줍니다
+        catalog = await self._cached_load(
+            self._lectures_ns(username),
+            lambda: self.inner.load_lectures(username),
+            decode=LectureCatalog
+        )
+        return catalog.copy()
+
+    async def save_lecture_catalog(self, username: str, catalog: LectureCatalog,
+                                   message: str = "Update lectures") -> bool:
+        document = catalog.to_document()
+        return await self._write_through(
+            self._lectures_ns(username),
+            lambda: self.inner.save_lectures(username, document, message),
+            document,
+            decoded=catalog.copy()
+        )
+
+    async def load_users(self) -> Optional[Dict]:
+        return await self._cached_load(self._users_ns(), self.inner.load_users)
+
+    async def save_users(self, users_data: Dict) -> bool:
+        return await self._write_through(
+            self._users_ns(), lambda: self.inner.save_users(users_data), users_data
+        )
+
+    async def delete_user(self, username: str) -> bool:
+        catalog = await self.load_lecture_catalog(username)
+        try:
+            return await self.inner.delete_user(username)
+        finally:
+            self.invalidate(self._lectures_ns(username))
+            for lecture_id in catalog.by_id:
+                self._invalidate_lecture(username, lecture_id)
+
+    async def load_lectures(self, username: str) -> Optional[Dict]:
+        catalog = await self.load_lecture_catalog(username)
+        return catalog.to_document() if catalog.exists else None
+
+    async def save_lectures(self, username: str, data: Dict, message: str = "Update lectures") -> bool:
+        return await self.save_lecture_catalog(username, LectureCatalog(data), message)
+
+    async def load_record(self, username: str, lecture_id: str, record_id: str) -> Optional[Dict]:
+        # 기록 자체는 크고 자주 바뀌므로 캐시하지 않고 version만 기억합니다
+        data = await self.inner.load_record(username, lecture_id, record_id)
+        if data:
+            self._remember_record_version(username, lecture_id, record_id, data)
+        return data
+
+    async def save_record(self, username: str, lecture_id: str, record_id: str, data: Dict,
+                          message: str = "Save timer record") -> bool:
+        try:
+            result = await self.inner.save_record(username, lecture_id, record_id, data, message)
+        except Exception:
+            self.invalidate(self._record_versions_ns(username, lecture_id))
+            raise
+        self._remember_record_version(username, lecture_id, record_id, data)
+        return result
+
+    async def delete_record(self, username: str, lecture_id: str, record_id: str) -> bool:
+        try:
+            return await self.inner.delete_record(username, lecture_id, record_id)
+        finally:
+            self.invalidate(self._record_versions_ns(username, lecture_id))
+
+    async def list_record_ids(self, username: str, lecture_id: str) -> List[str]:
+        return await self.inner.list_record_ids(username, lecture_id)
+
+    async def delete_lecture_records(self, username: str, lecture_id: str) -> bool:
+        try:
+            return await self.inner.delete_lecture_records(username, lecture_id)
+        finally:
+            self.invalidate(self._record_versions_ns(username, lecture_id))
+
+    async def load_index(self, username: str, lecture_id: str) -> Optional[Dict]:
+        return await self._cached_load(
+            self._index_ns(username, lecture_id),
+            lambda: self.inner.load_index(username, lecture_id)
+        )
+
+    async def save_index(self, username: str, lecture_id: str, index_data: Dict,
+                         message: str = "Update records index") -> bool:
+        return await self._write_through(
+            self._index_ns(username, lecture_id),
+            lambda: self.inner.save_index(username, lecture_id, index_data, message),
+            index_data
+        )
+
+    async def delete_index(self, username: str, lecture_id: str) -> bool:
+        try:
+            return await self.inner.delete_index(username, lecture_id)
+        finally:
+            self.invalidate(self._index_ns(username, lecture_id))
+
+    async def import_user_data(self, username: str, lectures: Dict, indexes: Dict[str, Dict],
+                               records: RecordSource, message: str = "Import backup") -> bool:
+        try:
+            return await self.inner.import_user_data(username, lectures, indexes, records, message)
+        finally:
+            self.invalidate(self._lectures_ns(username))
+            for lecture_id in indexes:
+                self._invalidate_lecture(username, lecture_id)
+
+    async def clear_user_data(self, username: str) -> bool:
+        # 삭제 후에는 강의 목록을 알 수 없으므로 인덱스 캐시 대상을 먼저 구합니다
+        catalog = await self.load_lecture_catalog(username)
+        try:
+            return await self.inner.clear_user_data(username)
+        finally:
+            self.invalidate(self._lectures_ns(username))
+            for lecture_id in catalog.by_id:
+                self._invalidate_lecture(username, lecture_id)
+
+def create_storage(data_dir: Path) -> StorageBackend:
+    """STORAGE_BACKEND 환경변수에 따라 저장소 백엔드를 만듭니다.
+
+    - github (기본값): GitHub + 로컬 JSON 백업
+    - local: 로컬 JSON 파일만 사용
+    - sqlite: STORAGE_DATABASE_URL (기본값 data/slide_scribe.db)
+    """
+    backend = os.getenv("STORAGE_BACKEND", "github").lower()
+    cache_ttl = float(os.getenv("LECTURE_CACHE_TTL", "300"))
+    # 여러 워커가 공유하는 캐시 파일 (SHARED_CACHE_PATH=off 이면 워커별 메모리 캐시)
+    cache_path = os.getenv("SHARED_CACHE_PATH", str(Path(data_dir) / "cache" / "shared_cache.db"))
+    cache = SharedCache(None if cache_path.lower() in ("", "off", "none") else Path(cache_path), default_ttl=cache_ttl,
+                        max_entries=int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "10000")))
+
+    if backend == "local":
+        inner = LocalJSONStorage(data_dir)
+    elif backend == "sqlite":
+        database_url = os.getenv("STORAGE_DATABASE_URL", f"sqlite:///{Path(data_dir) / 'slide_scribe.db'}")
+        inner = SQLiteStorage(database_url)
+    else:
+        if backend != "github":
+            logger.warning("알 수 없는 STORAGE_BACKEND '%s', github 사용", backend)
+        inner = MirroredStorage(GitHubStorage(), LocalJSONStorage(data_dir))
+    return CachingStorage(inner, cache=cache, ttl=cache_ttl)
@@ -0,0 +1,78 @@
+"""`HH:MM:SS.mmm` 시각 문자열을 한 번에 초 단위 float64 배열로 바꿉니다.
+
+타이머 기록과 SRT의 시각은 항상 12글자 고정 폭이므로, 문자열 열 전체를 NumPy 고정 폭
+문자열 배열로 만든 뒤 (n, 폭) 문자 코드 행렬로 보고 자리마다 숫자를 계산합니다.
+파이썬 반복이나 정규식 없이 한 번에 처리되며, 결과는 parse_srt_time과 같은 연산
+순서로 계산되어 값이 정확히 같습니다. 형식이 맞지 않는 값은 NaN이 됩니다.
+
+str 목록과 bytes 목록(파일에서 읽은 시간 줄 그대로) 모두 받습니다.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+TIME_WIDTH = 12
+# SRT 시간 줄 "HH:MM:SS,mmm --> HH:MM:SS,mmm" (뒤에 위치 정보 등이 붙어도 앞부분만 봅니다)
+ARROW = " --> "
+RANGE_WIDTH = TIME_WIDTH * 2 + len(ARROW)
+
+# 숫자 자리 (HH:MM:SS.mmm)
+_DIGIT_COLUMNS = [0, 1, 3, 4, 6, 7, 9, 10, 11]
+_ARROW_CODES = np.array([ord(c) for c in ARROW])
+
+Lines = Sequence[Union[str, bytes]]
+
+def _char_matrix(values: Lines, width: int) -> np.ndarray:
+    """값들을 앞에서 width글자까지 (n, width) 문자 코드 행렬로 만듭니다 (짧으면 0으로 채움)."""
+    if values and isinstance(values[0], (bytes, bytearray)):
+        return np.array(values, dtype=f"S{width}").view(np.uint8).reshape(len(values), width)
+    return np.array(values, dtype=f"U{width}").view(np.uint32).reshape(len(values), width)
+
+def _decode_rows(rows: np.ndarray) -> np.ndarray:
+    """(n, 12) 문자 코드 행렬을 초 배열로. 형식이 다른 행은 NaN."""
+    digits = rows.astype(np.int64) - ord("0")
+    valid = (
+        np.all((digits[:, _DIGIT_COLUMNS] >= 0) & (digits[:, _DIGIT_COLUMNS] <= 9), axis=1)
+        & (rows[:, 2] == ord(":")) & (rows[:, 5] == ord(":"))
+        & ((rows[:, 8] == ord(".")) | (rows[:, 8] == ord(",")))
+    )
+    h = digits[:, 0] * 10 + digits[:, 1]
+    m = digits[:, 3] * 10 + digits[:, 4]
+    s = digits[:, 6] * 10 + digits[:, 7]
+    ms = digits[:, 9] * 100 + digits[:, 10] * 10 + digits[:, 11]
+    seconds = h * 3600 + m * 60 + s + ms / 1000.0
+    return np.where(valid, seconds, np.nan)
+
+def parse_times(values: Lines) -> np.ndarray:
+    """시각 문자열 목록을 초 배열로 바꿉니다 (빈 값이나 잘못된 형식은 NaN)."""
+    values = ["" if v is None else v for v in values]
+    if not values:
+        return np.empty(0)
+    # 한 글자 더 읽어 12글자보다 긴 값을 걸러냅니다
+    rows = _char_matrix(values, TIME_WIDTH + 1)
+    seconds = _decode_rows(rows[:, :TIME_WIDTH])
+    return np.where(rows[:, TIME_WIDTH] == 0, seconds, np.nan)
+
+def parse_time_ranges(lines: Lines) -> Tuple[np.ndarray, np.ndarray]:
+    """SRT 시간 줄 목록을 (시작, 종료) 초 배열로 바꿉니다. 형식이 다른 줄은 둘 다 NaN."""
+    if not lines:
+        return np.empty(0), np.empty(0)
+    rows = _char_matrix(lines, RANGE_WIDTH)
+    starts = _decode_rows(rows[:, :TIME_WIDTH])
+    ends = _decode_rows(rows[:, TIME_WIDTH + len(ARROW):])
+    valid = np.all(rows[:, TIME_WIDTH:TIME_WIDTH + len(ARROW)] == _ARROW_CODES, axis=1)
+    valid &= ~(np.isnan(starts) | np.isnan(ends))
+    return np.where(valid, starts, np.nan), np.where(valid, ends, np.nan)
+
+def first_invalid(values: Lines) -> int:
+    """형식이 잘못된 첫 값의 위치 (모두 올바르면 -1)."""
+    invalid = np.flatnonzero(np.isnan(parse_times(values)))
+    return int(invalid[0]) if len(invalid) else -1
+
+def find_invalid_record_time(records: List[Dict]) -> Optional[Tuple[int, str]]:
+    """타이머 기록에서 start_time/end_time 형식이 잘못된 첫 (기록 위치, 필드). 없으면 None."""
+    for field in ('start_time', 'end_time'):
+        position = first_invalid([record.get(field) for record in records])
+        if position >= 0:
+            return position, field
+    return None
@@ -0,0 +1,124 @@
+"""강의의 여러 타이머 기록(리허설 세션)에 걸친 슬라이드별 시간 통계.
+
+한 강의의 모든 세션을 한 번에 읽어 (세션, 슬라이드, 시작, 종료)를 열 배열로 펼친 뒤
+시각 문자열을 timecode.parse_times로 한꺼번에 초로 바꾸고, 슬라이드 번호별
+집계(평균, 중앙값, p90, 분산, 추세)를 np.bincount/정렬로 한 번에 계산합니다.
+
+추세(trend)는 세션을 생성 시각 순으로 0, 1, 2...로 두었을 때 소요 시간의 최소제곱
+기울기(세션당 초)입니다. 음수면 연습할수록 짧아지고 있다는 뜻입니다.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from timecode import parse_times
+
+PERCENTILES = {"p50": 0.5, "p90": 0.9}
+
+def _slide_sort_key(slide_number: str):
+    return (0, int(slide_number), "") if slide_number.isdigit() else (1, 0, slide_number)
+
+def _round(values: np.ndarray) -> List:
+    return [None if not np.isfinite(v) else round(float(v), 3) for v in values]
+
+def _grouped_percentiles(groups: np.ndarray, values: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """그룹별 백분위수 (np.percentile의 linear 보간과 같은 값)."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = {}
+    for name, q in PERCENTILES.items():
+        position = starts + (counts - 1) * q
+        lo = np.floor(position).astype(np.int64)
+        hi = np.ceil(position).astype(np.int64)
+        result[name] = ordered[lo] + (ordered[hi] - ordered[lo]) * (position - lo)
+    return result
+
+def compute_lecture_analytics(sessions: List[Dict]) -> Dict:
+    """세션(타이머 기록) 목록에서 슬라이드별/세션별 소요 시간 통계를 계산합니다."""
+    sessions = sorted(sessions, key=lambda s: s.get("created_at") or "")
+
+    session_idx, slide_keys, titles, starts, ends = [], [], [], [], []
+    for i, session in enumerate(sessions):
+        for slide in session.get("records", []):
+            session_idx.append(i)
+            slide_keys.append(str(slide.get("slide_number", "")).strip())
+            titles.append(slide.get("slide_title", ""))
+            starts.append(slide.get("start_time"))
+            ends.append(slide.get("end_time"))
+
+    durations = parse_times(ends) - parse_times(starts)
+    session_idx = np.asarray(session_idx, dtype=np.int64)
+    valid = np.isfinite(durations) & (durations >= 0)
+
+    # 세션별 합계
+    session_totals = np.bincount(session_idx[valid], weights=durations[valid], minlength=len(sessions))
+    session_counts = np.bincount(session_idx[valid], minlength=len(sessions))
+
+    slides: List[Dict] = []
+    if valid.any():
+        keys, groups = np.unique(np.asarray(slide_keys, dtype=object)[valid], return_inverse=True)
+        d = durations[valid]
+        x = session_idx[valid].astype(np.float64)
+        n = np.bincount(groups).astype(np.float64)
+
+        mean = np.bincount(groups, weights=d) / n
+        sq = np.bincount(groups, weights=d * d)
+        # 표본 분산 (세션이 하나뿐이면 0)
+        variance = np.where(n > 1, (sq - n * mean * mean) / np.maximum(n - 1, 1), 0.0)
+        variance = np.maximum(variance, 0.0)
+
+        sx = np.bincount(groups, weights=x)
+        sxx = np.bincount(groups, weights=x * x)
+        sxy = np.bincount(groups, weights=x * d)
+        denominator = n * sxx - sx * sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trend = np.where(denominator > 0, (n * sxy - sx * mean * n) / denominator, np.nan)
+
+        minimum = np.full(len(keys), np.inf)
+        maximum = np.full(len(keys), -np.inf)
+        np.minimum.at(minimum, groups, d)
+        np.maximum.at(maximum, groups, d)
+        percentiles = _grouped_percentiles(groups, d, n.astype(np.int64))
+
+        # 슬라이드 제목은 가장 최근 세션의 것을 사용
+        latest_title = {}
+        for key, title in zip(np.asarray(slide_keys, dtype=object)[valid], np.asarray(titles, dtype=object)[valid]):
+            latest_title[key] = title
+
+        columns = {
+            "mean": _round(mean),
+            "p50": _round(percentiles["p50"]),
+            "p90": _round(percentiles["p90"]),
+            "variance": _round(variance),
+            "min": _round(minimum),
+            "max": _round(maximum),
+            "trend": _round(trend),
+        }
+        for i, key in enumerate(keys):
+            slides.append({
+                "slide_number": key,
+                "slide_title": latest_title.get(key, ""),
+                "sessions": int(n[i]),
+                **{name: values[i] for name, values in columns.items()}
+            })
+        slides.sort(key=lambda s: _slide_sort_key(s["slide_number"]))
+
+    return {
+        "session_count": len(sessions),
+        "slide_count": len(slides),
+        "skipped_entries": int((~valid).sum()),
+        "slides": slides,
+        "sessions": [
+            {
+                "id": session.get("id"),
+                "session_name": session.get("session_name", ""),
+                "created_at": session.get("created_at"),
+                "slides": int(session_counts[i]),
+                "total_duration": round(float(session_totals[i]), 3)
+            }
+            for i, session in enumerate(sessions)
+        ],
+        "computed_at": datetime.now().isoformat()
+    }